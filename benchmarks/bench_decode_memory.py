@@ -0,0 +1,63 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Compare memory retained by decoded result sets with and without a ``DecodeContext``.
+
+Usage: ``python benchmarks/bench_decode_memory.py [--rows N]`` (Python 3 only)
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import argparse
+import gc
+import tracemalloc
+
+from bench_helpers import make_facts
+
+from hamster_dbus import helpers
+
+
+def measure(label, decode, fact_tuples):
+    """Print the memory retained by the result of ``decode``."""
+    # Start each run from the same state of the datetime memo.
+    helpers._text_to_datetime_memo.clear()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = decode(fact_tuples)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    print('{:<40} {:>10.1f} KiB ({:.0f} bytes/fact)'.format(label, size / 1024.0,
+        size / float(len(result))))
+
+
+def main():
+    """Run all benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    args = parser.parse_args()
+
+    fact_tuples = helpers.encode_facts(make_facts(args.rows))
+    measure('decode_facts', helpers.decode_facts, fact_tuples)
+    measure('decode_facts with DecodeContext',
+        lambda fact_tuples: helpers.decode_facts(fact_tuples, context=helpers.DecodeContext()),
+        fact_tuples)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Compare the per fact cost of our ``helpers`` conversion functions.
+
+Usage: ``python benchmarks/bench_helpers.py [--rows N] [--repeat N]``
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import argparse
+import datetime
+import timeit
+
+import hamster_lib
+
+from hamster_dbus import helpers
+
+
+def make_facts(rows):
+    """Return ``rows`` facts using a few dozen distinct activities and tags."""
+    categories = [hamster_lib.Category('category {}'.format(i), pk=i) for i in range(10)]
+    activities = [hamster_lib.Activity('activity {}'.format(i), pk=i,
+        category=categories[i % len(categories)]) for i in range(50)]
+    tags = [hamster_lib.Tag('tag {}'.format(i), pk=i) for i in range(20)]
+    start = datetime.datetime(2017, 1, 1, 8)
+    facts = []
+    for i in range(rows):
+        fact_start = start + datetime.timedelta(hours=i)
+        facts.append(hamster_lib.Fact(activities[i % len(activities)], fact_start,
+            end=fact_start + datetime.timedelta(minutes=45), pk=i + 1,
+            description='description {}'.format(i), tags=tags[i % 7:i % 7 + 2]))
+    return facts
+
+
+def run(label, function, rows, repeat):
+    """Time ``function`` and print its best per row cost."""
+    best = min(timeit.repeat(function, number=1, repeat=repeat))
+    print('{:<40} {:>8.2f} us/row'.format(label, best / rows * 1e6))
+
+
+def main():
+    """Run all benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    facts = make_facts(args.rows)
+    fact_tuples = helpers.encode_facts(facts)
+
+    run('hamster_to_dbus_fact', lambda: [helpers.hamster_to_dbus_fact(fact) for fact in facts],
+        args.rows, args.repeat)
+    run('encode_facts', lambda: helpers.encode_facts(facts), args.rows, args.repeat)
+    run('dbus_to_hamster_fact', lambda: [helpers.dbus_to_hamster_fact(fact_tuple)
+        for fact_tuple in fact_tuples], args.rows, args.repeat)
+    run('decode_facts', lambda: helpers.decode_facts(fact_tuples), args.rows, args.repeat)
+
+    texts = [fact_tuple[1] for fact_tuple in fact_tuples]
+
+    def parse_uncached():
+        helpers._text_to_datetime_memo.clear()
+        return [helpers.text_to_datetime(text) for text in texts]
+
+    run('text_to_datetime (strptime)', lambda: [helpers._parse_datetime_text(text)
+        for text in texts], args.rows, args.repeat)
+    run('text_to_datetime (not memoized)', parse_uncached, args.rows, args.repeat)
+    run('text_to_datetime', lambda: [helpers.text_to_datetime(text) for text in texts],
+        args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
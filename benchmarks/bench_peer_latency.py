@@ -0,0 +1,72 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Compare round trip latency to the service with and without the bus daemon.
+
+Needs a running service offering peer-to-peer connections (see ``PeerAddress``).
+
+Usage: ``python benchmarks/bench_peer_latency.py [--calls N] [--repeat N]``
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import argparse
+import sys
+import timeit
+
+import dbus
+import dbus.connection
+
+
+def run(label, function, calls, repeat):
+    """Time ``function`` and print its best per call latency."""
+    best = min(timeit.repeat(function, number=calls, repeat=repeat))
+    print('{:<40} {:>8.1f} us/call'.format(label, best / calls * 1e6))
+
+
+def benchmark(label, connection, calls, repeat):
+    """Run all calls against the service using ``connection``."""
+    main_object = connection.get_object('org.projecthamster.HamsterDBus',
+        '/org/projecthamster/HamsterDBus')
+    category_manager = connection.get_object('org.projecthamster.HamsterDBus',
+        '/org/projecthamster/HamsterDBus/CategoryManager')
+    # Answered by libdbus itself, this measures the transport only.
+    run(label + ' Peer.Ping', lambda: main_object.Ping(
+        dbus_interface='org.freedesktop.DBus.Peer'), calls, repeat)
+    run(label + ' CategoryManager.GetAll', lambda: category_manager.GetAll(
+        dbus_interface='org.projecthamster.HamsterDBus.CategoryManager1'), calls, repeat)
+
+
+def main():
+    """Run all benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    bus = dbus.SessionBus()
+    address = bus.get_object('org.projecthamster.HamsterDBus',
+        '/org/projecthamster/HamsterDBus').Get('org.projecthamster.HamsterDBus1',
+        'PeerAddress', dbus_interface=dbus.PROPERTIES_IFACE)
+    if not address:
+        sys.exit('The service does not offer peer-to-peer connections.')
+
+    benchmark('bus daemon', bus, args.calls, args.repeat)
+    benchmark('peer-to-peer', dbus.connection.Connection(address), args.calls, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
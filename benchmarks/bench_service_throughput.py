@@ -0,0 +1,124 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Compare end to end throughput of the service using each of its engines.
+
+For each engine a service is launched on the session bus and flooded with
+pipelined calls. No other instance of the service may be running.
+
+Usage: ``dbus-run-session -- python benchmarks/bench_service_throughput.py
+[--calls N] [--concurrency N]``
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import dbus
+from dbus.mainloop.glib import DBusGMainLoop
+from gi.repository import GLib
+
+BUS_NAME = 'org.projecthamster.HamsterDBus'
+SERVICE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'hamster_dbus', 'hamster_dbus_service.py')
+
+# Methods called, as ``(object path, interface, method, arguments)``.
+CALLS = (
+    ('/org/projecthamster/HamsterDBus/CategoryManager',
+        'org.projecthamster.HamsterDBus.CategoryManager1', 'GetAll', ()),
+    ('/org/projecthamster/HamsterDBus/FactManager',
+        'org.projecthamster.HamsterDBus.FactManager1', 'GetAll', ('', '', '')),
+    ('/org/projecthamster/HamsterDBus/FactManager',
+        'org.freedesktop.DBus.Properties', 'Get',
+        ('org.projecthamster.HamsterDBus.FactManager1', 'Count')),
+)
+
+
+def launch(bus, engine):
+    """Launch the service using ``engine`` and wait for it to answer calls."""
+    env = dict(os.environ, HAMSTER_DBUS_ENGINE=engine)
+    process = subprocess.Popen([sys.executable, SERVICE, 'server'], env=env)
+    for attempt in range(100):
+        try:
+            bus.get_object(BUS_NAME, CALLS[-1][0]).Get(*CALLS[-1][3],
+                dbus_interface=CALLS[-1][1])
+            return process
+        except dbus.exceptions.DBusException:
+            time.sleep(0.1)
+    process.terminate()
+    sys.exit('The service did not start using engine {}.'.format(engine))
+
+
+def measure(bus, path, interface, method, args, calls, concurrency):
+    """Return the number of calls per second answered with ``concurrency`` calls in flight."""
+    function = bus.get_object(BUS_NAME, path).get_dbus_method(method, interface)
+    loop = GLib.MainLoop()
+    state = {'sent': 0, 'done': 0, 'error': None}
+
+    def send():
+        state['sent'] += 1
+        function(*args, reply_handler=on_reply, error_handler=on_error)
+
+    def on_reply(*result):
+        state['done'] += 1
+        if state['sent'] < calls:
+            send()
+        elif state['done'] == calls:
+            loop.quit()
+
+    def on_error(error):
+        state['error'] = error
+        loop.quit()
+
+    start = time.time()
+    for each in range(min(concurrency, calls)):
+        send()
+    loop.run()
+    if state['error']:
+        raise state['error']
+    return calls / (time.time() - start)
+
+
+def main():
+    """Run all benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--engines', nargs='+', default=['dbus-python', 'gdbus'])
+    args = parser.parse_args()
+
+    DBusGMainLoop(set_as_default=True)
+    bus = dbus.SessionBus()
+    for engine in args.engines:
+        process = launch(bus, engine)
+        try:
+            for path, interface, method, call_args in CALLS:
+                rate = measure(bus, path, interface, method, call_args, args.calls,
+                    args.concurrency)
+                print('{:<12} {:<45} {:>9.0f} calls/s'.format(engine,
+                    '{}.{}'.format(interface.rsplit('.', 1)[-1], method), rate))
+        finally:
+            bus.get_object(BUS_NAME, '/org/projecthamster/HamsterDBus').Quit(
+                dbus_interface='org.projecthamster.HamsterDBus1')
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+In-memory caches used by the dbus service.
+
+None of those caches knows anything about the backend itself. They are filled
+by callables handed to them on lookup and it is the responsibility of the
+service to invalidate them whenever the underlying data may have changed.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from collections import OrderedDict
+
+# Marker for keys that are known to have no matching instance.
+_MISSING = object()
+
+
+class LookupIndex(object):
+    """
+    Map lookup keys (names or composite keys) to their dbus encoded instances.
+
+    Misses are remembered as well, so that repeatedly asking for something that
+    does not exist does not hit the backend either. In order to keep memory
+    usage in check only a limited amount of misses is kept.
+
+    ``generation`` is increased whenever entries or misses are dropped. Caches
+    derived from the index can make it part of their keys in order to be
+    invalidated along with it.
+    """
+
+    def __init__(self, max_misses=1024):
+        """
+        Initialize a new instance.
+
+        Args:
+            max_misses (int, optional): Maximum number of misses to remember.
+                Once exceeded all remembered misses are dropped. Defaults to ``1024``.
+        """
+        self._max_misses = max_misses
+        self._entries = {}
+        self._misses = 0
+        self.generation = 0
+
+    def __len__(self):
+        """Return the number of keys known to the index, including misses."""
+        return len(self._entries)
+
+    def get(self, key, lookup):
+        """
+        Return the entry for ``key``, using ``lookup`` if it is not yet known.
+
+        Args:
+            key (hashable): Key to look up.
+            lookup (callable): Called without arguments if ``key`` is unknown to
+                the index. Its return value is stored as the entry for ``key``.
+                If it raises ``KeyError`` the miss is remembered.
+
+        Returns:
+            object: The entry stored for ``key``.
+
+        Raises:
+            KeyError: If there is no entry for ``key``.
+        """
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            try:
+                entry = lookup()
+            except KeyError:
+                entry = _MISSING
+                if self._misses >= self._max_misses:
+                    self.invalidate_misses()
+                self._misses += 1
+            self._entries[key] = entry
+
+        if entry is _MISSING:
+            raise KeyError(key)
+        return entry
+
+    def invalidate(self):
+        """Forget all entries."""
+        self._entries.clear()
+        self._misses = 0
+        self.generation += 1
+
+    def invalidate_misses(self):
+        """
+        Forget all remembered misses but keep existing entries.
+
+        This is all that is needed after writes that can only create new
+        instances but not alter or remove existing ones.
+        """
+        self._entries = {key: entry for key, entry in self._entries.items()
+            if entry is not _MISSING}
+        self._misses = 0
+        self.generation += 1
+
+
+class LRUCache(object):
+    """A size bounded mapping that evicts its least recently used entries first."""
+
+    def __init__(self, maxsize=256):
+        """
+        Initialize a new instance.
+
+        Args:
+            maxsize (int, optional): Maximum number of entries. Defaults to ``256``.
+        """
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Return whether ``key`` is cached, without affecting its recency."""
+        return key in self._entries
+
+    def get(self, key, compute):
+        """
+        Return the entry for ``key``, using ``compute`` if it is not yet cached.
+
+        Args:
+            key (hashable): Key to look up.
+            compute (callable): Called without arguments if ``key`` is not cached.
+                Its return value is cached as the entry for ``key``. Exceptions
+                are passed on and nothing is cached.
+
+        Returns:
+            object: The entry stored for ``key``.
+        """
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            value = compute()
+        self._entries[key] = value
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Drop all entries."""
+        self._entries.clear()
+
+
+class MaximumBound(object):
+    """
+    Keep an upper bound of a value that only needs to be computed once.
+
+    Once computed, the bound is merely raised by ``add`` and never lowered.
+    Removing the maximum hence leaves a bound that is too high, but still valid.
+    """
+
+    def __init__(self):
+        """Initialize a new instance without value."""
+        self._value = None
+
+    def get(self, compute):
+        """
+        Return the bound, using ``compute`` if it is not yet known.
+
+        Args:
+            compute (callable): Called without arguments to compute the bound.
+
+        Returns:
+            object: The current bound.
+        """
+        if self._value is None:
+            self._value = compute()
+        return self._value
+
+    def add(self, value):
+        """Raise the bound to ``value`` if it is known and lower than that."""
+        if self._value is not None and value > self._value:
+            self._value = value
+
+    def invalidate(self):
+        """Drop the bound. It is computed again on next use."""
+        self._value = None
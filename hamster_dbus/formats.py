@@ -0,0 +1,322 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Text formats used to export and import facts in bulk.
+
+All formats share the same set of fields (see ``FIELDS``). Datetimes are
+represented just like in our dbus messages (see ``helpers.datetime_to_text``).
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import calendar
+import csv
+import datetime
+import io
+import json
+import re
+from collections import namedtuple
+from gettext import gettext as _
+
+from six import text_type
+
+from hamster_dbus import helpers
+
+FIELDS = ('pk', 'start', 'end', 'activity', 'category', 'tags', 'description')
+
+# Tags are represented as a single field for our tabular formats.
+TAG_SEPARATOR = ','
+
+
+def fact_to_record(fact):
+    """
+    Return a flat ``dict`` representation of a ``hamster_lib.Fact``.
+
+    Args:
+        fact (hamster_lib.Fact): Fact to be represented.
+
+    Returns:
+        dict: Mapping of ``FIELDS`` to their values. ``tags`` is a sorted list of
+            tag names, ``category`` is ``''`` if there is none.
+    """
+    category = fact.activity.category
+    return {
+        'pk': fact.pk,
+        'start': helpers.datetime_to_text(fact.start),
+        'end': helpers.datetime_to_text(fact.end),
+        'activity': fact.activity.name,
+        'category': category.name if category else '',
+        'tags': sorted(tag.name for tag in fact.tags),
+        'description': fact.description or '',
+    }
+
+
+class FactWriter(object):
+    """
+    Encode facts in one of our export formats.
+
+    Supported formats are ``csv``, ``tsv`` (both including a header line) and
+    ``jsonl`` (one JSON object per line).
+    """
+
+    formats = ('csv', 'tsv', 'jsonl')
+
+    def __init__(self, format):
+        """
+        Initialize a new instance.
+
+        Args:
+            format (text_type): One of ``FactWriter.formats``.
+
+        Raises:
+            ValueError: If ``format`` is not supported.
+        """
+        if format not in self.formats:
+            message = _("Unsupported format '{}'. Use one of: {}.").format(
+                format, ', '.join(self.formats))
+            raise ValueError(message)
+        self.format = format
+
+    def header(self):
+        """Return the text preceding all records."""
+        if self.format == 'jsonl':
+            return ''
+        return self._encode_rows([FIELDS])
+
+    def encode(self, facts):
+        """
+        Encode a chunk of facts.
+
+        Args:
+            facts (iterable): ``hamster_lib.Fact`` instances to be encoded.
+
+        Returns:
+            text_type: Text representing the given facts, one line per fact.
+        """
+        records = [fact_to_record(fact) for fact in facts]
+        if self.format == 'jsonl':
+            return ''.join(json.dumps(record, sort_keys=True) + '\n' for record in records)
+
+        rows = []
+        for record in records:
+            record['tags'] = TAG_SEPARATOR.join(record['tags'])
+            rows.append([record[field] for field in FIELDS])
+        return self._encode_rows(rows)
+
+    def _encode_rows(self, rows):
+        """Encode rows for our tabular formats."""
+        output = io.StringIO()
+        delimiter = '\t' if self.format == 'tsv' else ','
+        writer = csv.writer(output, delimiter=delimiter, lineterminator='\n')
+        writer.writerows(rows)
+        return output.getvalue()
+
+
+# A single record read by ``FactReader``. ``fields`` is a dict with (a subset of)
+# ``FIELDS`` as keys. If the record could not be read ``fields`` is ``None`` and
+# ``error`` holds a message describing the problem.
+Record = namedtuple('Record', ('number', 'fields', 'error'))
+
+
+class FactReader(object):
+    """
+    Incrementally decode facts from one of our import formats.
+
+    Supported formats are ``csv`` and ``tsv`` (both need a header line naming
+    the columns as in ``FIELDS``), ``jsonl`` (one JSON object per line using
+    ``FIELDS`` as keys) and ``ical`` (``VEVENT`` components, ``SUMMARY`` being
+    ``activity@category`` and ``CATEGORIES`` being tags).
+
+    Text can be passed in arbitrary pieces using ``feed``. Records are returned
+    as soon as they are complete. Pieces of text that do not yet make up a
+    complete record are kept until more text is fed or ``close`` is called.
+    """
+
+    formats = ('csv', 'tsv', 'jsonl', 'ical')
+
+    def __init__(self, format):
+        """
+        Initialize a new instance.
+
+        Args:
+            format (text_type): One of ``FactReader.formats``.
+
+        Raises:
+            ValueError: If ``format`` is not supported.
+        """
+        if format not in self.formats:
+            message = _("Unsupported format '{}'. Use one of: {}.").format(
+                format, ', '.join(self.formats))
+            raise ValueError(message)
+        self.format = format
+        self._partial_line = ''
+        # Lines of a not yet complete record.
+        self._lines = []
+        self._header = None
+        self._event = None
+        self._count = 0
+
+    def feed(self, text):
+        """
+        Pass a piece of text to the reader.
+
+        Args:
+            text (text_type): Next piece of text.
+
+        Returns:
+            list: ``Record`` instances completed by this piece of text.
+        """
+        lines = (self._partial_line + text).split('\n')
+        self._partial_line = lines.pop()
+        return self._read_lines(lines)
+
+    def close(self):
+        """
+        Signal that no more text will follow.
+
+        Returns:
+            list: Any remaining ``Record`` instances.
+        """
+        lines = [self._partial_line] if self._partial_line else []
+        self._partial_line = ''
+        if self.format == 'ical':
+            # Make sure the last (possibly folded) line is processed.
+            lines.append('')
+        records = self._read_lines(lines)
+        if self._lines and self.format in ('csv', 'tsv'):
+            records.append(self._error(_("Unterminated quoted field.")))
+            self._lines = []
+        return records
+
+    def _read_lines(self, lines):
+        read_line = {
+            'csv': self._read_tabular_line,
+            'tsv': self._read_tabular_line,
+            'jsonl': self._read_json_line,
+            'ical': self._read_ical_line,
+        }[self.format]
+        records = []
+        for line in lines:
+            record = read_line(line.rstrip('\r'))
+            if record:
+                records.append(record)
+        return records
+
+    def _record(self, fields):
+        self._count += 1
+        return Record(self._count, fields, None)
+
+    def _error(self, message):
+        self._count += 1
+        return Record(self._count, None, message)
+
+    def _read_tabular_line(self, line):
+        self._lines.append(line)
+        text = '\n'.join(self._lines)
+        if text.count('"') % 2:
+            # A quoted field spans multiple lines.
+            return None
+        self._lines = []
+        if not text.strip():
+            return None
+
+        delimiter = '\t' if self.format == 'tsv' else ','
+        row = next(csv.reader(io.StringIO(text), delimiter=delimiter))
+        if self._header is None:
+            self._header = row
+            return None
+        if len(row) != len(self._header):
+            return self._error(_("Expected {} columns but got {}.").format(
+                len(self._header), len(row)))
+        fields = dict(zip(self._header, row))
+        if 'tags' in fields:
+            fields['tags'] = [tag for tag in fields['tags'].split(TAG_SEPARATOR) if tag]
+        return self._record(fields)
+
+    def _read_json_line(self, line):
+        if not line.strip():
+            return None
+        try:
+            fields = json.loads(line)
+        except ValueError as error:
+            return self._error(text_type(error))
+        if not isinstance(fields, dict):
+            return self._error(_("Expected a JSON object."))
+        return self._record(fields)
+
+    def _read_ical_line(self, line):
+        if line[:1] in (' ', '\t'):
+            # Folded line, continuing the previous one.
+            self._lines.append(line[1:])
+            return None
+        previous, self._lines = ''.join(self._lines), [line]
+        if not previous:
+            return None
+
+        name, value = _split_ical_line(previous)
+        if name == 'BEGIN' and value == 'VEVENT':
+            self._event = {}
+        elif self._event is not None:
+            if name == 'END' and value == 'VEVENT':
+                event, self._event = self._event, None
+                return self._ical_event_to_record(event)
+            self._event[name] = value
+        return None
+
+    def _ical_event_to_record(self, event):
+        try:
+            activity, at, category = _unescape_ical_text(event['SUMMARY']).partition('@')
+            fields = {
+                'start': helpers.datetime_to_text(_parse_ical_datetime(event['DTSTART'])),
+                'end': helpers.datetime_to_text(_parse_ical_datetime(event['DTEND'])),
+            }
+        except (KeyError, ValueError) as error:
+            return self._error(_("Invalid event: {}").format(error))
+        fields.update({
+            'activity': activity.strip(),
+            'category': category.strip(),
+            'description': _unescape_ical_text(event.get('DESCRIPTION', '')),
+            'tags': [_unescape_ical_text(tag) for tag in
+                re.split(r'(?<!\\),', event.get('CATEGORIES', '')) if tag],
+        })
+        return self._record(fields)
+
+
+def _split_ical_line(line):
+    """Return name (without parameters) and value of an iCal content line."""
+    name, colon, value = line.partition(':')
+    return name.split(';', 1)[0].upper(), value
+
+
+def _unescape_ical_text(text):
+    """Unescape an iCal ``TEXT`` value."""
+    return re.sub(r'\\([\;,nN])',
+        lambda match: '\n' if match.group(1) in 'nN' else match.group(1), text)
+
+
+def _parse_ical_datetime(value):
+    """
+    Parse an iCal ``DATE-TIME`` or ``DATE`` value to a naive local datetime.
+
+    Raises:
+        ValueError: If ``value`` can not be parsed.
+    """
+    if len(value) == 8:
+        return datetime.datetime.strptime(value, '%Y%m%d')
+    if value.endswith('Z'):
+        utc = datetime.datetime.strptime(value, '%Y%m%dT%H%M%SZ')
+        return datetime.datetime.fromtimestamp(calendar.timegm(utc.timetuple()))
+    return datetime.datetime.strptime(value, '%Y%m%dT%H%M%S')
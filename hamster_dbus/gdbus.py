@@ -0,0 +1,213 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Export our objects using GDBus instead of dbus-python.
+
+Objects are created as usual (with ``export=False``, see
+``objects.HamsterDBus``) and handed to ``GDBusExporter``. It registers them
+with a ``Gio.DBusConnection`` using introspection XML generated by
+``introspection`` and dispatches incoming calls to the very same methods
+dbus-python would call. Messages are (de)serialized by GLib instead of
+dbus-python, which considerably lowers the per call overhead.
+
+Handlers still run one at a time in the main loop, as the ``hamster-lib``
+store must not be used from several threads.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import os
+
+import dbus
+from gi.repository import Gio, GLib
+from six import text_type
+
+from hamster_dbus import introspection
+
+
+class _UnixFd(object):
+    """Stand-in for ``dbus.types.UnixFd`` holding a file descriptor we own."""
+
+    def __init__(self, fd):
+        self._fd = fd
+
+    def take(self):
+        """Return the file descriptor, passing ownership to the caller."""
+        fd, self._fd = self._fd, -1
+        return fd
+
+    def __del__(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+
+
+def get_error_name(error):
+    """
+    Return the dbus error name for an exception, using the same rules as dbus-python.
+
+    Args:
+        error (Exception): Exception raised by a method.
+
+    Returns:
+        text_type: Error name to be sent to the caller.
+    """
+    name = getattr(error, '_dbus_error_name', None)
+    if name:
+        return name
+    module = getattr(type(error), '__module__', '')
+    if module in ('', '__main__'):
+        return 'org.freedesktop.DBus.Python.{}'.format(type(error).__name__)
+    return 'org.freedesktop.DBus.Python.{}.{}'.format(module, type(error).__name__)
+
+
+class GDBusExporter(object):
+    """Export ``objects.PropertiesObject`` instances on a ``Gio.DBusConnection``."""
+
+    def __init__(self, connection):
+        """
+        Initialize a new instance.
+
+        Args:
+            connection (Gio.DBusConnection): Connection to export objects on.
+        """
+        self._connection = connection
+        # Maps ``(object_path, interface, method name)`` to ``(object, method)``.
+        self._methods = {}
+        # Maps ``(object_path, interface, property name)`` to ``(signature, getter)``.
+        self._properties = {}
+        self._registration_ids = []
+        self._owner_id = None
+
+    def add_object(self, dbus_object):
+        """
+        Export an object.
+
+        All interfaces but the ``introspection.STANDARD_INTERFACES`` (which
+        GDBus implements itself) are registered. Signal methods of the object
+        are replaced such that their emission is sent on our connection.
+
+        Args:
+            dbus_object (objects.PropertiesObject): Object created with ``export=False``.
+        """
+        path = dbus_object.object_path
+        interfaces = introspection.get_interfaces(dbus_object)
+        exported = [interface for interface in interfaces
+            if interface.name not in introspection.STANDARD_INTERFACES]
+        node_info = Gio.DBusNodeInfo.new_for_xml(introspection.introspection_xml(exported))
+
+        for interface in exported:
+            for method in interface.methods:
+                self._methods[(path, interface.name, method.name)] = (dbus_object, method)
+            for prop in interface.properties:
+                self._properties[(path, interface.name, prop.name)] = (prop.signature,
+                    dbus_object._get_properties()[prop.name])
+            for signal in interface.signals:
+                self._hook_signal(dbus_object, interface.name, signal)
+            self._registration_ids.append(self._connection.register_object(path,
+                node_info.lookup_interface(interface.name), self._on_method_call,
+                self._on_get_property, None))
+
+        if dbus_object.properties_interface:
+            self._hook_properties_changed(dbus_object)
+
+    def own_name(self, name):
+        """Request ``name`` on the bus. Objects should be added before."""
+        self._owner_id = Gio.bus_own_name_on_connection(self._connection, name,
+            Gio.BusNameOwnerFlags.NONE, None, None)
+
+    def unexport(self):
+        """Release our bus name and unregister all objects."""
+        if self._owner_id is not None:
+            Gio.bus_unown_name(self._owner_id)
+            self._owner_id = None
+        for registration_id in self._registration_ids:
+            self._connection.unregister_object(registration_id)
+        self._registration_ids = []
+
+    def _hook_signal(self, dbus_object, interface, signal):
+        original = getattr(dbus_object, signal.name)
+        signature = ''.join(arg_signature for name, arg_signature in signal.args)
+
+        def emit(*args):
+            original(*args)
+            parameters = GLib.Variant('({})'.format(signature), args) if signature else None
+            self._connection.emit_signal(None, dbus_object.object_path, interface,
+                signal.name, parameters)
+
+        setattr(dbus_object, signal.name, emit)
+
+    def _hook_properties_changed(self, dbus_object):
+        original = dbus_object.PropertiesChanged
+
+        def emit(interface, changed, invalidated):
+            original(interface, changed, invalidated)
+            changed = {name: GLib.Variant(dbus_object.get_property_signature(name), value)
+                for name, value in changed.items()}
+            self._connection.emit_signal(None, dbus_object.object_path, dbus.PROPERTIES_IFACE,
+                'PropertiesChanged', GLib.Variant('(sa{sv}as)',
+                    (interface, changed, list(invalidated))))
+
+        dbus_object.PropertiesChanged = emit
+
+    def _on_method_call(self, connection, sender, path, interface, name, parameters,
+            invocation):
+        dbus_object, method = self._methods[(path, interface, name)]
+        out_signature = ''.join(signature for each, signature in method.out_args)
+
+        def error_handler(error):
+            invocation.return_dbus_error(get_error_name(error), text_type(error))
+
+        def reply_handler(*result):
+            value = None
+            try:
+                if out_signature:
+                    value = GLib.Variant('({})'.format(out_signature), result)
+            except Exception as error:
+                # A reply not matching the out signature must still be answered.
+                error_handler(error)
+                return
+            invocation.return_value(value)
+
+        try:
+            args = self._get_args(method, parameters, invocation)
+            if method.async_callbacks:
+                reply_keyword, error_keyword = method.async_callbacks
+                method.function(dbus_object, *args, **{reply_keyword: reply_handler,
+                    error_keyword: error_handler})
+                return
+            result = method.function(dbus_object, *args)
+        except Exception as error:
+            error_handler(error)
+            return
+
+        if len(method.out_args) == 1:
+            result = (result,)
+        elif not method.out_args:
+            result = ()
+        reply_handler(*result)
+
+    def _get_args(self, method, parameters, invocation):
+        """Return the arguments of a call, replacing file descriptor indices by ``_UnixFd``."""
+        args = list(parameters.unpack())
+        fd_list = invocation.get_message().get_unix_fd_list()
+        for index, (name, signature) in enumerate(method.in_args):
+            if signature == 'h':
+                args[index] = _UnixFd(fd_list.get(args[index]))
+        return args
+
+    def _on_get_property(self, connection, sender, path, interface, name):
+        signature, getter = self._properties[(path, interface, name)]
+        return GLib.Variant(signature, getter())
@@ -21,13 +21,14 @@
 from __future__ import absolute_import, unicode_literals
 
 import datetime
+import os
 import sys
 
 import hamster_lib
 from dbus.mainloop.glib import DBusGMainLoop
-from gi.repository import GLib
+from gi.repository import Gio, GLib
 
-from hamster_dbus import objects
+from hamster_dbus import gdbus, objects, ongoing, snapshot
 
 
 def _get_config():
@@ -48,15 +49,61 @@ def _get_config():
     }
 
 
+def _get_service_config():
+    """
+    Get config for the service itself.
+
+    Unlike ``_get_config`` those values are not passed to the controller but
+    determine how the dbus service operates.
+
+    ``group_commit_window`` is the time (in seconds) writes may be held back
+    in order to share a single transaction. ``None`` commits each write on its
+    own. ``response_cache_size`` is the number of read replies kept in memory.
+    ``ongoing_fact_path`` is the file the 'ongoing fact' is persisted to.
+    ``None`` keeps it in memory only.
+    ``snapshot_path`` is the memory-mapped file clients may read the 'ongoing
+    fact' and today's totals from without using dbus (see ``snapshot``).
+    ``None`` disables it. ``peer_address`` is the address clients may connect
+    to directly, without going through the bus daemon. ``None`` disables it.
+    ``engine`` selects how our objects are exported: ``'dbus-python'`` or
+    ``'gdbus'`` (see ``gdbus``). It may be set using ``HAMSTER_DBUS_ENGINE``.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    return {
+        'group_commit_window': None,
+        'response_cache_size': 256,
+        'ongoing_fact_path': ongoing.default_path(),
+        'snapshot_path': snapshot.default_path(),
+        'peer_address': 'unix:tmpdir={}'.format(runtime_dir) if runtime_dir else None,
+        'engine': os.environ.get('HAMSTER_DBUS_ENGINE', 'dbus-python'),
+    }
+
+
 def _main():
     controller = hamster_lib.HamsterControl(_get_config())
+    service_config = _get_service_config()
+    use_gdbus = service_config['engine'] == 'gdbus'
     DBusGMainLoop(set_as_default=True)
     loop = GLib.MainLoop()
-    main_object = objects.HamsterDBus(loop)
-    objects.CategoryManager(controller, main_object)
-    objects.ActivityManager(controller, main_object)
-    objects.TagManager(controller, main_object)
-    objects.FactManager(controller, main_object)
+    main_object = objects.HamsterDBus(loop,
+        group_commit_window=service_config['group_commit_window'],
+        response_cache_size=service_config['response_cache_size'],
+        peer_address=service_config['peer_address'],
+        export=not use_gdbus)
+    managers = [
+        objects.CategoryManager(controller, main_object),
+        objects.ActivityManager(controller, main_object),
+        objects.TagManager(controller, main_object),
+        objects.FactManager(controller, main_object,
+            ongoing_fact_path=service_config['ongoing_fact_path'],
+            snapshot_path=service_config['snapshot_path']),
+        objects.Reports(controller, main_object),
+    ]
+    if use_gdbus:
+        exporter = gdbus.GDBusExporter(Gio.bus_get_sync(Gio.BusType.SESSION, None))
+        for dbus_object in [main_object] + managers:
+            exporter.add_object(dbus_object)
+        exporter.own_name('org.projecthamster.HamsterDBus')
     # Run needs to be called after we setup our service
     loop.run()
 
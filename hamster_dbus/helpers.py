@@ -21,19 +21,43 @@ is defined and documented. All dbus code is advised to use those serialization m
 ensure consistend representation.
 """
 
+import calendar
 import datetime
+import re
 from collections import namedtuple
 
 import dbus
 import hamster_lib
 from six import text_type
 
+from hamster_dbus import schema
+
 DBusCategory = namedtuple('DBusCategory', ('pk', 'name'))
 # 'category' is supposed to store an ``DBushamster_lib.Category`` instance.
 DBusActivity = namedtuple('DBusActivity', ('pk', 'name', 'category', 'deleted'))
 DBusTag = namedtuple('DBusTag', ('pk', 'name'))
 # 'activity' is supposed to store an ``DBushamster_lib.Activity`` instance.
 DBusFact = namedtuple('DBusFact', ('pk', 'start', 'end', 'description', 'activity', 'tags'))
+# Column oriented representation of a list of facts. See ``hamster_to_dbus_fact_columns``.
+DBusFactColumns = namedtuple('DBusFactColumns',
+    schema.out_arg_names(schema.FACTS_INTERFACE, 'GetAllColumnar'))
+# Dictionary encoded list of facts. See ``hamster_to_dbus_fact_table``.
+DBusFactTable = namedtuple('DBusFactTable',
+    schema.out_arg_names(schema.FACTS_INTERFACE, 'GetAllNormalized'))
+# Durations per time bucket and group. See ``series_to_dbus``.
+DBusSeries = namedtuple('DBusSeries', schema.out_arg_names(schema.REPORTS_INTERFACE,
+    'GetSeries'))
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+# Canonical shapes produced by ``datetime_to_text``, handled without ``strptime``.
+_DATETIME_SHAPE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}\Z')
+_DATE_SHAPE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}\Z')
+_TIME_SHAPE = re.compile(r'[0-9]{2}:[0-9]{2}:[0-9]{2}\Z')
+
+# Successfully parsed values by text. Cleared once it reaches ``_MEMO_SIZE``.
+_text_to_datetime_memo = {}
+_MEMO_SIZE = 4096
 
 
 def _none_to_int(value):
@@ -115,7 +139,52 @@ def text_to_datetime(datetime_text):
     Raises:
         ValueError: If passed text does not match any of the given formats.
 
+    Note:
+        Text in the fixed width format produced by ``datetime_to_text`` is
+        parsed directly, anything else by ``strptime``. Results are memoized.
+    """
+    try:
+        return _text_to_datetime_memo[datetime_text]
+    except KeyError:
+        pass
+
+    result = _parse_fixed_width(datetime_text)
+    if result is None:
+        result = _parse_datetime_text(datetime_text)
+    if len(_text_to_datetime_memo) >= _MEMO_SIZE:
+        _text_to_datetime_memo.clear()
+    _text_to_datetime_memo[datetime_text] = result
+    return result
+
+
+def _parse_fixed_width(datetime_text):
+    """
+    Parse text in one of the shapes produced by ``datetime_to_text``.
+
+    Returns:
+        datetime.datetime, datetime.date, datetime.time or None: ``None`` if the
+        text does not have one of those shapes or is not a valid value.
     """
+    try:
+        length = len(datetime_text)
+        if length == 19 and _DATETIME_SHAPE.match(datetime_text):
+            return datetime.datetime(int(datetime_text[0:4]), int(datetime_text[5:7]),
+                int(datetime_text[8:10]), int(datetime_text[11:13]),
+                int(datetime_text[14:16]), int(datetime_text[17:19]))
+        if length == 10 and _DATE_SHAPE.match(datetime_text):
+            return datetime.date(int(datetime_text[0:4]), int(datetime_text[5:7]),
+                int(datetime_text[8:10]))
+        if length == 8 and _TIME_SHAPE.match(datetime_text):
+            return datetime.time(int(datetime_text[0:2]), int(datetime_text[3:5]),
+                int(datetime_text[6:8]))
+    except ValueError:
+        # Leave it to ``strptime`` to raise the appropriate error.
+        pass
+    return None
+
+
+def _parse_datetime_text(datetime_text):
+    """Parse text using ``strptime``. See ``text_to_datetime``."""
     if datetime_text == '':
         result = None
     else:
@@ -129,6 +198,40 @@ def text_to_datetime(datetime_text):
     return result
 
 
+def datetime_to_epoch(datetime_info):
+    """
+    Serialize a ``datetime.datetime`` instance as seconds since the epoch.
+
+    As we do not support timezone information the (naive) datetime is taken
+    as is, without any conversion from local time. ``epoch_to_datetime`` is
+    its exact inverse.
+
+    Args:
+        datetime_info (datetime.datetime or None): Datetime to be serialized.
+
+    Returns:
+        int: Seconds since ``1970-01-01 00:00:00``. ``-1`` if ``datetime_info=None``.
+    """
+    if datetime_info is None:
+        return -1
+    return calendar.timegm(datetime_info.timetuple())
+
+
+def epoch_to_datetime(seconds):
+    """
+    Return the ``datetime.datetime`` instance represented by seconds since the epoch.
+
+    Args:
+        seconds (int): Value as returned by ``datetime_to_epoch``.
+
+    Returns:
+        datetime.datetime or None: Naive datetime. ``None`` if ``seconds=-1``.
+    """
+    if seconds == -1:
+        return None
+    return _EPOCH + datetime.timedelta(seconds=int(seconds))
+
+
 # This is needed because not all types used in ``as_tuple`` can be passed
 # through dbus
 def hamster_to_dbus_category(category):
@@ -394,7 +497,7 @@ def hamster_to_dbus_fact(fact):
     def get_tags(fact):
         # We need to build the Array explicitly in order to avoid python-dbus
         # trying to guess its signature (which fails for empty lists).
-        return dbus.Array([hamster_to_dbus_tag(tag) for tag in fact.tags], '(is)')
+        return dbus.Array([hamster_to_dbus_tag(tag) for tag in fact.tags], schema.TAG)
 
     return DBusFact(
         pk=get_pk(fact),
@@ -448,3 +551,532 @@ def dbus_to_hamster_fact(fact_tuple):
         tags=get_tags(fact_tuple),
         description=get_description(fact_tuple)
     )
+
+
+class _DictionaryEncoder(object):
+    """
+    Collect each distinct activity, category and tag once and refer to it by index.
+
+    The resulting tables have the following signatures:
+
+    a(isib)     activities: (pk, name, category index, deleted)
+    a(is)       categories: (pk, name)
+    a(is)       tags: (pk, name)
+
+    A category index of ``-1`` denotes an activity without category.
+    """
+
+    def __init__(self):
+        """Initialize a new instance with empty tables."""
+        self.activity_table = []
+        self.category_table = []
+        self.tag_table = []
+        self._activities = {}
+        self._categories = {}
+        self._tags = {}
+
+    def _index(self, indices, table, entry):
+        try:
+            index = indices[entry]
+        except KeyError:
+            index = indices[entry] = len(table)
+            table.append(entry)
+        return index
+
+    def category_index(self, category):
+        """Return the table index of a ``hamster_lib.Category`` or ``-1`` for ``None``."""
+        if category is None:
+            return -1
+        entry = (_none_to_int(category.pk), category.name)
+        return self._index(self._categories, self.category_table, entry)
+
+    def activity_index(self, activity):
+        """Return the table index of a ``hamster_lib.Activity``."""
+        entry = (_none_to_int(activity.pk), activity.name,
+            self.category_index(activity.category), bool(activity.deleted))
+        return self._index(self._activities, self.activity_table, entry)
+
+    def tag_index(self, tag):
+        """Return the table index of a ``hamster_lib.Tag``."""
+        entry = (_none_to_int(tag.pk), tag.name)
+        return self._index(self._tags, self.tag_table, entry)
+
+    def tables(self):
+        """Return activity, category and tag tables as ``dbus.Array`` instances."""
+        return (
+            dbus.Array(self.activity_table, schema.ACTIVITY_ROW),
+            dbus.Array(self.category_table, schema.NAME_ROW),
+            dbus.Array(self.tag_table, schema.NAME_ROW),
+        )
+
+
+def hamster_to_dbus_fact_columns(facts):
+    """
+    Convert a list of ``hamster_lib.Fact`` instances to a column oriented representation.
+
+    Instead of one struct per fact, each fact attribute is represented as an
+    array holding the values of all facts ('parallel arrays'). Activities,
+    categories and tags are only included once, in dedicated tables, and
+    referred to by their index within those. The resulting ``DBusFactColumns``
+    is suitable for dbus messages and has the following signature:
+    'aiaxaxasaiauaua(isib)a(is)a(is)'.
+
+    ai          pks
+    ax          starts as returned by ``datetime_to_epoch``
+    ax          ends as returned by ``datetime_to_epoch``
+    as          descriptions
+    ai          activity table index of each fact
+    au          tag offsets: the tags of fact ``n`` are ``tags[offsets[n]:offsets[n + 1]]``
+    au          tag table indices
+    a(isib)     activity table, see ``_DictionaryEncoder``
+    a(is)       category table
+    a(is)       tag table
+
+    Args:
+        facts (iterable): ``hamster_lib.Fact`` instances to be serialized.
+
+    Returns:
+        DBusFactColumns: Serialized facts.
+    """
+    encoder = _DictionaryEncoder()
+    pks, starts, ends, descriptions, activities = [], [], [], [], []
+    tag_offsets, tags = [0], []
+    for fact in facts:
+        pks.append(_none_to_int(fact.pk))
+        starts.append(datetime_to_epoch(fact.start))
+        ends.append(datetime_to_epoch(fact.end))
+        descriptions.append(fact.description or '')
+        activities.append(encoder.activity_index(fact.activity))
+        tags.extend(encoder.tag_index(tag) for tag in fact.tags)
+        tag_offsets.append(len(tags))
+
+    activity_table, category_table, tag_table = encoder.tables()
+    return DBusFactColumns(
+        pks=dbus.Array(pks, 'i'),
+        starts=dbus.Array(starts, 'x'),
+        ends=dbus.Array(ends, 'x'),
+        descriptions=dbus.Array(descriptions, 's'),
+        activities=dbus.Array(activities, 'i'),
+        tag_offsets=dbus.Array(tag_offsets, 'u'),
+        tags=dbus.Array(tags, 'u'),
+        activity_table=activity_table,
+        category_table=category_table,
+        tag_table=tag_table,
+    )
+
+
+def hamster_to_dbus_fact_table(facts):
+    """
+    Convert a list of ``hamster_lib.Fact`` instances to a dictionary encoded representation.
+
+    Facts are represented much like by ``hamster_to_dbus_fact`` but refer to
+    their activity and tags by index. Each distinct activity, category and
+    tag is only included once, in dedicated tables. The resulting
+    ``DBusFactTable`` is suitable for dbus messages and has the following
+    signature: 'a(isssiau)a(isib)a(is)a(is)'.
+
+    a(isssiau)  facts: (pk, start, end, description, activity index, tag indices)
+    a(isib)     activity table, see ``_DictionaryEncoder``
+    a(is)       category table
+    a(is)       tag table
+
+    Args:
+        facts (iterable): ``hamster_lib.Fact`` instances to be serialized.
+
+    Returns:
+        DBusFactTable: Serialized facts.
+    """
+    encoder = _DictionaryEncoder()
+    rows = []
+    for fact in facts:
+        rows.append((
+            _none_to_int(fact.pk),
+            datetime_to_text(fact.start),
+            datetime_to_text(fact.end),
+            fact.description or '',
+            encoder.activity_index(fact.activity),
+            dbus.Array([encoder.tag_index(tag) for tag in fact.tags], 'u'),
+        ))
+
+    activity_table, category_table, tag_table = encoder.tables()
+    return DBusFactTable(
+        facts=dbus.Array(rows, schema.NORMALIZED_FACT),
+        activity_table=activity_table,
+        category_table=category_table,
+        tag_table=tag_table,
+    )
+
+
+def dbus_to_hamster_fact_table(fact_table):
+    """
+    Return ``hamster_lib.Fact`` instances from their dictionary encoded representation.
+
+    Each table entry is converted only once. All facts referring to the same
+    activity (or tag) share the very same ``hamster_lib.Activity`` (or
+    ``hamster_lib.Tag``) instance.
+
+    Args:
+        fact_table (DBusFactTable or tuple): As returned by ``hamster_to_dbus_fact_table``.
+
+    Returns:
+        list: ``hamster_lib.Fact`` instances.
+    """
+    fact_table = DBusFactTable(*fact_table)
+    categories = [hamster_lib.Category(name, pk=_int_to_none(pk))
+        for pk, name in fact_table.category_table]
+    activities = [
+        hamster_lib.Activity(name, pk=_int_to_none(pk), deleted=bool(deleted),
+            category=categories[category] if category != -1 else None)
+        for pk, name, category, deleted in fact_table.activity_table
+    ]
+    tags = [hamster_lib.Tag(name, pk=_int_to_none(pk)) for pk, name in fact_table.tag_table]
+
+    return [
+        hamster_lib.Fact(
+            pk=_int_to_none(pk),
+            start=text_to_datetime(start),
+            end=text_to_datetime(end),
+            activity=activities[activity],
+            tags=[tags[index] for index in tag_indices],
+            description=description,
+        )
+        for pk, start, end, description, activity, tag_indices in fact_table.facts
+    ]
+
+
+def series_to_dbus(bucket_starts, durations):
+    """
+    Convert durations per bucket and group (see ``reports.get_series``) for dbus.
+
+    The resulting ``DBusSeries`` has the following signature: 'axa(is)a(uuu)'.
+
+    ax          bucket starts as returned by ``datetime_to_epoch``
+    a(is)       groups: ``(pk, name)`` of activities, categories or tags.
+                ``(-1, '')`` stands for facts without category or tags.
+    a(uuu)      durations: (bucket index, group index, seconds). Empty
+                buckets are omitted.
+
+    Args:
+        bucket_starts (list): ``datetime.datetime`` instances.
+        durations (dict): Mapping of ``(bucket index, (pk, name))`` tuples to seconds.
+
+    Returns:
+        DBusSeries: Serialized series, ordered by bucket and group.
+    """
+    groups = sorted(set(group for index, group in durations))
+    group_indices = {group: index for index, group in enumerate(groups)}
+    rows = [(index, group_indices[group], seconds)
+        for (index, group), seconds in sorted(durations.items())]
+    return DBusSeries(
+        bucket_starts=dbus.Array([datetime_to_epoch(start) for start in bucket_starts], 'x'),
+        groups=dbus.Array(groups, schema.NAME_ROW),
+        durations=dbus.Array(rows, '(uuu)'),
+    )
+
+
+def dbus_to_series(series):
+    """
+    Convert a series as returned by ``series_to_dbus`` to python types.
+
+    Args:
+        series (DBusSeries or tuple): Serialized series.
+
+    Returns:
+        DBusSeries: ``bucket_starts`` are ``datetime.datetime`` instances,
+            ``groups`` and ``durations`` lists of plain tuples.
+    """
+    series = DBusSeries(*series)
+    return DBusSeries(
+        bucket_starts=[epoch_to_datetime(seconds) for seconds in series.bucket_starts],
+        groups=[(int(pk), text_type(name)) for pk, name in series.groups],
+        durations=[(int(bucket), int(group), int(seconds))
+            for bucket, group, seconds in series.durations],
+    )
+
+
+def gaps_to_dbus(gaps):
+    """
+    Convert gaps (see ``reports.get_gaps``) for dbus.
+
+    Args:
+        gaps (list): ``(start, end)`` tuples of ``datetime.datetime`` instances.
+
+    Returns:
+        dbus.Array: Array with signature 'a(xx)' of start and end as returned
+            by ``datetime_to_epoch``.
+    """
+    return dbus.Array([(datetime_to_epoch(start), datetime_to_epoch(end))
+        for start, end in gaps], '(xx)')
+
+
+def dbus_to_gaps(gaps):
+    """Convert gaps as returned by ``gaps_to_dbus`` to ``(start, end)`` datetime tuples."""
+    return [(epoch_to_datetime(start), epoch_to_datetime(end)) for start, end in gaps]
+
+
+def conflicts_to_dbus(conflicts):
+    """
+    Convert conflicts (see ``reports.get_conflicts``) for dbus.
+
+    Args:
+        conflicts (list): ``(start, end, pk, other pk)`` tuples.
+
+    Returns:
+        dbus.Array: Array with signature 'a(xxii)'. Start and end are
+            represented as returned by ``datetime_to_epoch``.
+    """
+    return dbus.Array([(datetime_to_epoch(start), datetime_to_epoch(end), pk, other_pk)
+        for start, end, pk, other_pk in conflicts], '(xxii)')
+
+
+def dbus_to_conflicts(conflicts):
+    """Convert conflicts as returned by ``conflicts_to_dbus`` to python types."""
+    return [(epoch_to_datetime(start), epoch_to_datetime(end), int(pk), int(other_pk))
+        for start, end, pk, other_pk in conflicts]
+
+
+def top_activities_to_dbus(ranking):
+    """
+    Convert a ranking of activities for dbus.
+
+    Args:
+        ranking (list): ``(hamster_lib.Activity, seconds, count)`` tuples.
+
+    Returns:
+        dbus.Array: Array with signature 'a((is(is)b)uu)'.
+    """
+    return dbus.Array([(encode_activity(activity), seconds, count)
+        for activity, seconds, count in ranking], '({}uu)'.format(schema.ACTIVITY))
+
+
+def dbus_to_top_activities(ranking):
+    """Convert a ranking as returned by ``top_activities_to_dbus`` to python types."""
+    return [(decode_activity(activity), int(seconds), int(count))
+        for activity, seconds, count in ranking]
+
+
+def top_tags_to_dbus(ranking):
+    """
+    Convert a ranking of tags for dbus.
+
+    Args:
+        ranking (list): ``(hamster_lib.Tag, seconds, count)`` tuples.
+
+    Returns:
+        dbus.Array: Array with signature 'a((is)uu)'.
+    """
+    return dbus.Array([(encode_tag(tag), seconds, count) for tag, seconds, count in ranking],
+        '({}uu)'.format(schema.TAG))
+
+
+def dbus_to_top_tags(ranking):
+    """Convert a ranking as returned by ``top_tags_to_dbus`` to python types."""
+    return [(decode_tag(tag), int(seconds), int(count)) for tag, seconds, count in ranking]
+
+
+# The following codec produces the very same messages as the ``hamster_to_dbus_*``
+# and ``dbus_to_hamster_*`` functions above, but is meant for converting many
+# instances at once. Converters are plain module level functions that avoid any
+# per call closures or intermediate namedtuples. Structs and arrays are
+# constructed with their signature given explicitly, so python-dbus never needs
+# to guess it.
+
+# Struct signatures as declared in ``schema``, without the enclosing parentheses.
+CATEGORY_SIGNATURE = schema.CATEGORY[1:-1]
+ACTIVITY_SIGNATURE = schema.ACTIVITY[1:-1]
+TAG_SIGNATURE = schema.TAG[1:-1]
+FACT_SIGNATURE = schema.FACT[1:-1]
+
+_NO_CATEGORY = dbus.Struct((-2, ''), signature=CATEGORY_SIGNATURE)
+_NO_ACTIVITY = dbus.Struct((-2, '', _NO_CATEGORY, False), signature=ACTIVITY_SIGNATURE)
+
+
+def encode_category(category):
+    """Return the dbus representation of a ``hamster_lib.Category`` (or ``None``)."""
+    if category is None:
+        return _NO_CATEGORY
+    pk = category.pk
+    return dbus.Struct((-1 if pk is None else int(pk), category.name),
+        signature=CATEGORY_SIGNATURE)
+
+
+def encode_activity(activity):
+    """Return the dbus representation of a ``hamster_lib.Activity`` (or ``None``)."""
+    if activity is None:
+        return _NO_ACTIVITY
+    pk = activity.pk
+    return dbus.Struct((-1 if pk is None else int(pk), activity.name,
+        encode_category(activity.category), activity.deleted), signature=ACTIVITY_SIGNATURE)
+
+
+def encode_tag(tag):
+    """Return the dbus representation of a ``hamster_lib.Tag``."""
+    pk = tag.pk
+    return dbus.Struct((-1 if pk is None else int(pk), tag.name), signature=TAG_SIGNATURE)
+
+
+def encode_fact(fact):
+    """
+    Return the dbus representation of a ``hamster_lib.Fact``.
+
+    This is equivalent to ``hamster_to_dbus_fact``.
+    """
+    pk = fact.pk
+    return dbus.Struct((
+        -1 if pk is None else int(pk),
+        datetime_to_text(fact.start),
+        datetime_to_text(fact.end),
+        fact.description or '',
+        encode_activity(fact.activity),
+        dbus.Array([encode_tag(tag) for tag in fact.tags], signature=TAG_SIGNATURE),
+    ), signature=FACT_SIGNATURE)
+
+
+def encode_facts(facts):
+    """
+    Return the dbus representation of a list of ``hamster_lib.Fact`` instances.
+
+    Args:
+        facts (iterable): Facts to be serialized.
+
+    Returns:
+        dbus.Array: Array of fact structs with signature 'a(isss(is(is)b)a(is))'.
+    """
+    return dbus.Array([encode_fact(fact) for fact in facts], signature=FACT_SIGNATURE)
+
+
+def decode_category(category_tuple):
+    """Return a ``hamster_lib.Category`` (or ``None``) from its dbus representation."""
+    pk, name = category_tuple
+    if pk == -2:
+        return None
+    return hamster_lib.Category(name, pk=None if pk == -1 else int(pk))
+
+
+def decode_activity(activity_tuple):
+    """Return a ``hamster_lib.Activity`` from its dbus representation."""
+    pk, name, category, deleted = activity_tuple
+    if pk == -2:
+        return None
+    return hamster_lib.Activity(name, pk=None if pk == -1 else int(pk),
+        category=decode_category(category))
+
+
+def decode_tag(tag_tuple):
+    """Return a ``hamster_lib.Tag`` from its dbus representation."""
+    pk, name = tag_tuple
+    if pk == -2:
+        return None
+    return hamster_lib.Tag(name, pk=None if pk == -1 else int(pk))
+
+
+def decode_fact(fact_tuple):
+    """
+    Return a ``hamster_lib.Fact`` from its dbus representation.
+
+    This is equivalent to ``dbus_to_hamster_fact``.
+    """
+    pk, start, end, description, activity, tags = fact_tuple
+    return hamster_lib.Fact(
+        decode_activity(activity),
+        text_to_datetime(start),
+        end=text_to_datetime(end),
+        pk=None if pk == -1 else int(pk),
+        description=description,
+        tags=[decode_tag(tag) for tag in tags],
+    )
+
+
+def decode_facts(fact_tuples, context=None):
+    """
+    Return ``hamster_lib.Fact`` instances from their dbus representation.
+
+    Args:
+        fact_tuples (iterable): Fact structs as returned by ``encode_facts``.
+        context (DecodeContext, optional): If given, identical activities,
+            categories and tags are shared between facts. Defaults to ``None``.
+
+    Returns:
+        list: ``hamster_lib.Fact`` instances.
+    """
+    if context is not None:
+        return [context.decode_fact(fact_tuple) for fact_tuple in fact_tuples]
+    return [decode_fact(fact_tuple) for fact_tuple in fact_tuples]
+
+
+class DecodeContext(object):
+    """
+    Share identical objects while decoding a single result set.
+
+    Names are interned and each distinct activity, category and tag is only
+    converted once. All facts referring to it share the very same instance,
+    so changing it for one fact changes it for all of them. Use a new context
+    for each result set.
+    """
+
+    def __init__(self):
+        """Initialize a new, empty context."""
+        self._names = {}
+        self._categories = {}
+        self._activities = {}
+        self._tags = {}
+
+    def intern(self, text):
+        """Return a shared plain text copy of ``text``."""
+        try:
+            return self._names[text]
+        except KeyError:
+            result = self._names[text] = text_type(text)
+            return result
+
+    def decode_category(self, category_tuple):
+        """Like ``decode_category`` but returning shared instances."""
+        key = tuple(category_tuple)
+        try:
+            return self._categories[key]
+        except KeyError:
+            pk, name = key
+            result = None
+            if pk != -2:
+                result = hamster_lib.Category(self.intern(name), pk=None if pk == -1 else int(pk))
+            self._categories[key] = result
+            return result
+
+    def decode_activity(self, activity_tuple):
+        """Like ``decode_activity`` but returning shared instances."""
+        key = tuple(activity_tuple)
+        try:
+            return self._activities[key]
+        except KeyError:
+            pk, name, category, deleted = key
+            result = None
+            if pk != -2:
+                result = hamster_lib.Activity(self.intern(name),
+                    pk=None if pk == -1 else int(pk), category=self.decode_category(category))
+            self._activities[key] = result
+            return result
+
+    def decode_tag(self, tag_tuple):
+        """Like ``decode_tag`` but returning shared instances."""
+        key = tuple(tag_tuple)
+        try:
+            return self._tags[key]
+        except KeyError:
+            pk, name = key
+            result = None
+            if pk != -2:
+                result = hamster_lib.Tag(self.intern(name), pk=None if pk == -1 else int(pk))
+            self._tags[key] = result
+            return result
+
+    def decode_fact(self, fact_tuple):
+        """Like ``decode_fact`` but sharing activities, categories and tags."""
+        pk, start, end, description, activity, tags = fact_tuple
+        return hamster_lib.Fact(
+            self.decode_activity(activity),
+            text_to_datetime(start),
+            end=text_to_datetime(end),
+            pk=None if pk == -1 else int(pk),
+            description=description,
+            tags=[self.decode_tag(tag) for tag in tags],
+        )
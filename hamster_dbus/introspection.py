@@ -0,0 +1,190 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Describe the interfaces of our dbus objects independent of dbus-python.
+
+The methods, signals and properties of our objects are declared once in
+``schema`` and attached to their implementations by the ``dbus.service``
+decorators it generates. This module collects those declarations from an
+object so they can be used by other engines, e.g. in order to generate
+introspection XML.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from collections import OrderedDict, namedtuple
+from gettext import gettext as _
+from xml.sax.saxutils import quoteattr
+
+from hamster_dbus import schema
+
+# Interfaces provided by every dbus implementation itself.
+STANDARD_INTERFACES = (
+    'org.freedesktop.DBus.Introspectable',
+    'org.freedesktop.DBus.Peer',
+    'org.freedesktop.DBus.Properties',
+)
+
+# ``function`` is the undecorated implementation. ``in_args`` and ``out_args``
+# are lists of ``(name, signature)`` tuples, ``name`` may be ``None``.
+Method = namedtuple('Method', ('name', 'in_args', 'out_args', 'async_callbacks', 'function'))
+Signal = namedtuple('Signal', ('name', 'args'))
+Property = namedtuple('Property', ('name', 'signature'))
+Interface = namedtuple('Interface', ('name', 'methods', 'signals', 'properties'))
+
+_CONTAINER_ENDS = {'(': ')', '{': '}'}
+
+
+def split_signature(signature):
+    """
+    Split a dbus signature into its single complete types.
+
+    Args:
+        signature (text_type): Signature, e.g. ``'ia(is)a{sv}'``.
+
+    Returns:
+        list: Single complete types, e.g. ``['i', 'a(is)', 'a{sv}']``.
+
+    Raises:
+        ValueError: If ``signature`` is incomplete or unbalanced.
+    """
+    types = []
+    position = 0
+    while position < len(signature):
+        end = _complete_type_end(signature, position)
+        types.append(signature[position:end])
+        position = end
+    return types
+
+
+def _complete_type_end(signature, position):
+    """Return the index just after the single complete type starting at ``position``."""
+    while position < len(signature) and signature[position] == 'a':
+        position += 1
+    if position >= len(signature):
+        raise ValueError(_("Incomplete signature: '{}'.").format(signature))
+    char = signature[position]
+    if char in _CONTAINER_ENDS:
+        position += 1
+        while position < len(signature) and signature[position] != _CONTAINER_ENDS[char]:
+            position = _complete_type_end(signature, position)
+        if position >= len(signature):
+            raise ValueError(_("Unbalanced signature: '{}'.").format(signature))
+    elif char in ')}':
+        raise ValueError(_("Unbalanced signature: '{}'.").format(signature))
+    return position + 1
+
+
+def get_interfaces(dbus_object):
+    """
+    Return the interfaces implemented by a ``dbus.service.Object``.
+
+    Members are collected along the method resolution order of the objects
+    class, so overridden members are only reported once.
+
+    Args:
+        dbus_object (dbus.service.Object): Object to be described. If it is an
+            ``objects.PropertiesObject`` its properties are included as well.
+
+    Returns:
+        list: ``Interface`` instances, ordered by name.
+    """
+    methods = OrderedDict()
+    signals = OrderedDict()
+    for klass in type(dbus_object).__mro__:
+        for name, function in sorted(vars(klass).items()):
+            interface = getattr(function, '_dbus_interface', None)
+            if getattr(function, '_dbus_is_method', False):
+                key = (interface, name)
+                if key not in methods:
+                    methods[key] = Method(name,
+                        _args(function._dbus_args, function._dbus_in_signature),
+                        _args(_out_arg_names(interface, name), function._dbus_out_signature),
+                        function._dbus_async_callbacks, function)
+            elif getattr(function, '_dbus_is_signal', False):
+                key = (interface, name)
+                if key not in signals:
+                    signals[key] = Signal(name, _args(function._dbus_args,
+                        function._dbus_signature))
+
+    properties = {}
+    properties_interface = getattr(dbus_object, 'properties_interface', None)
+    if properties_interface:
+        properties[properties_interface] = [
+            Property(name, dbus_object.get_property_signature(name))
+            for name in sorted(dbus_object._get_properties())]
+
+    names = set(interface for interface, name in methods) | set(
+        interface for interface, name in signals) | set(properties)
+    return [Interface(name,
+        [method for (interface, each), method in methods.items() if interface == name],
+        [signal for (interface, each), signal in signals.items() if interface == name],
+        properties.get(name, [])) for name in sorted(names)]
+
+
+def _out_arg_names(interface, name):
+    """Return the out argument names ``schema`` declares for a method, if any."""
+    try:
+        return schema.out_arg_names(interface, name)
+    except KeyError:
+        return None
+
+
+def _args(names, signature):
+    types = split_signature(signature or '')
+    names = list(names or [])
+    names += [None] * (len(types) - len(names))
+    return list(zip(names, types))
+
+
+def introspection_xml(interfaces):
+    """
+    Return introspection XML describing the given interfaces.
+
+    Args:
+        interfaces (list): ``Interface`` instances as returned by ``get_interfaces``.
+
+    Returns:
+        text_type: A complete ``<node>`` document.
+    """
+    lines = ['<node>']
+    for interface in interfaces:
+        lines.append('  <interface name={}>'.format(quoteattr(interface.name)))
+        for method in interface.methods:
+            lines.append('    <method name={}>'.format(quoteattr(method.name)))
+            lines.extend(_arg_xml(name, signature, 'in') for name, signature in method.in_args)
+            lines.extend(_arg_xml(name, signature, 'out') for name, signature in method.out_args)
+            lines.append('    </method>')
+        for signal in interface.signals:
+            lines.append('    <signal name={}>'.format(quoteattr(signal.name)))
+            lines.extend(_arg_xml(name, signature) for name, signature in signal.args)
+            lines.append('    </signal>')
+        for prop in interface.properties:
+            lines.append('    <property name={} type={} access="read"/>'.format(
+                quoteattr(prop.name), quoteattr(prop.signature)))
+        lines.append('  </interface>')
+    lines.append('</node>')
+    return '\n'.join(lines) + '\n'
+
+
+def _arg_xml(name, signature, direction=None):
+    attributes = ''
+    if name:
+        attributes += ' name={}'.format(quoteattr(name))
+    attributes += ' type={}'.format(quoteattr(signature))
+    if direction:
+        attributes += ' direction="{}"'.format(direction)
+    return '      <arg{}/>'.format(attributes)
@@ -30,20 +30,360 @@ Capitalization violates PEP8 due to dbus specifications on method names
 # passed over dbus. Future iteration should revisit this and see if we can
 # expose those objects as dbus objects and consequently just pass those.
 
-# If the ``dbus.service.method`` decorator spans multiple lines we need to add
-# the ``   # NOQA`` afterwards instead of the actual function definition.
+# Methods and signals are declared in ``schema``, their decorators check that
+# the arguments of our implementations match those declarations.
 from __future__ import absolute_import, unicode_literals
 
+import codecs
+import contextlib
+import copy
+import datetime
+import errno
+import fcntl
+import itertools
+import os
+from gettext import gettext as _
+
 import dbus
+import dbus.server
 import dbus.service
 import hamster_lib
+from gi.repository import GLib
+from hamster_lib.backends.sqlalchemy import objects as alchemy
+from hamster_lib.helpers import time as time_helpers
+from six import text_type
+
+from hamster_dbus import (cache, formats, helpers, ongoing, queries,
+                          reports, rollup, schema, snapshot)
+
+DBUS_CATEGORIES_INTERFACE = schema.CATEGORIES_INTERFACE
+DBUS_TAGS_INTERFACE = schema.TAGS_INTERFACE
+DBUS_ACTIVITIES_INTERFACE = schema.ACTIVITIES_INTERFACE
+DBUS_FACTS_INTERFACE = schema.FACTS_INTERFACE
+
+# Keyword arguments dbus-python passes the reply and error callbacks of
+# asynchronous methods as.
+_ASYNC_CALLBACKS = ('reply_handler', 'error_handler')
+
+# Config used to complete the timeframe of parsed ``raw facts``. This matches the
+# default used by ``hamster_lib.Fact.create_from_raw_fact``.
+_RAW_FACT_CONFIG = {'day_start': datetime.time(0, 0, 0)}
+
+
+def _split_raw_fact(rest):
+    """
+    Split what remains of a ``raw fact`` after its time info into head and description.
+
+    Args:
+        rest (text_type): ``raw fact`` without its time info.
+
+    Returns:
+        tuple: ``(head, description)`` tuple. ``head`` is the ``activity@category``
+            part, ``description`` the (stripped) text after the first comma
+            following the ``@`` symbol or ``None``. Just as with
+            ``hamster_lib.helpers.parse_raw_fact`` there is no description
+            without a category.
+    """
+    at = rest.find('@')
+    comma = rest.find(',', at) if at != -1 else -1
+    if comma == -1:
+        head, description = rest, None
+    else:
+        head, description = rest[:comma], rest[comma + 1:].strip()
+    return head, description
+
+
+def _parse_raw_fact_head(head):
+    """
+    Extract activity and category name from the head of a ``raw fact``.
+
+    Args:
+        head (text_type): ``activity@category`` part of a raw fact.
+
+    Returns:
+        tuple: ``(activity_name, category_name)``. ``category_name`` may be ``None``.
+
+    Raises:
+        ValueError: If no activity name could be extracted.
+    """
+    activity_name, at, category_name = head.partition('@')
+    activity_name, category_name = activity_name.strip(), category_name.strip()
+    if not activity_name:
+        raise ValueError(_("Unable to extract activity name"))
+    return activity_name, category_name or None
+
+
+def _get_activity_by_composite(controller, main_object, name, category_name):
+    """
+    Look up an activity by its unique ``name``/``category.name`` composite key.
+
+    Args:
+        controller (hamster_lib.HamsterControl): Controller to query on index misses.
+        main_object (HamsterDBus): Main object holding the ``activity_index``.
+        name (text_type): Name of the activity.
+        category_name (text_type or None): Name of the activities category.
+            ``None`` if the activity has no category.
+
+    Returns:
+        helpers.DBusActivity: The matching activity.
+
+    Raises:
+        KeyError: If there is no such activity.
+    """
+    def lookup():
+        category = None
+        if category_name is not None:
+            category = hamster_lib.Category(category_name)
+        activity = controller.store.activities.get_by_composite(name, category)
+        return helpers.hamster_to_dbus_activity(activity)
+
+    return main_object.activity_index.get((name, category_name), lookup)
+
+
+def _get_tag_by_name(controller, main_object, name):
+    """
+    Look up a tag by its name.
+
+    Args:
+        controller (hamster_lib.HamsterControl): Controller to query on index misses.
+        main_object (HamsterDBus): Main object holding the ``tag_index``.
+        name (text_type): Name of the tag.
+
+    Returns:
+        helpers.DBusTag: The matching tag.
+
+    Raises:
+        KeyError: If there is no such tag.
+    """
+    def lookup():
+        tag = controller.store.tags.get_by_name(name)
+        return helpers.hamster_to_dbus_tag(tag)
 
-from hamster_dbus import helpers
+    return main_object.tag_index.get(name, lookup)
+
+
+def _get_timeframe(config, start, end):
+    """
+    Convert serialized ``start`` and ``end`` values to ``datetime.datetime`` instances.
+
+    Args:
+        config (dict): Controller config. Its ``day_start`` is used to complete
+            dates.
+        start (text_type): Serialized start as accepted by ``helpers.text_to_datetime``.
+            Dates refer to the beginning of that day, times to today.
+        end (text_type): Serialized end as accepted by ``helpers.text_to_datetime``.
+            Dates refer to the end of that day, times to today.
+
+    Returns:
+        tuple: ``(start, end)`` tuple of ``datetime.datetime`` or ``None`` values.
+
+    Raises:
+        ValueError: If any value can not be parsed or ``end`` is before ``start``.
+    """
+    def complete(value, is_end):
+        if isinstance(value, datetime.datetime) or value is None:
+            return value
+        if isinstance(value, datetime.time):
+            return datetime.datetime.combine(datetime.date.today(), value)
+        if is_end:
+            return time_helpers.end_day_to_datetime(value, config)
+        return datetime.datetime.combine(value, config['day_start'])
+
+    start = complete(helpers.text_to_datetime(start), False)
+    end = complete(helpers.text_to_datetime(end), True)
+    if start and end and (end <= start):
+        raise ValueError(_("End value can not be earlier than start!"))
+    return start, end
+
+
+class _ExportJob(object):
+    """
+    Stream encoded facts into a file descriptor.
+
+    Data is only written when the descriptor is ready to accept more, and only
+    a chunk at a time, so the main loop stays responsive and memory usage is
+    independent of the export size.
+    """
+
+    def __init__(self, fd, facts, writer, chunk_size=200):
+        """
+        Initialize a new instance and start streaming.
 
-DBUS_CATEGORIES_INTERFACE = 'org.projecthamster.HamsterDBus.CategoryManager1'
-DBUS_TAGS_INTERFACE = 'org.projecthamster.HamsterDBus.TagManager1'
-DBUS_ACTIVITIES_INTERFACE = 'org.projecthamster.HamsterDBus.ActivityManager1'
-DBUS_FACTS_INTERFACE = 'org.projecthamster.HamsterDBus.FactManager1'
+        Args:
+            fd (int): File descriptor to write to. The job takes ownership and
+                closes it once done.
+            facts (iterator): Iterator of ``hamster_lib.Fact`` instances to export.
+            writer (formats.FactWriter): Writer used to encode the facts.
+            chunk_size (int, optional): Number of facts to be encoded at once.
+                Defaults to ``200``.
+        """
+        self._fd = fd
+        self._facts = facts
+        self._writer = writer
+        self._chunk_size = chunk_size
+        self._buffer = writer.header().encode('utf-8')
+
+        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        GLib.io_add_watch(fd, GLib.PRIORITY_LOW, GLib.IO_OUT | GLib.IO_ERR | GLib.IO_HUP,
+            self._on_ready)
+
+    def _on_ready(self, fd, condition):
+        """Write the next piece of data. Return ``False`` once done."""
+        if condition & (GLib.IO_ERR | GLib.IO_HUP):
+            # The reading end went away.
+            return self._close()
+
+        if not self._buffer:
+            facts = list(itertools.islice(self._facts, self._chunk_size))
+            if not facts:
+                return self._close()
+            self._buffer = self._writer.encode(facts).encode('utf-8')
+
+        try:
+            written = os.write(fd, self._buffer)
+        except OSError as error:
+            if error.errno in (errno.EAGAIN, errno.EINTR):
+                return True
+            return self._close()
+        self._buffer = self._buffer[written:]
+        return True
+
+    def _close(self):
+        os.close(self._fd)
+        return False
+
+
+class _ImportJob(object):
+    """
+    Read facts from a file descriptor and save them in chunked transactions.
+
+    Data is read whenever it is available. All records completed by a block
+    of data are saved within one transaction. Per record errors do not abort
+    the import but are collected and reported once it is done.
+    """
+
+    # Maximum number of per record errors that are reported in detail.
+    max_errors = 1000
+
+    def __init__(self, job_id, fd, reader, fact_manager, block_size=65536):
+        """
+        Initialize a new instance and start reading.
+
+        Args:
+            job_id (int): ID reported with progress signals.
+            fd (int): File descriptor to read from. The job takes ownership and
+                closes it once done.
+            reader (formats.FactReader): Reader used to decode the data.
+            fact_manager (FactManager): Manager used to save facts and emit signals.
+            block_size (int, optional): Maximum number of bytes to be read (and
+                hence records to be saved) at once. Defaults to ``65536``.
+        """
+        self._job_id = job_id
+        self._fd = fd
+        self._reader = reader
+        self._fact_manager = fact_manager
+        self._block_size = block_size
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.processed = 0
+        self.imported = 0
+        self.errors = []
+        self.failed = 0
+
+        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        self._watch()
+
+    def _watch(self):
+        """Call ``_on_ready`` whenever data is available."""
+        GLib.io_add_watch(self._fd, GLib.PRIORITY_LOW, GLib.IO_IN | GLib.IO_ERR | GLib.IO_HUP,
+            self._on_ready)
+
+    def _on_ready(self, fd, condition):
+        """Read and save the next block of data. Return ``False`` to remove the watch."""
+        group_commit = self._fact_manager._main_object.group_commit
+        if group_commit.pending:
+            # Our own commit would include the writes of another group. Stop
+            # watching (the data stays available) until that group is done.
+            group_commit.when_idle(self._watch)
+            return False
+
+        try:
+            data = os.read(fd, self._block_size)
+        except OSError as error:
+            if error.errno in (errno.EAGAIN, errno.EINTR):
+                return True
+            data = b''
+
+        if data:
+            records = self._reader.feed(self._decoder.decode(data))
+        else:
+            records = self._reader.feed(self._decoder.decode(b'', final=True))
+            records += self._reader.close()
+
+        if records:
+            self._save(records)
+            self._fact_manager.ImportProgress(self._job_id, self.processed, self.failed)
+
+        if not data:
+            os.close(self._fd)
+            errors = dbus.Array(self.errors, '(us)')
+            self._fact_manager.ImportFinished(self._job_id, self.imported, self.failed, errors)
+            return False
+        return True
+
+    def _save(self, records):
+        """Save all valid records within a single transaction."""
+        session = self._fact_manager._controller.store.session
+        saved = []
+        with _deferred_commits(session):
+            for record in records:
+                self.processed += 1
+                if record.error:
+                    self._fail(record.number, record.error)
+                    continue
+                try:
+                    self._fact_manager._save_record(record.fields)
+                except Exception as error:
+                    # Discard whatever the failed record did and redo the
+                    # records saved so far.
+                    self._rollback()
+                    self._fail(record.number, text_type(error))
+                    saved = self._replay(saved)
+                else:
+                    saved.append(record)
+
+        try:
+            session.commit()
+        except Exception as error:
+            self._rollback()
+            for record in saved:
+                self._fail(record.number, text_type(error))
+            saved = []
+        if saved:
+            self.imported += len(saved)
+            self._fact_manager._on_facts_imported()
+
+    def _replay(self, records):
+        """Save ``records`` again after a rollback. Return those that succeeded."""
+        for index, record in enumerate(records):
+            try:
+                self._fact_manager._save_record(record.fields)
+            except Exception as error:
+                self._rollback()
+                self._fail(record.number, text_type(error))
+                return self._replay(records[:index] + records[index + 1:])
+        return records
+
+    def _rollback(self):
+        """Roll back the current transaction and anything indexed during it."""
+        self._fact_manager._controller.store.session.rollback()
+        self._fact_manager._main_object.invalidate_caches()
+
+    def _fail(self, number, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((number, message))
 
 
 def _get_dbus_bus_name(bus=None):
@@ -53,51 +393,671 @@ def _get_dbus_bus_name(bus=None):
     if not bus:
         bus = dbus.SessionBus()
     return dbus.service.BusName(
-        name='org.projecthamster.HamsterDBus',
+        name=schema.BUS_NAME,
         bus=bus
     )
 
 
-class HamsterDBus(dbus.service.Object):
-    """A dbus object providing access to general hamster-lib capabilities."""
+@contextlib.contextmanager
+def _deferred_commits(session):
+    """
+    Turn all commits issued on ``session`` into mere flushes.
+
+    ``hamster-lib`` commits after each write. This allows for grouping several
+    of those writes into one transaction, committed explicitly afterwards.
+    """
+    session.commit = session.flush
+    try:
+        yield
+    finally:
+        del session.commit
+
+
+class GroupCommit(object):
+    """
+    Coalesce writes that arrive within a short window into one transaction.
+
+    Every write method of our manager objects hands its actual work to
+    ``submit``. Without a window each write is executed and committed right
+    away, exactly as ``hamster-lib`` does on its own. With a window, writes are
+    executed as they arrive but their commits are deferred until the window
+    closes. Then a single commit (and hence a single fsync) is issued for the
+    whole group and only after that succeeded each caller receives its reply.
+    """
+
+    def __init__(self, window=None, on_rollback=None, on_commit=None):
+        """
+        Initialize a new instance.
+
+        Args:
+            window (float, optional): Time in seconds that writes may be held back
+                in order to share a transaction. ``None`` or ``0`` disables
+                grouping. Defaults to ``None``.
+            on_rollback (callable, optional): Called without arguments whenever
+                (parts of) a group had to be rolled back. This allows for
+                invalidating state derived from writes that have been
+                discarded. Defaults to ``None``.
+            on_commit (callable, optional): Called without arguments once a
+                write (or a whole group) has been committed and its signals
+                have been emitted. Defaults to ``None``.
+        """
+        self._window = window
+        self._on_rollback = on_rollback
+        self._on_commit = on_commit
+        self._store = None
+        self._pending = []
+        self._signals = []
+        self._idle_callbacks = []
+        self._source_id = None
+
+    def submit(self, store, write, signals, reply_handler, error_handler):
+        """
+        Execute a write and reply to the caller once it has been committed.
+
+        Args:
+            store (hamster_lib.storage.BaseStore): Store the write is executed against.
+            write (callable): Callable performing the actual write. Its return
+                value is passed on to ``reply_handler``.
+            signals (list): Signal methods to be emitted once the write has been
+                committed. Signals of all writes within a group are only emitted
+                once.
+            reply_handler (callable): dbus-python reply callback.
+            error_handler (callable): dbus-python error callback.
+
+        Returns:
+            None: Nothing.
+        """
+        if not self._window:
+            try:
+                result = write()
+            except Exception as error:
+                error_handler(error)
+                return None
+            for signal in signals:
+                signal()
+            if self._on_commit:
+                self._on_commit()
+            self._reply(reply_handler, result)
+            return None
+
+        if self._store is None:
+            self._store = store
+        try:
+            result = self._execute(write)
+        except Exception as error:
+            # Discarding the failed write also discards everything else this
+            # group has done so far. Replay the accepted writes on top of a
+            # clean transaction.
+            self._rollback()
+            error_handler(error)
+            self._replay()
+        else:
+            self._pending.append([write, result, reply_handler, error_handler])
+
+        for signal in signals:
+            if signal not in self._signals:
+                self._signals.append(signal)
+
+        if self._pending and self._source_id is None:
+            self._source_id = GLib.timeout_add(int(self._window * 1000), self._commit)
+        return None
+
+    @property
+    def pending(self):
+        """Return ``True`` if there are writes waiting to be committed."""
+        return bool(self._pending)
+
+    def when_idle(self, callback):
+        """
+        Call ``callback`` once no writes are waiting to be committed anymore.
+
+        Args:
+            callback (callable): Called without arguments. If nothing is pending
+                it is called right away, otherwise once the current group has
+                been committed (or rolled back).
 
-    def __init__(self, loop):
-        """Initialize main DBus object."""
+        Returns:
+            None: Nothing.
+        """
+        if not self._pending:
+            callback()
+        else:
+            self._idle_callbacks.append(callback)
+        return None
+
+    def _execute(self, write):
+        """Run ``write`` with our stores commits turned into mere flushes."""
+        with _deferred_commits(self._store.session):
+            return write()
+
+    def _replay(self):
+        """Re-execute all pending writes, failing those that do no longer apply."""
+        pending, self._pending = self._pending, []
+        for entry in pending:
+            write, result, reply_handler, error_handler = entry
+            try:
+                entry[1] = self._execute(write)
+            except Exception as error:
+                self._rollback()
+                error_handler(error)
+                self._pending = [each for each in pending if each is not entry]
+                return self._replay()
+            self._pending.append(entry)
+        return None
+
+    def _commit(self):
+        """Commit the current group and send all pending replies."""
+        pending, self._pending = self._pending, []
+        signals, self._signals = self._signals, []
+        self._source_id = None
+
+        try:
+            self._store.session.commit()
+        except Exception as error:
+            self._rollback()
+            for write, result, reply_handler, error_handler in pending:
+                error_handler(error)
+        else:
+            for signal in signals:
+                signal()
+            if pending and self._on_commit:
+                self._on_commit()
+            for write, result, reply_handler, error_handler in pending:
+                self._reply(reply_handler, result)
+
+        callbacks, self._idle_callbacks = self._idle_callbacks, []
+        for callback in callbacks:
+            callback()
+        # Returning ``False`` removes the timeout source.
+        return False
+
+    def _rollback(self):
+        """Rollback the current transaction."""
+        self._store.session.rollback()
+        if self._on_rollback:
+            self._on_rollback()
+
+    def _reply(self, reply_handler, result):
+        """Call ``reply_handler`` matching a methods (possibly empty) out signature."""
+        if result is None:
+            reply_handler()
+        else:
+            reply_handler(result)
+
+
+class SingleFlight(object):
+    """
+    Run identical read calls that are in flight at the same time only once.
+
+    Reads are not executed right away but from an idle callback. Calls
+    dispatched before it runs join the same execution and receive its result.
+    The callback is added at ``GLib.PRIORITY_DEFAULT``, the priority incoming
+    messages are dispatched at, so a steady stream of calls can not starve it.
+    Callers are expected to answer reads from their cache right away and only
+    submit those that actually need to be computed, see
+    ``HamsterDBus.submit_read``.
+    """
+
+    def __init__(self):
+        """Initialize a new instance."""
+        self._waiting = {}
+
+    def submit(self, key, compute, reply_handler, error_handler):
+        """
+        Execute a read (or join an identical one) and pass its result to the caller.
+
+        Args:
+            key (hashable): Identifies identical reads.
+            compute (callable): Callable performing the actual read. Its return
+                value is passed on to ``reply_handler``.
+            reply_handler (callable): dbus-python reply callback.
+            error_handler (callable): dbus-python error callback.
+
+        Returns:
+            None: Nothing.
+        """
+        try:
+            self._waiting[key].append((reply_handler, error_handler))
+        except KeyError:
+            self._waiting[key] = [(reply_handler, error_handler)]
+            GLib.idle_add(self._run, key, compute, priority=GLib.PRIORITY_DEFAULT)
+
+    def _run(self, key, compute):
+        """Execute a read and reply to all callers waiting for it."""
+        waiting = self._waiting.pop(key)
+        try:
+            result = compute()
+        except Exception as error:
+            for reply_handler, error_handler in waiting:
+                error_handler(error)
+        else:
+            for reply_handler, error_handler in waiting:
+                reply_handler(result)
+        # Returning ``False`` removes the idle source.
+        return False
+
+
+class PropertiesObject(dbus.service.Object):
+    """
+    Base class for objects exposing read-only properties.
+
+    Properties are provided using the standard ``org.freedesktop.DBus.Properties``
+    interface. Subclasses set ``properties_interface`` and override
+    ``_get_properties``. The signatures of all properties are declared in
+    ``schema``.
+
+    All our objects derive from this class. Unless ``export=False`` is passed
+    they are exported on the bus by dbus-python. Otherwise exporting them is
+    left to another engine (see ``gdbus``).
+    """
+
+    # Interface the properties of this object belong to.
+    properties_interface = None
+
+    # Allow for exporting our objects on peer-to-peer connections as well as
+    # on the bus, see ``PeerServer``.
+    SUPPORTS_MULTIPLE_CONNECTIONS = True
+
+    def __init__(self, object_path=None, bus=None, export=True):
+        """
+        Initialize a new instance.
+
+        Args:
+            object_path (text_type, optional): Path the object is exported at.
+                Defaults to the path ``schema`` declares for ``properties_interface``.
+            bus (dbus.bus.BusConnection, optional): Bus to export the object on.
+                Defaults to the session bus.
+            export (bool, optional): ``False`` leaves exporting the object to
+                another engine. Defaults to ``True``.
+        """
+        self.object_path = object_path or schema.INTERFACES[self.properties_interface].path
+        # Values of the properties as emitted last, see ``_emit_properties_changed``.
+        self._sent_properties = {}
+        if export:
+            super(PropertiesObject, self).__init__(bus_name=_get_dbus_bus_name(bus),
+                object_path=self.object_path)
+        else:
+            super(PropertiesObject, self).__init__()
+
+    def _get_properties(self):
+        """
+        Return all properties of this object.
+
+        Returns:
+            dict: Mapping of property names to getters, callables returning
+                the (dbus typed) value.
+        """
+        return {}
+
+    def get_property_signature(self, name):
+        """Return the signature of a property as declared in ``schema``."""
+        return schema.INTERFACES[self.properties_interface].properties[name]
+
+    def _check_properties_interface(self, interface):
+        if interface and interface != self.properties_interface:
+            raise dbus.exceptions.DBusException(
+                _("No such interface: '{}'.").format(interface),
+                name='org.freedesktop.DBus.Error.UnknownInterface')
+
+    @dbus.service.method(dbus.PROPERTIES_IFACE, in_signature='ss', out_signature='v')
+    def Get(self, interface, name):  # NOQA
+        """Return the value of a property."""
+        self._check_properties_interface(interface)
+        try:
+            getter = self._get_properties()[name]
+        except KeyError:
+            raise dbus.exceptions.DBusException(_("No such property: '{}'.").format(name),
+                name='org.freedesktop.DBus.Error.UnknownProperty')
+        return getter()
+
+    @dbus.service.method(dbus.PROPERTIES_IFACE, in_signature='s', out_signature='a{sv}')
+    def GetAll(self, interface):  # NOQA
+        """Return the values of all properties."""
+        self._check_properties_interface(interface)
+        return dbus.Dictionary({name: getter() for name, getter in
+            self._get_properties().items()}, signature='sv')
+
+    @dbus.service.method(dbus.PROPERTIES_IFACE, in_signature='ssv')
+    def Set(self, interface, name, value):  # NOQA
+        """Refuse to change a property. All our properties are read-only."""
+        self._check_properties_interface(interface)
+        raise dbus.exceptions.DBusException(_("Property '{}' is read-only.").format(name),
+            name='org.freedesktop.DBus.Error.PropertyReadOnly')
+
+    @dbus.service.signal(dbus.PROPERTIES_IFACE, signature='sa{sv}as')
+    def PropertiesChanged(self, interface, changed, invalidated):  # NOQA
+        """Signal indicating that the value of properties changed."""
+        pass
+
+    def _emit_properties_changed(self, *names):
+        """
+        Emit ``PropertiesChanged`` for those of the given properties whose value changed.
+
+        Values are compared to the ones emitted last. Nothing is emitted if
+        none of them changed.
+        """
+        properties = self._get_properties()
+        sent = self._sent_properties
+        changed = {}
+        for name in names:
+            value = properties[name]()
+            if name not in sent or sent[name] != value:
+                changed[name] = sent[name] = value
+        if changed:
+            self.PropertiesChanged(self.properties_interface,
+                dbus.Dictionary(changed, signature='sv'), dbus.Array([], 's'))
+
+
+class PeerServer(object):
+    """
+    Private server exposing our objects to peer-to-peer connections.
+
+    Clients connected to ``address`` talk to the service directly instead of
+    having each message relayed by the bus daemon. Just like with any
+    ``libdbus`` server only connections of the same user are accepted.
+    """
+
+    def __init__(self, address):
+        """
+        Initialize a new instance and start listening.
+
+        Args:
+            address (text_type): dbus server address to listen on, e.g.
+                ``'unix:tmpdir=/run/user/1000'``.
+        """
+        self._objects = []
+        self._connections = []
+        self._server = dbus.server.Server(address)
+        self._server.on_connection_added.append(self._on_connection_added)
+
+    @property
+    def address(self):
+        """Return the address clients can connect to."""
+        return self._server.address
+
+    def add_object(self, dbus_object, object_path):
+        """
+        Export an object on all current and future peer connections.
+
+        Args:
+            dbus_object (dbus.service.Object): Object supporting multiple connections.
+            object_path (text_type): Path to export the object at.
+        """
+        self._objects.append((dbus_object, object_path))
+        for connection in self._connections:
+            dbus_object.add_to_connection(connection, object_path)
+
+    def disconnect(self):
+        """Stop listening for new connections."""
+        self._server.disconnect()
+
+    def _on_connection_added(self, connection):
+        self._connections.append(connection)
+        for dbus_object, object_path in self._objects:
+            dbus_object.add_to_connection(connection, object_path)
+        connection.call_on_disconnection(self._on_connection_removed)
+
+    def _on_connection_removed(self, connection):
+        self._connections.remove(connection)
+        for dbus_object, object_path in self._objects:
+            dbus_object.remove_from_connection(connection, object_path)
+
+
+class HamsterDBus(PropertiesObject):
+    """
+    A dbus object providing access to general hamster-lib capabilities.
+
+    Properties:
+        PeerAddress (s): Address of our ``PeerServer``, or empty if there is none.
+    """
+
+    properties_interface = schema.MAIN_INTERFACE
+
+    # Tables whose revisions are tracked, see ``get_cached_response``.
+    tables = ('categories', 'activities', 'tags', 'facts')
+
+    def __init__(self, loop, group_commit_window=None, response_cache_size=256,
+            peer_address=None, export=True):
+        """
+        Initialize main DBus object.
+
+        Args:
+            loop (GLib.MainLoop): Main loop the service is run with.
+            group_commit_window (float, optional): Time in seconds writes may be held
+                back in order to share one transaction. ``None`` disables group
+                commits. Defaults to ``None``.
+            response_cache_size (int, optional): Maximum number of read replies
+                to be cached. Defaults to ``256``.
+            peer_address (text_type, optional): Address to accept peer-to-peer
+                connections on (see ``PeerServer``). ``None`` disables them.
+                Defaults to ``None``.
+            export (bool, optional): ``False`` creates this and all manager
+                objects without exporting them on the bus, so they can be
+                exported by another engine (see ``gdbus``). Defaults to ``True``.
+        """
         self._loop = loop
+        self.export = export
+        self.group_commit = GroupCommit(group_commit_window,
+            on_rollback=self.invalidate_caches, on_commit=self.notify_committed)
+        # Lookup indices used by the managers in order to answer name and
+        # composite key lookups without querying the backend.
+        self.category_index = cache.LookupIndex()
+        self.tag_index = cache.LookupIndex()
+        self.activity_index = cache.LookupIndex()
+        # Totals per work day and activity, kept up to date by ``FactManager``
+        # and built by ``Reports`` on first use.
+        self.daily_rollup = rollup.DailyRollup()
+        # Upper bound of the duration of all facts, raised by ``FactManager``
+        # whenever it saves a fact. See ``queries.get_overlapping_facts``.
+        self.longest_fact = cache.MaximumBound()
+        # Each change signal bumps the revision of its table. Cached replies
+        # are keyed by the revisions of the tables they depend on.
+        self.table_revisions = dict.fromkeys(self.tables, 0)
+        self._revision_listeners = []
+        self._commit_listeners = []
+        self.response_cache = cache.LRUCache(maxsize=response_cache_size)
+        self.single_flight = SingleFlight()
+        self.peer_server = PeerServer(peer_address) if peer_address else None
+
+        super(HamsterDBus, self).__init__(export=export)
+        self.add_peer_object(self, self.object_path)
+
+    def _get_properties(self):
+        return {
+            'PeerAddress': self._get_peer_address_property,
+        }
+
+    def _get_peer_address_property(self):
+        return dbus.String(self.peer_server.address if self.peer_server else '')
+
+    def add_peer_object(self, dbus_object, object_path):
+        """Export an object on peer-to-peer connections as well, if they are enabled."""
+        if self.peer_server:
+            self.peer_server.add_object(dbus_object, object_path)
+
+    def invalidate_indices(self):
+        """Drop all entries of all our lookup indices."""
+        self.category_index.invalidate()
+        self.tag_index.invalidate()
+        self.activity_index.invalidate()
+
+    def invalidate_index_misses(self):
+        """Drop all remembered misses of all our lookup indices."""
+        self.category_index.invalidate_misses()
+        self.tag_index.invalidate_misses()
+        self.activity_index.invalidate_misses()
+
+    def invalidate_caches(self):
+        """Drop everything cached about the backend, e.g. after a rollback."""
+        self.invalidate_indices()
+        self.daily_rollup.invalidate()
+        self.longest_fact.invalidate()
+        self.bump_revisions(*self.tables)
+
+    def bump_revisions(self, *tables):
+        """Mark ``tables`` as modified, outdating all cached replies depending on them."""
+        for table in tables:
+            self.table_revisions[table] += 1
+        for listener in self._revision_listeners:
+            listener(tables)
+
+    def add_revision_listener(self, listener):
+        """
+        Register a callable to be notified whenever table revisions are bumped.
+
+        Args:
+            listener (callable): Called with a tuple of the bumped table names.
+        """
+        self._revision_listeners.append(listener)
 
-        super(HamsterDBus, self).__init__(
-            bus_name=_get_dbus_bus_name(),
-            object_path='/org/projecthamster/HamsterDBus',
-        )
+    def add_commit_listener(self, listener):
+        """
+        Register a callable to be notified once writes have been committed.
+
+        Args:
+            listener (callable): Called without arguments after each commit,
+                once the change signals of the committed writes have been emitted.
+        """
+        self._commit_listeners.append(listener)
+
+    def notify_committed(self):
+        """Notify all commit listeners, see ``add_commit_listener``."""
+        for listener in self._commit_listeners:
+            listener()
+
+    def get_cached_response(self, method, args, tables, compute):
+        """
+        Return a (possibly cached) reply of a read method.
 
-    @dbus.service.signal('org.projecthamster.HamsterDBus1')
+        Args:
+            method (text_type): Qualified name of the method, e.g. ``'TagManager.GetAll'``.
+            args (tuple): Hashable arguments the reply depends on.
+            tables (tuple): Names of all tables (see ``HamsterDBus.tables``) the
+                reply depends on.
+            compute (callable): Called without arguments to build the reply if
+                there is no valid cached one.
+
+        Returns:
+            object: The reply value, ready to be passed to python-dbus.
+        """
+        revisions = tuple(self.table_revisions[table] for table in tables)
+        return self.response_cache.get((method, args, revisions), compute)
+
+    def submit_read(self, method, args, tables, compute, reply_handler, error_handler):
+        """
+        Reply to a read method, sharing its execution with identical concurrent calls.
+
+        Replies are cached just like by ``get_cached_response``. A valid cached
+        reply is sent right away, only reads that need to be computed are
+        handed to ``single_flight``.
+
+        Args:
+            method (text_type): Qualified name of the method.
+            args (tuple): Hashable arguments the reply depends on.
+            tables (tuple): Names of all tables the reply depends on.
+            compute (callable): Called without arguments to build the reply.
+            reply_handler (callable): dbus-python reply callback. Methods with
+                multiple out arguments need to unpack the reply themselves.
+            error_handler (callable): dbus-python error callback.
+
+        Returns:
+            None: Nothing.
+        """
+        revisions = tuple(self.table_revisions[table] for table in tables)
+        if (method, args, revisions) in self.response_cache:
+            reply_handler(self.get_cached_response(method, args, tables, compute))
+            return
+
+        def read():
+            return self.get_cached_response(method, args, tables, compute)
+
+        self.single_flight.submit((method, args), read, reply_handler, error_handler)
+
+    @schema.signal(schema.MAIN_INTERFACE)
     def CategoryChanged(self):  # NOQA
         """Signal indicating that at least one category may have been modified."""
-        pass
+        self.bump_revisions('categories')
 
-    @dbus.service.signal('org.projecthamster.HamsterDBus1')
+    @schema.signal(schema.MAIN_INTERFACE)
     def ActivityChanged(self):  # NOQA
         """Signal indicating that at least one activity may have been modified."""
-        pass
+        self.bump_revisions('activities')
 
-    @dbus.service.signal('org.projecthamster.HamsterDBus1')
+    @schema.signal(schema.MAIN_INTERFACE)
     def TagChanged(self):  # NOQA
         """Signal indicating that at least one tag may have been modified."""
-        pass
+        self.bump_revisions('tags')
 
-    @dbus.service.signal('org.projecthamster.HamsterDBus1')
+    @schema.signal(schema.MAIN_INTERFACE)
     def FactChanged(self):  # NOQA
         """Signal indicating that at least one fact may have been modified."""
-        pass
+        self.bump_revisions('facts')
 
-    @dbus.service.method('org.projecthamster.HamsterDBus1')
+    @schema.method(schema.MAIN_INTERFACE)
     def Quit(self):  # NOQA
         """Shutdown the service."""
         self._loop.quit()
 
 
-class CategoryManager(dbus.service.Object):
-    """CategoryManager object to be exposed via DBus."""
+class ManagerObject(PropertiesObject):
+    """
+    Base class for our manager objects, each of which is in charge of one table.
+
+    Subclasses set ``table`` and ``model`` and need to set ``_controller`` and
+    ``_main_object`` before calling ``__init__``. Objects are only exported by
+    dbus-python if their main object is.
+
+    Properties:
+        Count (u): Number of rows of the table.
+        Revision (t): Revision of the table. It is increased whenever its rows
+            may have been modified.
+
+    ``PropertiesChanged`` is emitted along with the change signals of the table,
+    naming only the properties whose values actually changed.
+    """
+
+    # Name (see ``HamsterDBus.tables``) and ``hamster-lib`` SQLAlchemy model of
+    # the table managed by this object.
+    table = None
+    model = None
+
+    def __init__(self, bus=None):
+        super(ManagerObject, self).__init__(bus=bus, export=self._main_object.export)
+        self._main_object.add_revision_listener(self._on_revisions_bumped)
+        self._main_object.add_peer_object(self, self.object_path)
+
+    def _get_properties(self):
+        return {
+            'Count': self._get_count_property,
+            'Revision': self._get_revision_property,
+        }
+
+    def _get_count_property(self):
+        def compute():
+            return queries.count_rows(self._controller.store.session, self.model)
+
+        count = self._main_object.get_cached_response(type(self).__name__ + '.Count', (),
+            (self.table,), compute)
+        return dbus.UInt32(count)
+
+    def _get_revision_property(self):
+        return dbus.UInt64(self._main_object.table_revisions[self.table])
+
+    def _on_revisions_bumped(self, tables):
+        if self.table in tables:
+            self._emit_properties_changed(*sorted(self._get_properties()))
+
+
+class CategoryManager(ManagerObject):
+    """
+    CategoryManager object to be exposed via DBus.
+
+    See ``ManagerObject`` for its properties.
+    """
+
+    properties_interface = DBUS_CATEGORIES_INTERFACE
+    table = 'categories'
+    model = alchemy.AlchemyCategory
 
     def __init__(self, controller, main_object, bus=None):
         """
@@ -111,15 +1071,11 @@ class CategoryManager(dbus.service.Object):
         """
         self._controller = controller
         self._main_object = main_object
-        self._busname = _get_dbus_bus_name(bus)
 
-        super(CategoryManager, self).__init__(
-            bus_name=self._busname,
-            object_path='/org/projecthamster/HamsterDBus/CategoryManager',
-        )
+        super(CategoryManager, self).__init__(bus=bus)
 
-    @dbus.service.method(DBUS_CATEGORIES_INTERFACE, in_signature='(is)', out_signature='(is)')
-    def Save(self, category_tuple):  # NOQA
+    @schema.method(schema.CATEGORIES_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def Save(self, category_tuple, reply_handler, error_handler):  # NOQA
         """
         Save category.
 
@@ -129,14 +1085,19 @@ class CategoryManager(dbus.service.Object):
         Returns:
             tuple: ``(category.pk, category.name)`` tuple.
         """
-        category = helpers.dbus_to_hamster_category(category_tuple)
-        category = self._controller.store.categories.save(category)
-
-        self._main_object.CategoryChanged()
-        return helpers.hamster_to_dbus_category(category)
-
-    @dbus.service.method(DBUS_CATEGORIES_INTERFACE, in_signature='(is)', out_signature='(is)')
-    def GetOrCreate(self, category_tuple):  # NOQA
+        def write():
+            category = helpers.dbus_to_hamster_category(category_tuple)
+            category = self._controller.store.categories.save(category)
+            # Activity entries include their category, so they may be outdated as well.
+            self._main_object.category_index.invalidate()
+            self._main_object.activity_index.invalidate()
+            return helpers.hamster_to_dbus_category(category)
+
+        self._main_object.group_commit.submit(self._controller.store, write,
+            [self._main_object.CategoryChanged], reply_handler, error_handler)
+
+    @schema.method(schema.CATEGORIES_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetOrCreate(self, category_tuple, reply_handler, error_handler):  # NOQA
         """
         For details please refer to ``hamster_lib.storage``.
 
@@ -148,14 +1109,17 @@ class CategoryManager(dbus.service.Object):
                 Either way, the returned Category will contain all data from
                 the backend, including its primary key.
         """
-        category = helpers.dbus_to_hamster_category(category_tuple)
-        category = self._controller.store.categories.get_or_create(category)
+        def write():
+            category = helpers.dbus_to_hamster_category(category_tuple)
+            category = self._controller.store.categories.get_or_create(category)
+            self._main_object.category_index.invalidate_misses()
+            return helpers.hamster_to_dbus_category(category)
 
-        self._main_object.CategoryChanged()
-        return helpers.hamster_to_dbus_category(category)
+        self._main_object.group_commit.submit(self._controller.store, write,
+            [self._main_object.CategoryChanged], reply_handler, error_handler)
 
-    @dbus.service.method(DBUS_CATEGORIES_INTERFACE, in_signature='i')
-    def Remove(self, pk):  # NOQA
+    @schema.method(schema.CATEGORIES_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def Remove(self, pk, reply_handler, error_handler):  # NOQA
         """
         Remove a category.
 
@@ -165,16 +1129,20 @@ class CategoryManager(dbus.service.Object):
         Returns:
             None: Nothing.
         """
-        # [TODO]
-        # Once LIB-239 has been solved, we should be able to skip extra category
-        # retrieval.
-        category = self._controller.store.categories.get(pk)
-        self._controller.store.categories.remove(category)
+        def write():
+            # [TODO]
+            # Once LIB-239 has been solved, we should be able to skip extra category
+            # retrieval.
+            category = self._controller.store.categories.get(pk)
+            self._controller.store.categories.remove(category)
+            self._main_object.category_index.invalidate()
+            self._main_object.activity_index.invalidate()
+            return None
 
-        self._main_object.CategoryChanged()
-        return None
+        self._main_object.group_commit.submit(self._controller.store, write,
+            [self._main_object.CategoryChanged], reply_handler, error_handler)
 
-    @dbus.service.method(DBUS_CATEGORIES_INTERFACE, in_signature='i', out_signature='(is)')
+    @schema.method(schema.CATEGORIES_INTERFACE)
     def Get(self, pk):  # NOQA
         """
         Return a category based on their pk.
@@ -191,7 +1159,7 @@ class CategoryManager(dbus.service.Object):
         category = self._controller.categories.get(pk)
         return helpers.hamster_to_dbus_category(category)
 
-    @dbus.service.method(DBUS_CATEGORIES_INTERFACE, in_signature='s', out_signature='(is)')
+    @schema.method(schema.CATEGORIES_INTERFACE)
     def GetByName(self, name):  # NOQA
         """
         Look up a category by its name and return its PK.
@@ -201,24 +1169,46 @@ class CategoryManager(dbus.service.Object):
 
         Returns:
             tuple: hamster_lib.Category tuple.
+
+        Raises:
+            KeyError: If no category of that name exists.
+
+        Note:
+            Lookups are answered by ``HamsterDBus.category_index`` and only
+            query the backend if the name is not yet known to the index.
         """
-        category = self._controller.categories.get_by_name(name)
-        return helpers.hamster_to_dbus_category(category)
+        def lookup():
+            category = self._controller.categories.get_by_name(name)
+            return helpers.hamster_to_dbus_category(category)
+
+        return self._main_object.category_index.get(name, lookup)
 
-    @dbus.service.method(DBUS_CATEGORIES_INTERFACE, out_signature='a(is)')
-    def GetAll(self):  # NOQA
+    @schema.method(schema.CATEGORIES_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetAll(self, reply_handler, error_handler):  # NOQA
         """
         Get all categories.
 
         Returns:
             list: List of tuples with (category.pk, category.name)
         """
-        categories = self._controller.categories.get_all()
-        return [helpers.hamster_to_dbus_category(category) for category in categories]
+        def compute():
+            categories = self._controller.categories.get_all()
+            return [helpers.hamster_to_dbus_category(category) for category in categories]
+
+        self._main_object.submit_read('CategoryManager.GetAll', (), ('categories',), compute,
+            reply_handler, error_handler)
+
 
+class TagManager(ManagerObject):
+    """
+    TagManager object to be exposed via DBus.
 
-class TagManager(dbus.service.Object):
-    """TagManager object to be exposed via DBus."""
+    See ``ManagerObject`` for its properties.
+    """
+
+    properties_interface = DBUS_TAGS_INTERFACE
+    table = 'tags'
+    model = alchemy.AlchemyTag
 
     def __init__(self, controller, main_object, bus=None):
         """
@@ -232,15 +1222,11 @@ class TagManager(dbus.service.Object):
         """
         self._controller = controller
         self._main_object = main_object
-        self._busname = _get_dbus_bus_name(bus)
 
-        super(TagManager, self).__init__(
-            bus_name=_get_dbus_bus_name(),
-            object_path='/org/projecthamster/HamsterDBus/TagManager',
-        )
+        super(TagManager, self).__init__(bus=bus)
 
-    @dbus.service.method(DBUS_TAGS_INTERFACE, in_signature='(is)', out_signature='(is)')
-    def Save(self, tag_tuple):  # NOQA
+    @schema.method(schema.TAGS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def Save(self, tag_tuple, reply_handler, error_handler):  # NOQA
         """
         Save tag.
 
@@ -250,14 +1236,84 @@ class TagManager(dbus.service.Object):
         Returns:
             helpers.DBusTag: For details please see ``helpers.haster_to_dbus_tag``.
         """
+        def write():
+            tag = helpers.dbus_to_hamster_tag(tag_tuple)
+            tag = self._controller.store.tags.save(tag)
+            self._main_object.tag_index.invalidate()
+            return helpers.hamster_to_dbus_tag(tag)
+
+        self._main_object.group_commit.submit(self._controller.store, write,
+            [self._main_object.TagChanged], reply_handler, error_handler)
+
+    def _get_or_create(self, tag):
+        """
+        Return the tag matching ``tag.name``, creating it if needed.
+
+        Args:
+            tag (hamster_lib.Tag): The tag we want.
+
+        Returns:
+            helpers.DBusTag: The retrieved or created tag.
+        """
+        try:
+            result = self._get_by_name(tag.name)
+        except KeyError:
+            result = helpers.hamster_to_dbus_tag(self._controller.store.tags.get_or_create(tag))
+            self._main_object.tag_index.invalidate_misses()
+        return result
+
+    @schema.method(schema.TAGS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetOrCreate(self, tag_tuple, reply_handler, error_handler):  # NOQA
+        """
+        Return the tag matching the passed ones name, creating it if needed.
+
+        For details please refer to ``hamster_lib.storage``.
+
+        Args:
+            tag_tuple (helpers.DBusTag): The tag 'dbus encoded'.
+
+        Returns:
+            helpers.DBusTag: The retrieved or created tag. Either way, the returned
+                tag will contain all data from the backend, including its
+                primary key.
+        """
         tag = helpers.dbus_to_hamster_tag(tag_tuple)
-        tag = self._controller.store.tags.save(tag)
+        try:
+            result = self._get_by_name(tag.name)
+        except KeyError:
+            pass
+        else:
+            # Nothing to be written, no need to wait for any pending commit.
+            reply_handler(result)
+            return
 
-        self._main_object.TagChanged()
-        return helpers.hamster_to_dbus_tag(tag)
+        self._main_object.group_commit.submit(self._controller.store,
+            lambda: self._get_or_create(tag), [self._main_object.TagChanged],
+            reply_handler, error_handler)
 
-    @dbus.service.method(DBUS_TAGS_INTERFACE, in_signature='i')
-    def Remove(self, pk):  # NOQA
+    @schema.method(schema.TAGS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetOrCreateMany(self, tag_tuples, reply_handler, error_handler):  # NOQA
+        """
+        Batch version of ``GetOrCreate``.
+
+        All tags are retrieved or created within the same transaction.
+
+        Args:
+            tag_tuples (list): List of ``helpers.DBusTag`` tuples.
+
+        Returns:
+            list: List of retrieved or created ``helpers.DBusTag`` tuples, in the
+                same order as the passed ones.
+        """
+        def write():
+            tags = [helpers.dbus_to_hamster_tag(tag_tuple) for tag_tuple in tag_tuples]
+            return dbus.Array([self._get_or_create(tag) for tag in tags], '(is)')
+
+        self._main_object.group_commit.submit(self._controller.store, write,
+            [self._main_object.TagChanged], reply_handler, error_handler)
+
+    @schema.method(schema.TAGS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def Remove(self, pk, reply_handler, error_handler):  # NOQA
         """
         Remove a tag.
 
@@ -267,16 +1323,33 @@ class TagManager(dbus.service.Object):
         Returns:
             None: Nothing.
         """
-        # [TODO]
-        # Once LIB-239 has been solved, we should be able to skip extra tag
-        # retrieval.
-        tag = self._controller.store.tags.get(pk)
-        self._controller.store.tags.remove(tag)
+        def write():
+            # [TODO]
+            # Once LIB-239 has been solved, we should be able to skip extra tag
+            # retrieval.
+            tag = self._controller.store.tags.get(pk)
+            self._controller.store.tags.remove(tag)
+            self._main_object.tag_index.invalidate()
+            return None
 
-        self._main_object.TagChanged()
-        return None
+        self._main_object.group_commit.submit(self._controller.store, write,
+            [self._main_object.TagChanged], reply_handler, error_handler)
 
-    @dbus.service.method(DBUS_TAGS_INTERFACE, in_signature='s', out_signature='(is)')
+    @schema.method(schema.TAGS_INTERFACE)
+    def Get(self, pk):  # NOQA
+        """
+        Return a tag based on their pk.
+
+        Args:
+            pk (int): PK of the tag to be retrieved.
+
+        Returns:
+            helpers.DBusTag: For details please see ``helpers.hamster_to_dbus_tag``.
+        """
+        tag = self._controller.store.tags.get(pk)
+        return helpers.hamster_to_dbus_tag(tag)
+
+    @schema.method(schema.TAGS_INTERFACE)
     def GetByName(self, name):  # NOQA
         """
         Look up a tag by its name and return its PK.
@@ -286,12 +1359,22 @@ class TagManager(dbus.service.Object):
 
         Returns:
             helpers.DBusTag: For details please see ``helpers.haster_to_dbus_tag``.
+
+        Raises:
+            KeyError: If no tag of that name exists.
+
+        Note:
+            Lookups are answered by ``HamsterDBus.tag_index`` and only query
+            the backend if the name is not yet known to the index.
         """
-        tag = self._controller.store.tags.get_by_name(name)
-        return helpers.hamster_to_dbus_tag(tag)
+        return self._get_by_name(name)
 
-    @dbus.service.method(DBUS_TAGS_INTERFACE, out_signature='a(is)')
-    def GetAll(self):  # NOQA
+    def _get_by_name(self, name):
+        """Look up a tag by its name using our ``HamsterDBus.tag_index``."""
+        return _get_tag_by_name(self._controller, self._main_object, name)
+
+    @schema.method(schema.TAGS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetAll(self, reply_handler, error_handler):  # NOQA
         """
         Get all tags.
 
@@ -299,12 +1382,24 @@ class TagManager(dbus.service.Object):
             list: List of ``helpers.DBusTag``s. For details see
                 ``helpers.hamster_to_dbus_tag``.
         """
-        tags = self._controller.store.tags.get_all()
-        return [helpers.hamster_to_dbus_tag(tag) for tag in tags]
+        def compute():
+            tags = self._controller.store.tags.get_all()
+            return [helpers.hamster_to_dbus_tag(tag) for tag in tags]
+
+        self._main_object.submit_read('TagManager.GetAll', (), ('tags',), compute,
+            reply_handler, error_handler)
+
+
+class ActivityManager(ManagerObject):
+    """
+    ActivityManager object to be exposed via DBus.
 
+    See ``ManagerObject`` for its properties.
+    """
 
-class ActivityManager(dbus.service.Object):
-    """ActivityManager object to be exposed via DBus."""
+    properties_interface = DBUS_ACTIVITIES_INTERFACE
+    table = 'activities'
+    model = alchemy.AlchemyActivity
 
     def __init__(self, controller, main_object):
         """
@@ -321,14 +1416,10 @@ class ActivityManager(dbus.service.Object):
         self._controller = controller
         self._main_object = main_object
 
-        super(ActivityManager, self).__init__(
-            bus_name=_get_dbus_bus_name(),
-            object_path='/org/projecthamster/HamsterDBus/ActivityManager',
-        )
+        super(ActivityManager, self).__init__()
 
-    @dbus.service.method(DBUS_ACTIVITIES_INTERFACE, in_signature='(is(is)b)',
-        out_signature='(is(is)b)')  # NOQA
-    def Save(self, activity_tuple):
+    @schema.method(schema.ACTIVITIES_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def Save(self, activity_tuple, reply_handler, error_handler):  # NOQA
         """
         Save an activity.
 
@@ -338,17 +1429,62 @@ class ActivityManager(dbus.service.Object):
         Returns:
             tuple: Tuple representing the saved activity.
         """
-        activity = helpers.dbus_to_hamster_activity(activity_tuple)
-        result = self._controller.activities.save(activity)
+        def write():
+            activity = helpers.dbus_to_hamster_activity(activity_tuple)
+            result = self._controller.activities.save(activity)
+            self._main_object.activity_index.invalidate()
+            self._main_object.category_index.invalidate_misses()
+            return helpers.hamster_to_dbus_activity(result)
+
+        # ``CategoryChanged`` is emitted because during activity creation/updating
+        # a new category may be created as well.
+        self._main_object.group_commit.submit(self._controller.store, write,
+            [self._main_object.ActivityChanged, self._main_object.CategoryChanged],
+            reply_handler, error_handler)
+
+    @schema.method(schema.ACTIVITIES_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetOrCreate(self, activity_tuple, reply_handler, error_handler):  # NOQA
+        """
+        Return the activity matching name and category of the passed one, creating it if needed.
 
-        self._main_object.ActivityChanged()
-        self._main_object.CategoryChanged()
-        # This is because during activity creation/updating a new category may
-        # be created as well.
-        return helpers.hamster_to_dbus_activity(result)
+        For details please refer to ``hamster_lib.storage``.
 
-    @dbus.service.method(DBUS_ACTIVITIES_INTERFACE, in_signature='i')
-    def Remove(self, pk):  # NOQA
+        Args:
+            activity_tuple (helpers.DBusActivity): The activity 'dbus encoded'.
+
+        Returns:
+            helpers.DBusActivity: The retrieved or created activity. Either way,
+                the returned activity will contain all data from the backend,
+                including its primary key.
+        """
+        activity = helpers.dbus_to_hamster_activity(activity_tuple)
+        category_name = activity.category.name if activity.category else None
+        try:
+            result = self._get_by_composite(activity.name, category_name)
+        except KeyError:
+            pass
+        else:
+            # Nothing to be written, no need to wait for any pending commit.
+            reply_handler(result)
+            return
+
+        def write():
+            try:
+                return self._get_by_composite(activity.name, category_name)
+            except KeyError:
+                pass
+            result = self._controller.store.activities.get_or_create(activity)
+            self._main_object.activity_index.invalidate_misses()
+            self._main_object.category_index.invalidate_misses()
+            return helpers.hamster_to_dbus_activity(result)
+
+        # ``CategoryChanged`` is emitted because a new category may be created as well.
+        self._main_object.group_commit.submit(self._controller.store, write,
+            [self._main_object.ActivityChanged, self._main_object.CategoryChanged],
+            reply_handler, error_handler)
+
+    @schema.method(schema.ACTIVITIES_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def Remove(self, pk, reply_handler, error_handler):  # NOQA
         """Remove an activity.
 
         Args:
@@ -357,13 +1493,16 @@ class ActivityManager(dbus.service.Object):
         Returns:
             None: Nothing.
         """
-        activity = self._controller.activities.get(pk)
-        self._controller.activities.remove(activity)
+        def write():
+            activity = self._controller.activities.get(pk)
+            self._controller.activities.remove(activity)
+            self._main_object.activity_index.invalidate()
+            return None
 
-        self._main_object.ActivityChanged()
-        return None
+        self._main_object.group_commit.submit(self._controller.store, write,
+            [self._main_object.ActivityChanged], reply_handler, error_handler)
 
-    @dbus.service.method(DBUS_ACTIVITIES_INTERFACE, in_signature='i', out_signature='(is(is)b)')
+    @schema.method(schema.ACTIVITIES_INTERFACE)
     def Get(self, pk):  # NOQA
         """
         Retrieve an ``hamster_lib.Activity`` based on it's PK.
@@ -377,9 +1516,52 @@ class ActivityManager(dbus.service.Object):
         activity = self._controller.store.activities.get(pk)
         return helpers.hamster_to_dbus_activity(activity)
 
-    @dbus.service.method(DBUS_ACTIVITIES_INTERFACE, in_signature='i',
-        out_signature='a(is(is)b)')  # NOQA
-    def GetAll(self, category_pk):
+    @schema.method(schema.ACTIVITIES_INTERFACE)
+    def GetByComposite(self, name, category_tuple):  # NOQA
+        """
+        Look up an activity by its unique ``name``/``category.name`` composite key.
+
+        For details please refer to ``hamster_lib.storage``.
+
+        Args:
+            name (text_type): Name of the activity.
+            category_tuple (helpers.DBusCategory): The activities category. Use
+                ``pk=-2`` for ``None``.
+
+        Returns:
+            helpers.DBusActivity: The matching activity.
+
+        Raises:
+            KeyError: If there is no such activity.
+        """
+        category = helpers.dbus_to_hamster_category(category_tuple)
+        category_name = category.name if category else None
+        return self._get_by_composite(name, category_name)
+
+    def _get_by_composite(self, name, category_name):
+        """
+        Look up an activity by its unique ``name``/``category.name`` composite key.
+
+        Args:
+            name (text_type): Name of the activity.
+            category_name (text_type or None): Name of the activities category.
+                ``None`` if the activity has no category.
+
+        Returns:
+            helpers.DBusActivity: The matching activity.
+
+        Raises:
+            KeyError: If there is no such activity.
+
+        Note:
+            Lookups are answered by ``HamsterDBus.activity_index`` and only query
+            the backend if the key is not yet known to the index.
+        """
+        return _get_activity_by_composite(self._controller, self._main_object, name,
+            category_name)
+
+    @schema.method(schema.ACTIVITIES_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetAll(self, category_pk, search_term, reply_handler, error_handler):  # NOQA
         """
         Retrieve all ``hamster_lib.Activity`` instances that match the criteria.
 
@@ -387,26 +1569,49 @@ class ActivityManager(dbus.service.Object):
             category_pk (int): hamster_lib.Category pk. Use ``-1`` for ``None`` and ``-2`` for
                 ``False``. Refer to ``hamster_lib.storage.hamster_lib.ActivityManager.get_all``
                 for details.
+            search_term (text_type): Only consider activities whose name contains this term.
 
         Returns:
             tuple: (activity_tuple, error).
         """
-        if category_pk == -1:
-            category = None
-        elif category_pk == -2:
-            category = False
-        else:
-            category = self._controller.store.categories.get(category_pk)
+        def compute():
+            if category_pk == -1:
+                category = None
+            elif category_pk == -2:
+                category = False
+            else:
+                category = self._controller.store.categories.get(category_pk)
 
-        activities = self._controller.store.activities.get_all(category)
+            activities = self._controller.store.activities.get_all(category,
+                text_type(search_term))
+            return [helpers.hamster_to_dbus_activity(activity) for activity in activities]
 
-        return [helpers.hamster_to_dbus_activity(activity) for activity in activities]
+        self._main_object.submit_read('ActivityManager.GetAll',
+            (int(category_pk), text_type(search_term)),
+            ('categories', 'activities'), compute, reply_handler, error_handler)
 
 
-class FactManager(dbus.service.Object):
-    """FactManager object to be exposed via DBus."""
+class FactManager(ManagerObject):
+    """
+    FactManager object to be exposed via DBus.
 
-    def __init__(self, controller, main_object):
+    Besides the properties provided by ``ManagerObject``:
+
+    Properties:
+        OngoingFact (a(isss(is(is)b)a(is))): The current 'ongoing fact' as the
+            only element, or empty if there is none.
+        TodayDuration (u): Total duration in seconds of today's facts (as
+            returned by ``GetTodays``), not including the 'ongoing fact'.
+    """
+
+    properties_interface = DBUS_FACTS_INTERFACE
+    table = 'facts'
+    model = alchemy.AlchemyFact
+
+    # Tables today's totals in the snapshot depend on.
+    _snapshot_tables = ('categories', 'activities', 'facts')
+
+    def __init__(self, controller, main_object, ongoing_fact_path=None, snapshot_path=None):
         """
         Initialize fact manager object.
 
@@ -414,21 +1619,186 @@ class FactManager(dbus.service.Object):
             controler: FIXME
             main_object: ``HamsterDBus`` object. This is needed in order to
                 emmit signals.
+            ongoing_fact_path (text_type, optional): Path of the file the
+                'ongoing fact' is persisted to. ``None`` keeps it in memory only.
+                Defaults to ``None``.
+            snapshot_path (text_type, optional): Path of the file the 'ongoing
+                fact' and today's totals are published to (see ``snapshot``).
+                ``None`` disables publishing. Defaults to ``None``.
         """
         # [FIXME]
         # Unlike with ``CategoryManager`` and ``TagManager`` we do not allow for
         # a custom bus.
         self._controller = controller
         self._main_object = main_object
+        # Maps the ``activity@category`` part of raw facts (along with the
+        # generation of ``HamsterDBus.activity_index``) to what it resolves to.
+        self._raw_fact_heads = cache.LRUCache(maxsize=512)
+        self._import_jobs = itertools.count(1)
+        self._ongoing_fact = ongoing.OngoingFact(ongoing_fact_path)
+        self._snapshot = snapshot.SnapshotWriter(snapshot_path) if snapshot_path else None
+        queries.ensure_fact_index(self._controller.store.session)
+
+        self._snapshot_outdated = False
+        super(FactManager, self).__init__()
+        self._main_object.add_commit_listener(self._on_committed)
+        self._schedule_day_change()
+        self._publish_snapshot()
+
+    def _get_save_signals(self):
+        """
+        Return the signals to be emitted after a fact has been saved.
+
+        This is because during creation/updating a new related instances
+        may be created as well.
+        """
+        return [
+            self._main_object.FactChanged,
+            self._main_object.CategoryChanged,
+            self._main_object.TagChanged,
+            self._main_object.ActivityChanged,
+        ]
+
+    def _get_properties(self):
+        properties = super(FactManager, self)._get_properties()
+        properties.update({
+            'OngoingFact': self._get_ongoing_fact_property,
+            'TodayDuration': self._get_today_duration_property,
+        })
+        return properties
+
+    def _get_ongoing_fact_property(self):
+        facts = [self._ongoing_fact.fact] if self._ongoing_fact.fact else []
+        return helpers.encode_facts(facts)
+
+    def _get_today_duration_property(self):
+        today = datetime.date.today()
+
+        def compute():
+            config = self._controller.store.config
+            return queries.sum_durations(self._controller.store.session,
+                datetime.datetime.combine(today, config['day_start']),
+                time_helpers.end_day_to_datetime(today, config))
+
+        duration = self._main_object.get_cached_response('FactManager.TodayDuration',
+            (today,), ('facts',), compute)
+        return dbus.UInt32(duration)
+
+    def _schedule_day_change(self):
+        """Arrange for ``TodayDuration`` to be announced once the current date changes."""
+        now = datetime.datetime.now()
+        tomorrow = datetime.datetime.combine(now.date() + datetime.timedelta(days=1),
+            datetime.time())
+        GLib.timeout_add_seconds(int((tomorrow - now).total_seconds()) + 1,
+            self._on_day_change)
+
+    def _on_day_change(self):
+        self._emit_properties_changed('TodayDuration')
+        self._publish_snapshot()
+        self._schedule_day_change()
+        # Returning ``False`` removes the timeout source.
+        return False
+
+    def _on_revisions_bumped(self, tables):
+        super(FactManager, self)._on_revisions_bumped(tables)
+        if set(tables) & set(self._snapshot_tables):
+            self._snapshot_outdated = True
+
+    def _on_committed(self):
+        # Publish once per commit rather than once per table bumped by it.
+        if self._snapshot_outdated:
+            self._publish_snapshot()
+
+    def _on_ongoing_fact_changed(self):
+        self._emit_properties_changed('OngoingFact')
+        self._publish_snapshot()
+
+    def _publish_snapshot(self):
+        """Publish the 'ongoing fact' and today's totals, if enabled."""
+        if not self._snapshot:
+            return
+        today = datetime.date.today()
+
+        def compute():
+            config = self._controller.store.config
+            return queries.sum_durations_by_category(self._controller.store.session,
+                datetime.datetime.combine(today, config['day_start']),
+                time_helpers.end_day_to_datetime(today, config))
+
+        totals = self._main_object.get_cached_response('FactManager.TodayCategoryTotals',
+            (today,), self._snapshot_tables, compute)
+        revision = sum(self._main_object.table_revisions.values())
+        self._snapshot.write(revision, self._ongoing_fact.fact, totals)
+        self._snapshot_outdated = False
+
+    def _check_timeframe_available(self, fact):
+        """
+        Make sure no other fact occupies the timeframe of ``fact``.
 
-        super(FactManager, self).__init__(
-            bus_name=_get_dbus_bus_name(),
-            object_path='/org/projecthamster/HamsterDBus/FactManager',
-        )
+        ``hamster-lib`` performs the same check when saving. Checking upfront
+        refuses such saves right away and keeps them from failing (and hence
+        rolling back) a whole group of writes.
 
-    @dbus.service.method(DBUS_FACTS_INTERFACE, in_signature='s',
-        out_signature='(isss(is(is)b)a(is))')  # NOQA
-    def SaveRaw(self, raw_fact):
+        Raises:
+            ValueError: If the timeframe is occupied already.
+        """
+        if fact.start is None or fact.end is None:
+            return
+        if queries.get_overlapping_facts(self._controller.store.session, fact.start, fact.end,
+                exclude_pk=fact.pk, max_duration=self._get_longest_duration()):
+            raise ValueError(_("The timeframe of this fact is occupied by another fact already."))
+
+    def _get_longest_duration(self):
+        """Return an upper bound of the duration of all facts, see ``HamsterDBus``."""
+        session = self._controller.store.session
+        return self._main_object.longest_fact.get(lambda: queries.get_longest_duration(session))
+
+    def _on_fact_saved(self, fact):
+        """Account for a saved fact in everything derived from all facts."""
+        self._main_object.daily_rollup.add_fact(fact)
+        self._main_object.longest_fact.add(fact.end - fact.start)
+
+    def _save(self, get_fact, reply_handler, error_handler):
+        """
+        Save a fact, or start it as 'ongoing fact' if it is new and has no end.
+
+        Args:
+            get_fact (callable): Returns the ``hamster_lib.Fact`` to be saved.
+            reply_handler (callable): dbus-python reply callback.
+            error_handler (callable): dbus-python error callback.
+        """
+        try:
+            fact = get_fact()
+            if fact.pk is None and fact.end is None:
+                self._ongoing_fact.start(fact)
+            else:
+                self._check_timeframe_available(fact)
+        except Exception as error:
+            error_handler(error)
+            return
+
+        if fact.pk is None and fact.end is None:
+            self._on_ongoing_fact_changed()
+            reply_handler(helpers.hamster_to_dbus_fact(fact))
+            return
+
+        def write():
+            daily_rollup = self._main_object.daily_rollup
+            old_fact = None
+            if daily_rollup.built and fact.pk is not None:
+                old_fact = self._controller.store.facts.get(fact.pk)
+            result = self._controller.store.facts.save(fact)
+            self._main_object.invalidate_index_misses()
+            if old_fact:
+                daily_rollup.remove_fact(old_fact)
+            self._on_fact_saved(result)
+            return helpers.hamster_to_dbus_fact(result)
+
+        self._main_object.group_commit.submit(self._controller.store, write,
+            self._get_save_signals(), reply_handler, error_handler)
+
+    @schema.method(schema.FACTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def SaveRaw(self, raw_fact, reply_handler, error_handler):  # NOQA
         """
         Take a raw_fact save it to our backend.
 
@@ -442,21 +1812,83 @@ class FactManager(dbus.service.Object):
         Note: This method is identical to ``Savehamster_lib.Fact`` with the only difference being
             that it takes a ``raw fact`` instead of a serialized ``hamster_lib.Fact`` instance.
         """
-        fact = hamster_lib.Fact.create_from_raw_fact(raw_fact)
-        result = self._controller.store.facts.save(fact)
+        self._save(lambda: self._parse_raw_fact(raw_fact), reply_handler, error_handler)
 
-        self._main_object.FactChanged()
-        self._main_object.CategoryChanged()
-        self._main_object.TagChanged()
-        self._main_object.ActivityChanged()
-        # This is because during creation/updating a new related instances
-        # may be created as well.
+    @schema.method(schema.FACTS_INTERFACE)
+    def ParseRaw(self, raw_facts):  # NOQA
+        """
+        Parse a batch of raw facts without saving them.
 
-        return helpers.hamster_to_dbus_fact(result)
+        This allows clients to preview how their input will be interpreted.
 
-    @dbus.service.method(DBUS_FACTS_INTERFACE, in_signature='(isss(is(is)b)a(is))',
-        out_signature='(isss(is(is)b)a(is))')  # NOQA
-    def Save(self, fact_tuple):
+        Args:
+            raw_facts (list): List of ``raw fact`` strings.
+
+        Returns:
+            list: A list of ``helpers.DBusFact``-tuples, one for each raw fact. Those
+                facts have not been saved, hence ``pk=-1``. Their activity refers
+                to an existing one if there is a match, otherwise its ``pk=-1``.
+
+        Raises:
+            ValueError: If any of the raw facts can not be parsed.
+        """
+        return helpers.encode_facts(self._parse_raw_fact(raw_fact) for raw_fact in raw_facts)
+
+    def _parse_raw_fact(self, raw_fact):
+        """
+        Construct a new ``hamster_lib.Fact`` from a ``raw fact`` string.
+
+        This provides the same results as ``hamster_lib.Fact.create_from_raw_fact``
+        but remembers what the ``activity@category`` part of each raw fact
+        resolves to. Repeated input therefore neither needs to be parsed again
+        nor does it need any backend lookups. Entries are keyed by the
+        generation of ``HamsterDBus.activity_index`` and hence outdated along
+        with it. Times are parsed every time as they may refer to today.
+
+        Args:
+            raw_fact (text_type): Raw fact to be parsed.
+
+        Returns:
+            hamster_lib.Fact: ``Fact`` object with data parsed from raw fact.
+
+        Raises:
+            ValueError: If we fail to extract at least ``start`` or ``activity.name``.
+            ValueError: If ``end <= start``.
+        """
+        timeinfo, rest = time_helpers.extract_time_info(raw_fact)
+        start, end = time_helpers.complete_timeframe(timeinfo, _RAW_FACT_CONFIG, partial=True)
+        start, end = time_helpers.validate_start_end_range((start, end))
+
+        head, description = _split_raw_fact(rest)
+        key = (head, self._main_object.activity_index.generation)
+        activity_name, category_name, dbus_activity = self._raw_fact_heads.get(key,
+            lambda: self._resolve_raw_fact_head(head))
+        if dbus_activity is not None:
+            activity = helpers.dbus_to_hamster_activity(dbus_activity)
+        else:
+            activity = hamster_lib.Activity(activity_name)
+            if category_name:
+                activity.category = hamster_lib.Category(category_name)
+        return hamster_lib.Fact(activity, start, end=end, description=description)
+
+    def _resolve_raw_fact_head(self, head):
+        """
+        Return what the ``activity@category`` part of a raw fact refers to.
+
+        Returns:
+            tuple: ``(activity_name, category_name, dbus_activity)``. The latter
+                is ``None`` if there is no such activity yet.
+        """
+        activity_name, category_name = _parse_raw_fact_head(head)
+        try:
+            dbus_activity = _get_activity_by_composite(self._controller, self._main_object,
+                activity_name, category_name)
+        except KeyError:
+            dbus_activity = None
+        return activity_name, category_name, dbus_activity
+
+    @schema.method(schema.FACTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def Save(self, fact_tuple, reply_handler, error_handler):  # NOQA
         """
         Take a fact save it to our backend.
 
@@ -466,21 +1898,16 @@ class FactManager(dbus.service.Object):
         Returns:
             tuple (DBusFact): Serialized version of the saved ``hamster_lib.Fact``
                 instance.
-        """
-        fact = helpers.dbus_to_hamster_fact(fact_tuple)
-        result = self._controller.store.facts.save(fact)
 
-        self._main_object.FactChanged()
-        self._main_object.CategoryChanged()
-        self._main_object.TagChanged()
-        self._main_object.ActivityChanged()
-        # This is because during creation/updating a new related instances
-        # may be created as well.
-
-        return helpers.hamster_to_dbus_fact(result)
+        Note:
+            A new fact without ``end`` is not saved to the backend but becomes
+            the 'ongoing fact'.
+        """
+        self._save(lambda: helpers.dbus_to_hamster_fact(fact_tuple), reply_handler,
+            error_handler)
 
-    @dbus.service.method(DBUS_FACTS_INTERFACE, in_signature='i')
-    def Remove(self, pk):  # NOQA
+    @schema.method(schema.FACTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def Remove(self, pk, reply_handler, error_handler):  # NOQA
         """
         Remove fact from storage by it's PK.
 
@@ -490,15 +1917,17 @@ class FactManager(dbus.service.Object):
         Returns:
             None: Nothing.
         """
-        fact = self._controller.store.facts.get(pk)
-        self._controller.store.facts.remove(fact)
+        def write():
+            fact = self._controller.store.facts.get(pk)
+            self._controller.store.facts.remove(fact)
+            self._main_object.daily_rollup.remove_fact(fact)
+            return None
 
-        self._main_object.FactChanged()
-        return None
+        self._main_object.group_commit.submit(self._controller.store, write,
+            [self._main_object.FactChanged], reply_handler, error_handler)
 
-    @dbus.service.method(DBUS_FACTS_INTERFACE, in_signature='i',
-        out_signature='(isss(is(is)b)a(is))')  # NOQA
-    def Get(self, fact_pk):
+    @schema.method(schema.FACTS_INTERFACE)
+    def Get(self, fact_pk):  # NOQA
         """Get fact by PK.
 
         Args:
@@ -510,15 +1939,15 @@ class FactManager(dbus.service.Object):
         fact = self._controller.facts.get(fact_pk)
         return helpers.hamster_to_dbus_fact(fact)
 
-    @dbus.service.method(DBUS_FACTS_INTERFACE, in_signature='sss',
-        out_signature='a(isss(is(is)b)a(is))')  # NOQA
-    def GetAll(self, start, end, filter_term):
+    @schema.method(schema.FACTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetAll(self, start, end, filter_term, reply_handler, error_handler):  # NOQA
         """
         Get all facts matching criteria.
 
         Args:
-            start (int): Unix-timestamp for start of timeframe. ``-1`` for ``None``.
-            end (int): Unix-timestamp for end of timeframe. ``-1`` for ``None``.
+            start (str): Serialized start of the timeframe as accepted by
+                ``helpers.text_to_datetime``. Empty for ``None``.
+            end (str): Serialized end of the timeframe. Empty for ``None``.
             filter_term (str): Only consider ``hamster_lib.Facts`` with this string as part of
                 their associated ``hamster_lib.Activity.name``
 
@@ -526,27 +1955,230 @@ class FactManager(dbus.service.Object):
             list: A list of ``helpers.DBushamster_lib.Fact``-tuples.
                 For details on those, please see ``helpers.hamster_to_dbus_fact``.
 
-        Note:
-            Our ``hamsterlib`` manager method is actually more flexible and would allow
-            for ``datetime.datetime`` or ``datetime.time`` instances instead of just
-            ``datetime.date`` instances for ``start`` and ``end``. But for compatibility
-            reasons we stick with the simpler legacy version for now.
+        Raises:
+            ValueError: If ``start`` or ``end`` can not be parsed or ``end`` is before ``start``.
         """
-        def get_start(start):
-            return None
+        def compute():
+            # ``_submit_read`` unpacks replies into their out arguments.
+            return (helpers.encode_facts(self._get_all(start, end, filter_term)),)
 
-        def get_end(end):
-            return None
+        self._submit_read('FactManager.GetAll', start, end, filter_term, compute,
+            reply_handler, error_handler)
+
+    @schema.method(schema.FACTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetAllColumnar(self, start, end, filter_term, reply_handler, error_handler):  # NOQA
+        """
+        Get all facts matching criteria in a column oriented representation.
+
+        This is intended for clients aggregating large amounts of facts. Each
+        activity, category and tag is only transmitted once.
+
+        Args:
+            start (str): Serialized start of the timeframe as accepted by
+                ``helpers.text_to_datetime``. Empty for ``None``.
+            end (str): Serialized end of the timeframe. Empty for ``None``.
+            filter_term (str): Only consider ``hamster_lib.Facts`` with this string as part of
+                their associated ``hamster_lib.Activity.name``
+
+        Returns:
+            helpers.DBusFactColumns: For details please see
+                ``helpers.hamster_to_dbus_fact_columns``.
+
+        Raises:
+            ValueError: If ``start`` or ``end`` can not be parsed or ``end`` is before ``start``.
+        """
+        def compute():
+            return helpers.hamster_to_dbus_fact_columns(self._get_all(start, end, filter_term))
+
+        self._submit_read('FactManager.GetAllColumnar', start, end, filter_term, compute,
+            reply_handler, error_handler)
+
+    @schema.method(schema.FACTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetAllNormalized(self, start, end, filter_term, reply_handler, error_handler):  # NOQA
+        """
+        Get all facts matching criteria, with activities, categories and tags sent only once.
+
+        Args:
+            start (str): Serialized start of the timeframe as accepted by
+                ``helpers.text_to_datetime``. Empty for ``None``.
+            end (str): Serialized end of the timeframe. Empty for ``None``.
+            filter_term (str): Only consider ``hamster_lib.Facts`` with this string as part of
+                their associated ``hamster_lib.Activity.name``
+
+        Returns:
+            helpers.DBusFactTable: For details please see ``helpers.hamster_to_dbus_fact_table``.
+
+        Raises:
+            ValueError: If ``start`` or ``end`` can not be parsed or ``end`` is before ``start``.
+        """
+        def compute():
+            return helpers.hamster_to_dbus_fact_table(self._get_all(start, end, filter_term))
+
+        self._submit_read('FactManager.GetAllNormalized', start, end, filter_term, compute,
+            reply_handler, error_handler)
+
+    def _get_all(self, start, end, filter_term):
+        """Return all ``hamster_lib.Facts`` matching serialized criteria."""
+        start, end = _get_timeframe(self._controller.config, start, end)
+        return self._controller.store.facts.get_all(start, end, filter_term)
+
+    def _submit_read(self, method, start, end, filter_term, compute, reply_handler,
+            error_handler):
+        """
+        Reply to a fact query on a serialized timeframe using ``HamsterDBus.submit_read``.
+
+        Times refer to today and hence the current date is part of the cache key.
+        The reply is unpacked into multiple out arguments.
+        """
+        def reply(result):
+            reply_handler(*result)
+
+        args = (text_type(start), text_type(end), text_type(filter_term),
+            datetime.date.today())
+        self._main_object.submit_read(method, args, self._main_object.tables, compute, reply,
+            error_handler)
+
+    @schema.method(schema.FACTS_INTERFACE)
+    def ExportTo(self, fd, format, start, end):  # NOQA
+        """
+        Stream all facts within a timeframe into a file descriptor.
+
+        The method returns right away. Facts are then written in chunks as the
+        descriptor accepts more data. Once all facts have been written the
+        descriptor is closed, so clients can read until EOF.
+
+        Args:
+            fd (dbus.types.UnixFd): Writable file descriptor, e.g. of a pipe.
+            format (str): ``csv``, ``tsv`` or ``jsonl``. See ``formats.FactWriter``.
+            start (str): Serialized start of the timeframe. ``''`` for ``None``.
+            end (str): Serialized end of the timeframe. ``''`` for ``None``.
+
+        Returns:
+            None: Nothing.
+
+        Raises:
+            ValueError: If ``format`` is not supported or the timeframe is invalid.
+        """
+        fd = fd.take()
+        try:
+            writer = formats.FactWriter(format)
+            start, end = _get_timeframe(self._controller.config, start, end)
+        except ValueError:
+            os.close(fd)
+            raise
+        facts = queries.iter_facts(self._controller.store.session, start, end)
+        _ExportJob(fd, facts, writer)
+        return None
+
+    @schema.method(schema.FACTS_INTERFACE)
+    def ImportFrom(self, fd, format, options):  # NOQA
+        """
+        Import facts read from a file descriptor.
+
+        The method returns right away. Data is then read as it becomes available
+        and saved in chunked transactions. Progress is reported using the
+        ``ImportProgress`` signal, the outcome using ``ImportFinished``.
+
+        Args:
+            fd (dbus.types.UnixFd): Readable file descriptor, e.g. of a pipe.
+            format (str): ``csv``, ``tsv``, ``jsonl`` or ``ical``. See
+                ``formats.FactReader``.
+            options (dict): Supported keys are ``block_size`` (positive ``int``),
+                the maximum number of bytes read and saved at once.
+
+        Returns:
+            int: ID of the import job, as referred to by our signals.
+
+        Raises:
+            ValueError: If ``format`` or any of the ``options`` is not supported.
+        """
+        fd = fd.take()
+        try:
+            reader = formats.FactReader(format)
+            unknown = set(options) - set(['block_size'])
+            if unknown:
+                message = _("Unsupported options: {}.").format(', '.join(sorted(unknown)))
+                raise ValueError(message)
+            block_size = int(options.get('block_size', 65536))
+            if block_size < 1:
+                raise ValueError(_("'block_size' needs to be positive."))
+        except ValueError:
+            os.close(fd)
+            raise
+        job_id = next(self._import_jobs)
+        _ImportJob(job_id, fd, reader, self, block_size=block_size)
+        return job_id
+
+    @schema.signal(schema.FACTS_INTERFACE)
+    def ImportProgress(self, job_id, processed, failed):  # NOQA
+        """Signal indicating how many records of an import have been processed so far."""
+        pass
+
+    @schema.signal(schema.FACTS_INTERFACE)
+    def ImportFinished(self, job_id, imported, failed, errors):  # NOQA
+        """
+        Signal indicating that an import is done.
+
+        ``errors`` is a list of ``(record number, message)`` tuples, one for each
+        record that could not be imported (up to ``_ImportJob.max_errors``).
+        """
+        pass
 
-        def get_filter_term(end):
-            return filter_term
+    def _save_record(self, fields):
+        """
+        Save a fact described by a record read by ``formats.FactReader``.
+
+        Activities and tags are resolved using our lookup indices.
+
+        Args:
+            fields (dict): Record fields.
 
-        facts = self._controller.store.facts.get_all(get_start(start), get_end(end),
-            get_filter_term(filter_term))
-        return [helpers.hamster_to_dbus_fact(fact) for fact in facts]
+        Returns:
+            hamster_lib.Fact: The saved fact.
 
-    @dbus.service.method(DBUS_FACTS_INTERFACE, out_signature='a(isss(is(is)b)a(is))')
-    def GetTodays(self):  # NOQA
+        Raises:
+            ValueError: If the record does not describe a valid, complete fact.
+        """
+        start = helpers.text_to_datetime(fields.get('start', ''))
+        end = helpers.text_to_datetime(fields.get('end', ''))
+        if not (isinstance(start, datetime.datetime) and isinstance(end, datetime.datetime)):
+            raise ValueError(_("Imported facts need a start and end date and time."))
+
+        activity_name = fields.get('activity')
+        if not activity_name:
+            raise ValueError(_("Unable to extract activity name"))
+        category_name = fields.get('category') or None
+        try:
+            activity = helpers.dbus_to_hamster_activity(_get_activity_by_composite(
+                self._controller, self._main_object, activity_name, category_name))
+        except KeyError:
+            activity = hamster_lib.Activity(activity_name)
+            if category_name:
+                activity.category = hamster_lib.Category(category_name)
+
+        tags = []
+        for name in fields.get('tags', []):
+            try:
+                tags.append(helpers.dbus_to_hamster_tag(_get_tag_by_name(
+                    self._controller, self._main_object, name)))
+            except KeyError:
+                tags.append(hamster_lib.Tag(name))
+
+        fact = hamster_lib.Fact(activity, start, end=end,
+            description=fields.get('description') or None, tags=tags)
+        result = self._controller.store.facts.save(fact)
+        self._on_fact_saved(result)
+        return result
+
+    def _on_facts_imported(self):
+        """Announce a committed chunk of imported facts."""
+        self._main_object.invalidate_index_misses()
+        for signal in self._get_save_signals():
+            signal()
+        self._main_object.notify_committed()
+
+    @schema.method(schema.FACTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetTodays(self, reply_handler, error_handler):  # NOQA
         """
         Get facts of today, respecting hamster day_start, day_end settings.
 
@@ -557,5 +2189,398 @@ class FactManager(dbus.service.Object):
         Note:
             This only returns proper facts and will not include any ongoing fact!
         """
-        facts = self.controller.store.facts.get_today()
-        return [helpers.dbus_to_hamster_fact(fact) for fact in facts]
+        def compute():
+            facts = self._controller.store.facts.get_today()
+            return helpers.encode_facts(facts)
+
+        self._main_object.submit_read('FactManager.GetTodays', (datetime.date.today(),),
+            self._main_object.tables, compute, reply_handler, error_handler)
+
+    @schema.method(schema.FACTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetOverlapping(self, start, end, reply_handler, error_handler):  # NOQA
+        """
+        Get all facts sharing time with a timeframe, including those only partially within it.
+
+        Args:
+            start (str): Serialized start of the timeframe as accepted by
+                ``helpers.text_to_datetime``. Dates refer to the beginning of that day.
+            end (str): Serialized end of the timeframe. Dates refer to the end of that day.
+
+        Returns:
+            list: A list of ``helpers.DBusFact`` tuples, ordered by start.
+
+        Raises:
+            ValueError: If ``start`` or ``end`` can not be parsed or ``end`` is
+                not after ``start``.
+
+        Note:
+            This only returns proper facts and will not include any ongoing fact!
+        """
+        def compute():
+            timeframe = reports.get_timeframe(helpers.text_to_datetime(start),
+                helpers.text_to_datetime(end), self._controller.config['day_start'])
+            return helpers.encode_facts(queries.get_overlapping_facts(
+                self._controller.store.session, *timeframe,
+                max_duration=self._get_longest_duration()))
+
+        # Times refer to today, hence the current date is part of the cache key.
+        args = (text_type(start), text_type(end), datetime.date.today())
+        self._main_object.submit_read('FactManager.GetOverlapping', args,
+            self._main_object.tables, compute, reply_handler, error_handler)
+
+    @schema.method(schema.FACTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetAt(self, timestamp, reply_handler, error_handler):  # NOQA
+        """
+        Get the fact covering a point in time.
+
+        Args:
+            timestamp (str): Serialized date and time, or time of today, as
+                accepted by ``helpers.text_to_datetime``.
+
+        Returns:
+            list: A list of ``helpers.DBusFact`` tuples. Empty if nothing has
+                been tracked at that time.
+
+        Raises:
+            ValueError: If ``timestamp`` can not be parsed or is a mere date.
+
+        Note:
+            This only returns proper facts and will not include any ongoing fact!
+        """
+        def compute():
+            value = helpers.text_to_datetime(timestamp)
+            if isinstance(value, datetime.time):
+                value = datetime.datetime.combine(datetime.date.today(), value)
+            elif not isinstance(value, datetime.datetime):
+                raise ValueError(_("'{}' is not a point in time.").format(timestamp))
+            return helpers.encode_facts(queries.get_overlapping_facts(
+                self._controller.store.session, value, value,
+                max_duration=self._get_longest_duration()))
+
+        args = (text_type(timestamp), datetime.date.today())
+        self._main_object.submit_read('FactManager.GetAt', args, self._main_object.tables,
+            compute, reply_handler, error_handler)
+
+    @schema.method(schema.FACTS_INTERFACE)
+    def GetTmpFact(self):  # NOQA
+        """
+        Return the current 'ongoing fact'.
+
+        Returns:
+            helpers.DBusFact: The ongoing fact.
+
+        Raises:
+            KeyError: If there is no ongoing fact.
+        """
+        return helpers.hamster_to_dbus_fact(self._ongoing_fact.get())
+
+    @schema.method(schema.FACTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def StopTmpFact(self, reply_handler, error_handler):  # NOQA
+        """
+        Stop the current 'ongoing fact' now and save it to the backend.
+
+        Returns:
+            helpers.DBusFact: The saved fact.
+
+        Raises:
+            ValueError: If there is no ongoing fact or it starts in the future.
+        """
+        ongoing_fact = self._ongoing_fact.fact
+        if not ongoing_fact:
+            error_handler(ValueError(_("Trying to stop a non existing ongoing fact.")))
+            return
+        fact = copy.copy(ongoing_fact)
+        fact.end = datetime.datetime.now()
+        if fact.start > fact.end:
+            error_handler(ValueError(
+                _("The indicated 'end' value seem to be before its 'start'.")))
+            return
+        try:
+            self._check_timeframe_available(fact)
+        except ValueError as error:
+            error_handler(error)
+            return
+
+        def write():
+            result = self._controller.store.facts.save(fact)
+            self._main_object.invalidate_index_misses()
+            self._on_fact_saved(result)
+            return helpers.hamster_to_dbus_fact(result)
+
+        def restore(error):
+            # Make sure the fact is not lost if it could not be saved.
+            if not self._ongoing_fact.fact:
+                self._ongoing_fact.start(ongoing_fact)
+                self._on_ongoing_fact_changed()
+            error_handler(error)
+
+        # Clear it right away so the same fact can not be stopped twice.
+        self._ongoing_fact.clear()
+        self._on_ongoing_fact_changed()
+        self._main_object.group_commit.submit(self._controller.store, write,
+            self._get_save_signals(), reply_handler, restore)
+
+    @schema.method(schema.FACTS_INTERFACE)
+    def CancelTmpFact(self):  # NOQA
+        """
+        Discard the current 'ongoing fact' without saving it.
+
+        Raises:
+            KeyError: If there is no ongoing fact.
+        """
+        self._ongoing_fact.get()
+        self._ongoing_fact.clear()
+        self._on_ongoing_fact_changed()
+
+
+class Reports(PropertiesObject):
+    """
+    Reports object to be exposed via DBus.
+
+    Reports aggregate facts within the service, so clients do not need to
+    fetch every single fact in order to draw charts.
+    """
+
+    properties_interface = schema.REPORTS_INTERFACE
+
+    def __init__(self, controller, main_object):
+        """
+        Initialize reports object.
+
+        Args:
+            controller (hamster_lib.HamsterControl): Controller providing the store.
+            main_object (HamsterDBus): Main object, providing the response cache.
+        """
+        self._controller = controller
+        self._main_object = main_object
+        queries.ensure_fact_index(self._controller.store.session)
+
+        super(Reports, self).__init__(export=self._main_object.export)
+        self._main_object.add_peer_object(self, self.object_path)
+
+    @schema.method(schema.REPORTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetSeries(self, start, end, bucket, group_by, reply_handler, error_handler):  # NOQA
+        """
+        Return the durations of facts per time bucket and activity, category or tag.
+
+        Facts crossing bucket boundaries are split among those buckets. Days,
+        weeks (starting on Mondays) and months start at the configured
+        ``day_start``, hours are aligned to it. See ``reports`` for details.
+
+        Unless grouping by tag or using hourly buckets, whole work days within
+        the timeframe are taken from the daily rollup (see ``rollup``), so only
+        the facts of partial days at its edges are fetched from the backend.
+
+        Args:
+            start (str): Serialized start of the timeframe as accepted by
+                ``helpers.text_to_datetime``. Dates refer to the beginning of that day.
+            end (str): Serialized end of the timeframe. Dates refer to the end of that day.
+            bucket (str): ``'hour'``, ``'day'``, ``'week'`` or ``'month'``.
+            group_by (str): ``'activity'``, ``'category'`` or ``'tag'``. Facts
+                with several tags are accounted for with each of them.
+
+        Returns:
+            helpers.DBusSeries: For details please see ``helpers.series_to_dbus``.
+
+        Raises:
+            ValueError: If any argument is invalid or ``end`` is not after ``start``.
+        """
+        def compute():
+            session = self._controller.store.session
+            day_start = self._controller.config['day_start']
+            timeframe = self._get_timeframe(start, end)
+            whole_days = None
+            if bucket != 'hour' and group_by != 'tag':
+                whole_days = reports.get_whole_days(timeframe[0], timeframe[1], day_start)
+            if not whole_days:
+                spans = queries.iter_fact_spans(session, timeframe[0], timeframe[1], group_by)
+                return helpers.series_to_dbus(*reports.get_series(spans, timeframe[0],
+                    timeframe[1], bucket, day_start))
+
+            # Only scan the partial days before and after the whole ones.
+            edges = [(timeframe[0], whole_days[0]), (whole_days[1], timeframe[1])]
+            spans = itertools.chain.from_iterable(
+                reports.clip_spans(queries.iter_fact_spans(session, edge_start, edge_end,
+                    group_by), edge_start, edge_end)
+                for edge_start, edge_end in edges if edge_start < edge_end)
+            daily_totals = self._get_daily_totals(whole_days[0].date(), whole_days[1].date(),
+                group_by)
+            return helpers.series_to_dbus(*reports.get_series(spans, timeframe[0],
+                timeframe[1], bucket, day_start, daily_totals))
+
+        def reply(result):
+            reply_handler(*result)
+
+        # Times refer to today, hence the current date is part of the cache key.
+        args = (text_type(start), text_type(end), text_type(bucket), text_type(group_by),
+            datetime.date.today())
+        self._main_object.submit_read('Reports.GetSeries', args, self._main_object.tables,
+            compute, reply, error_handler)
+
+    @schema.method(schema.REPORTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetGaps(self, start, end, min_gap, reply_handler, error_handler):  # NOQA
+        """
+        Return the periods within a timeframe not covered by any fact.
+
+        Args:
+            start (str): Serialized start of the timeframe as accepted by
+                ``helpers.text_to_datetime``. Dates refer to the beginning of that day.
+            end (str): Serialized end of the timeframe. Dates refer to the end of that day.
+            min_gap (int): Shorter gaps are ignored. In seconds.
+
+        Returns:
+            list: For details please see ``helpers.gaps_to_dbus``.
+
+        Raises:
+            ValueError: If ``start`` or ``end`` can not be parsed or ``end`` is
+                not after ``start``.
+
+        Note:
+            The ongoing fact is not taken into account.
+        """
+        def compute():
+            timeframe = self._get_timeframe(start, end)
+            spans = queries.iter_fact_timeframes(self._controller.store.session, *timeframe)
+            return helpers.gaps_to_dbus(reports.get_gaps(spans, timeframe[0], timeframe[1],
+                datetime.timedelta(seconds=int(min_gap))))
+
+        args = (text_type(start), text_type(end), int(min_gap), datetime.date.today())
+        self._main_object.submit_read('Reports.GetGaps', args, ('facts',), compute,
+            reply_handler, error_handler)
+
+    @schema.method(schema.REPORTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetConflicts(self, start, end, reply_handler, error_handler):  # NOQA
+        """
+        Return the periods within a timeframe covered by more than one fact.
+
+        ``hamster-lib`` refuses to save overlapping facts, but databases
+        written by other tools or older versions may still contain them.
+
+        Args:
+            start (str): Serialized start of the timeframe as accepted by
+                ``helpers.text_to_datetime``. Dates refer to the beginning of that day.
+            end (str): Serialized end of the timeframe. Dates refer to the end of that day.
+
+        Returns:
+            list: For details please see ``helpers.conflicts_to_dbus``.
+
+        Raises:
+            ValueError: If ``start`` or ``end`` can not be parsed or ``end`` is
+                not after ``start``.
+        """
+        def compute():
+            timeframe = self._get_timeframe(start, end)
+            spans = queries.iter_fact_timeframes(self._controller.store.session, *timeframe)
+            return helpers.conflicts_to_dbus(reports.get_conflicts(spans, *timeframe))
+
+        args = (text_type(start), text_type(end), datetime.date.today())
+        self._main_object.submit_read('Reports.GetConflicts', args, ('facts',), compute,
+            reply_handler, error_handler)
+
+    @schema.method(schema.REPORTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetTopActivities(self, start, end, n, metric, reply_handler, error_handler):  # NOQA
+        """
+        Return the activities with the highest total duration or number of facts.
+
+        Args:
+            start (str): Serialized start of the timeframe as accepted by
+                ``helpers.text_to_datetime``. Dates refer to the beginning of that day.
+            end (str): Serialized end of the timeframe. Dates refer to the end of that day.
+            n (int): Maximum number of activities to be returned.
+            metric (str): ``'duration'`` or ``'count'``. See ``reports.get_top``.
+
+        Returns:
+            list: For details please see ``helpers.top_activities_to_dbus``.
+
+        Raises:
+            ValueError: If any argument is invalid or ``end`` is not after ``start``.
+        """
+        def compute():
+            ranking = self._get_top(start, end, n, metric, 'activity')
+            activities = queries.get_activities(self._controller.store.session,
+                [pk for (pk, name), seconds, count in ranking])
+            return helpers.top_activities_to_dbus([(activities[pk], seconds, count)
+                for (pk, name), seconds, count in ranking])
+
+        args = (text_type(start), text_type(end), int(n), text_type(metric),
+            datetime.date.today())
+        self._main_object.submit_read('Reports.GetTopActivities', args,
+            ('categories', 'activities', 'facts'), compute, reply_handler, error_handler)
+
+    @schema.method(schema.REPORTS_INTERFACE, async_callbacks=_ASYNC_CALLBACKS)
+    def GetTopTags(self, start, end, n, metric, reply_handler, error_handler):  # NOQA
+        """
+        Return the tags with the highest total duration or number of facts.
+
+        Facts with several tags are accounted for with each of them.
+
+        Args:
+            start (str): Serialized start of the timeframe as accepted by
+                ``helpers.text_to_datetime``. Dates refer to the beginning of that day.
+            end (str): Serialized end of the timeframe. Dates refer to the end of that day.
+            n (int): Maximum number of tags to be returned.
+            metric (str): ``'duration'`` or ``'count'``. See ``reports.get_top``.
+
+        Returns:
+            list: For details please see ``helpers.top_tags_to_dbus``.
+
+        Raises:
+            ValueError: If any argument is invalid or ``end`` is not after ``start``.
+        """
+        def compute():
+            ranking = self._get_top(start, end, n, metric, 'tag')
+            return helpers.top_tags_to_dbus([(hamster_lib.Tag(name, pk=pk), seconds, count)
+                for (pk, name), seconds, count in ranking])
+
+        args = (text_type(start), text_type(end), int(n), text_type(metric),
+            datetime.date.today())
+        self._main_object.submit_read('Reports.GetTopTags', args, ('tags', 'facts'), compute,
+            reply_handler, error_handler)
+
+    def _get_top(self, start, end, n, metric, group_by):
+        """
+        Rank activities or tags within a serialized timeframe, see ``reports.get_top``.
+
+        Ranking by count is done by the database, so only the facts of the
+        candidates it returns are fetched to add up their durations. Ranking by
+        duration needs a total for each activity or tag within the timeframe.
+        """
+        session = self._controller.store.session
+        timeframe = self._get_timeframe(start, end)
+        pks = None
+        if metric == 'count':
+            candidates = queries.count_top_groups(session, timeframe[0], timeframe[1],
+                group_by, int(n))
+            pks = [pk for (pk, name), count in candidates]
+        spans = queries.iter_fact_spans(session, timeframe[0], timeframe[1], group_by, pks)
+        # Facts without tags are grouped as ``(-1, '')``, which is no tag to be ranked.
+        spans = (span for span in spans if span[2][0] != -1)
+        return reports.get_top(spans, timeframe[0], timeframe[1], int(n), metric)
+
+    def _get_timeframe(self, start, end):
+        """Return the timeframe given by serialized ``start`` and ``end``, see ``GetSeries``."""
+        return reports.get_timeframe(helpers.text_to_datetime(start),
+            helpers.text_to_datetime(end), self._controller.config['day_start'])
+
+    def _get_daily_totals(self, first_day, last_day, group_by):
+        """
+        Return the totals of whole work days, building the daily rollup if needed.
+
+        Args:
+            first_day (datetime.date): First work day to be included.
+            last_day (datetime.date): First work day not to be included anymore.
+            group_by (text_type): ``'activity'`` or ``'category'``.
+
+        Returns:
+            list: ``(day, group, seconds)`` tuples as accepted by ``reports.get_series``.
+        """
+        session = self._controller.store.session
+        day_start = self._controller.config['day_start']
+        daily_rollup = self._main_object.daily_rollup
+        if not daily_rollup.built or daily_rollup.day_start != day_start:
+            spans = queries.iter_fact_spans(session, None, None, 'activity')
+            daily_rollup.build(((span_start, span_end, group[0])
+                for span_start, span_end, group in spans), day_start)
+        groups = queries.get_activity_groups(session, group_by)
+        return [(day, groups.get(activity_pk, (-1, '')), seconds)
+            for day, activity_pk, seconds in daily_rollup.iter_totals(first_day, last_day)]
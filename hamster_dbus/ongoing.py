@@ -0,0 +1,141 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Keep track of the 'ongoing fact' without going through ``hamster-lib``.
+
+``hamster-lib`` pickles the ongoing fact to ``tmpfile_path`` and reads that
+file back on every access. The service instead holds it in memory and only
+writes a small JSON journal whenever it changes.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import errno
+import io
+import json
+import logging
+import os
+from gettext import gettext as _
+
+from six import text_type
+
+from hamster_dbus import helpers
+
+_logger = logging.getLogger(__name__)
+
+
+def default_path():
+    """
+    Return the default location of the journal.
+
+    Returns:
+        text_type: Path within ``$XDG_DATA_HOME`` (``~/.local/share`` if that is
+            not set), so the ongoing fact survives restarts and reboots.
+    """
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(
+        os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(data_home, 'hamster-dbus', 'ongoing-fact.json')
+
+
+class OngoingFact(object):
+    """
+    The current 'ongoing fact', optionally persisted to a journal file.
+
+    The journal holds the dbus representation of the fact (see
+    ``helpers.hamster_to_dbus_fact``) as JSON and is replaced atomically, so it
+    is never found half written.
+    """
+
+    def __init__(self, path=None):
+        """
+        Initialize a new instance, restoring the fact from the journal if there is one.
+
+        Args:
+            path (text_type, optional): Path of the journal file. ``None`` keeps
+                the ongoing fact in memory only. Defaults to ``None``.
+        """
+        self._path = path
+        self.fact = self._load()
+
+    def start(self, fact):
+        """
+        Make ``fact`` the ongoing fact.
+
+        Args:
+            fact (hamster_lib.Fact): Fact without ``end``.
+
+        Raises:
+            ValueError: If the fact has an ``end`` or there already is an ongoing fact.
+        """
+        if fact.end:
+            raise ValueError(_("The passed fact has an end specified."))
+        if self.fact:
+            raise ValueError(_("Trying to start with ongoing fact already present."))
+        self._store(fact)
+        self.fact = fact
+
+    def get(self):
+        """
+        Return the ongoing fact.
+
+        Raises:
+            KeyError: If there is no ongoing fact.
+        """
+        if not self.fact:
+            raise KeyError(_("Tried to retrieve an 'ongoing fact' when there is none present."))
+        return self.fact
+
+    def clear(self):
+        """Forget the ongoing fact (if any)."""
+        self._store(None)
+        self.fact = None
+
+    def _load(self):
+        if not self._path:
+            return None
+        try:
+            with io.open(self._path, 'r', encoding='utf-8') as fobj:
+                return helpers.dbus_to_hamster_fact(json.load(fobj))
+        except (IOError, OSError) as error:
+            if error.errno != errno.ENOENT:
+                raise
+            return None
+        except (TypeError, ValueError) as error:
+            # A corrupt journal must not keep the service from starting.
+            _logger.warning(_("Ignoring invalid journal '{}': {}").format(self._path, error))
+            return None
+
+    def _store(self, fact):
+        if not self._path:
+            return
+        if fact is None:
+            try:
+                os.remove(self._path)
+            except OSError as error:
+                if error.errno != errno.ENOENT:
+                    raise
+            return
+
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        tmp_path = self._path + '.tmp'
+        data = text_type(json.dumps(helpers.hamster_to_dbus_fact(fact)))
+        with io.open(tmp_path, 'w', encoding='utf-8') as fobj:
+            fobj.write(data)
+            fobj.flush()
+            os.fsync(fobj.fileno())
+        os.rename(tmp_path, self._path)
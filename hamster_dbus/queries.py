@@ -0,0 +1,379 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Queries run directly against the ``hamster-lib`` SQLAlchemy backend.
+
+The ``hamster_lib.storage`` manager API always returns complete lists of
+fully constructed instances. Wherever the service needs to walk through large
+amounts of data we use the queries provided here instead.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import datetime
+from gettext import gettext as _
+
+from hamster_lib.backends.sqlalchemy import objects as alchemy
+from hamster_lib.backends.sqlalchemy.objects import AlchemyActivity, AlchemyCategory, AlchemyFact
+from sqlalchemy import Index, and_, func, inspect, or_
+from sqlalchemy.orm import joinedload
+
+# Index on the timeframe of facts, see ``ensure_fact_index``.
+_FACT_INDEX = Index('ix_facts_start_end', alchemy.facts.c.start, alchemy.facts.c.end)
+
+
+def count_rows(session, model):
+    """
+    Return the number of rows of a table.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the ``hamster-lib`` store.
+        model: ``hamster-lib`` SQLAlchemy model (e.g. ``AlchemyTag``) of the table.
+
+    Returns:
+        int: Number of rows.
+    """
+    return session.query(func.count(model.pk)).scalar()
+
+
+def ensure_fact_index(session):
+    """
+    Create our index on the timeframe of facts, unless it exists already.
+
+    ``hamster-lib`` does not index facts by time, so every query restricted to
+    a timeframe would scan the whole table otherwise.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the ``hamster-lib`` store.
+    """
+    bind = session.get_bind()
+    if _FACT_INDEX.name not in [index['name'] for index in inspect(bind).get_indexes('facts')]:
+        _FACT_INDEX.create(bind)
+
+
+def iter_fact_spans(session, start, end, group_by, pks=None):
+    """
+    Iterate over the timeframes of all facts overlapping a timeframe.
+
+    Only the columns needed are loaded, no ``hamster_lib.Fact`` instances are built.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the ``hamster-lib`` store.
+        start (datetime.datetime): Only consider facts ending after this point
+            in time. ``None`` for no limit.
+        end (datetime.datetime): Only consider facts starting before this point
+            in time. ``None`` for no limit.
+        group_by (text_type): ``'activity'``, ``'category'`` or ``'tag'``.
+        pks (iterable, optional): Only consider facts belonging to the groups
+            with these PKs. ``None`` for all groups. Defaults to ``None``.
+
+    Yields:
+        tuple: ``(start, end, (pk, name))`` tuples, the last element identifying
+            the activity, category or tag of the fact. Facts without category
+            or tags yield ``(-1, '')``, facts with several tags one tuple per tag.
+
+    Raises:
+        ValueError: If ``group_by`` is unknown.
+    """
+    query, group = _query_by_group(session, (AlchemyFact.start, AlchemyFact.end), group_by)
+    query = _filter_timeframe(query, start, end)
+    if pks is not None:
+        query = query.filter(group[0].in_(list(pks)))
+    for fact_start, fact_end, pk, name in query:
+        yield fact_start, fact_end, (-1 if pk is None else pk, name or '')
+
+
+def count_top_groups(session, start, end, group_by, n):
+    """
+    Return the groups with the highest number of facts overlapping a timeframe.
+
+    Counting is left to the database, so only the rows of the groups returned
+    are ever loaded.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the ``hamster-lib`` store.
+        start (datetime.datetime): Only consider facts ending after this point
+            in time. ``None`` for no limit.
+        end (datetime.datetime): Only consider facts starting before this point
+            in time. ``None`` for no limit.
+        group_by (text_type): ``'activity'``, ``'category'`` or ``'tag'``.
+            Facts without category or tags are not counted.
+        n (int): Number of groups to be returned. Groups tying with the last
+            of those are returned as well, so ties can be broken by the caller.
+
+    Returns:
+        list: ``((pk, name), count)`` tuples ordered by ``count`` (highest first)
+            and ``pk``.
+
+    Raises:
+        ValueError: If ``group_by`` is unknown.
+    """
+    if n < 1:
+        return []
+    count = func.count(AlchemyFact.pk)
+    query, group = _query_by_group(session, (count,), group_by)
+    query = _filter_timeframe(query, start, end).filter(group[0].isnot(None)).group_by(*group)
+    threshold = query.order_by(count.desc()).offset(n - 1).limit(1).first()
+    if threshold is not None:
+        query = query.having(count >= threshold[0])
+    return [((pk, name or ''), fact_count)
+        for fact_count, pk, name in query.order_by(count.desc(), group[0])]
+
+
+def _query_by_group(session, columns, group_by):
+    """
+    Query ``columns`` along with the PK and name of the group of each fact.
+
+    Returns:
+        tuple: The query and the ``(pk, name)`` columns of the group.
+    """
+    if group_by == 'activity':
+        group = (AlchemyActivity.pk, AlchemyActivity.name)
+        query = session.query(*columns + group).select_from(AlchemyFact).join(
+            AlchemyFact.activity)
+    elif group_by == 'category':
+        group = (AlchemyCategory.pk, AlchemyCategory.name)
+        query = session.query(*columns + group).select_from(AlchemyFact).join(
+            AlchemyFact.activity).outerjoin(AlchemyActivity.category)
+    elif group_by == 'tag':
+        group = (alchemy.AlchemyTag.pk, alchemy.AlchemyTag.name)
+        query = session.query(*columns + group).select_from(AlchemyFact).outerjoin(
+            AlchemyFact.tags)
+    else:
+        raise ValueError(_("Unknown grouping: '{}'.").format(group_by))
+    return query, group
+
+
+def _filter_timeframe(query, start, end):
+    """Restrict ``query`` to facts overlapping a timeframe, see ``iter_fact_spans``."""
+    if start is not None:
+        query = query.filter(AlchemyFact.end > start)
+    if end is not None:
+        query = query.filter(AlchemyFact.start < end)
+    return query
+
+
+def iter_fact_timeframes(session, start, end):
+    """
+    Iterate over the timeframes of all facts sharing time with a timeframe.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the ``hamster-lib`` store.
+        start (datetime.datetime): Start of the timeframe.
+        end (datetime.datetime): Exclusive end of the timeframe.
+
+    Yields:
+        tuple: ``(start, end, pk)`` tuples ordered by ``start``. Facts reaching
+            beyond the timeframe are not clipped.
+    """
+    query = session.query(AlchemyFact.start, AlchemyFact.end, AlchemyFact.pk).filter(
+        AlchemyFact.start < end, AlchemyFact.end > start).order_by(AlchemyFact.start,
+        AlchemyFact.pk)
+    for fact_start, fact_end, pk in query:
+        yield fact_start, fact_end, pk
+
+
+def get_activity_groups(session, group_by):
+    """
+    Return the group each activity belongs to when grouping facts by activity or category.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the ``hamster-lib`` store.
+        group_by (text_type): ``'activity'`` or ``'category'``.
+
+    Returns:
+        dict: Mapping of activity PKs to ``(pk, name)`` tuples, just like the
+            groups yielded by ``iter_fact_spans``.
+
+    Raises:
+        ValueError: If ``group_by`` is neither ``'activity'`` nor ``'category'``.
+    """
+    if group_by == 'activity':
+        rows = session.query(AlchemyActivity.pk, AlchemyActivity.pk, AlchemyActivity.name)
+    elif group_by == 'category':
+        rows = session.query(AlchemyActivity.pk, AlchemyCategory.pk,
+            AlchemyCategory.name).outerjoin(AlchemyActivity.category)
+    else:
+        raise ValueError(_("Unknown grouping: '{}'.").format(group_by))
+    return {activity_pk: (-1 if pk is None else pk, name or '')
+        for activity_pk, pk, name in rows}
+
+
+def get_activities(session, pks):
+    """
+    Return several activities (along with their categories) using a single query.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the ``hamster-lib`` store.
+        pks (iterable): PKs of the activities to be returned.
+
+    Returns:
+        dict: Mapping of PKs to ``hamster_lib.Activity`` instances. Unknown
+            PKs are left out.
+    """
+    pks = list(pks)
+    if not pks:
+        return {}
+    query = session.query(AlchemyActivity).options(joinedload(AlchemyActivity.category)).filter(
+        AlchemyActivity.pk.in_(pks))
+    return {activity.pk: activity.as_hamster() for activity in query}
+
+
+def get_overlapping_facts(session, start, end, exclude_pk=None, max_duration=None):
+    """
+    Return all facts sharing time with a timeframe.
+
+    ``hamster-lib`` refuses to save overlapping facts, but databases written
+    by other tools or older versions may contain them. So rather than only
+    looking at the last fact starting before ``start``, all facts starting
+    before ``end`` may overlap. Without ``max_duration`` all of them need to be
+    checked, which is about the whole table for recent timeframes. With it,
+    facts starting too early to reach ``start`` are skipped by our index on
+    ``(start, end)``, so only the facts within the timeframe and those
+    starting up to ``max_duration`` before it are read.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the ``hamster-lib`` store.
+        start (datetime.datetime): Start of the timeframe.
+        end (datetime.datetime): Exclusive end of the timeframe. If it equals
+            ``start``, the facts including that very point in time are returned.
+        exclude_pk (int, optional): PK of a fact to be ignored, e.g. the one
+            about to be updated. Defaults to ``None``.
+        max_duration (datetime.timedelta, optional): Upper bound of the duration
+            of all facts, see ``get_longest_duration``. Defaults to ``None``.
+
+    Returns:
+        list: ``hamster_lib.Fact`` instances, ordered by ``start``.
+    """
+    if end > start:
+        condition = AlchemyFact.start < end
+    else:
+        condition = AlchemyFact.start <= start
+    query = session.query(AlchemyFact).filter(condition, AlchemyFact.end > start)
+    if max_duration is not None:
+        query = query.filter(AlchemyFact.start > start - max_duration)
+    if exclude_pk is not None:
+        query = query.filter(AlchemyFact.pk != exclude_pk)
+    return [fact.as_hamster() for fact in query.order_by(AlchemyFact.start, AlchemyFact.pk)]
+
+
+def get_longest_duration(session):
+    """
+    Return the duration of the longest fact.
+
+    All facts are scanned, so callers should keep the result (see
+    ``cache.MaximumBound``) rather than calling this repeatedly.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the ``hamster-lib`` store.
+
+    Returns:
+        datetime.timedelta: The longest duration, zero if there are no facts.
+    """
+    longest = datetime.timedelta(0)
+    for fact_start, fact_end in session.query(AlchemyFact.start, AlchemyFact.end):
+        longest = max(longest, fact_end - fact_start)
+    return longest
+
+
+def sum_durations(session, start, end):
+    """
+    Return the total duration of all facts within a timeframe.
+
+    Only ``start`` and ``end`` of the matching facts are loaded.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the ``hamster-lib`` store.
+        start (datetime.datetime): Only consider facts starting at or after this
+            point in time.
+        end (datetime.datetime): Only consider facts ending before or at this
+            point in time.
+
+    Returns:
+        int: Total duration in seconds.
+    """
+    rows = session.query(AlchemyFact.start, AlchemyFact.end).filter(
+        AlchemyFact.start >= start, AlchemyFact.end <= end)
+    return int(sum((fact_end - fact_start).total_seconds() for fact_start, fact_end in rows))
+
+
+def sum_durations_by_category(session, start, end):
+    """
+    Return the total duration of all facts within a timeframe per category.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the ``hamster-lib`` store.
+        start (datetime.datetime): Only consider facts starting at or after this
+            point in time.
+        end (datetime.datetime): Only consider facts ending before or at this
+            point in time.
+
+    Returns:
+        dict: Mapping of category names to their total duration in seconds.
+            Facts without category are accounted for as ``''``.
+    """
+    rows = session.query(AlchemyFact.start, AlchemyFact.end, AlchemyCategory.name).join(
+        AlchemyFact.activity).outerjoin(AlchemyActivity.category).filter(
+        AlchemyFact.start >= start, AlchemyFact.end <= end)
+    totals = {}
+    for fact_start, fact_end, name in rows:
+        name = name or ''
+        totals[name] = totals.get(name, 0) + (fact_end - fact_start).total_seconds()
+    return {name: int(total) for name, total in totals.items()}
+
+
+def iter_facts(session, start=None, end=None, chunk_size=500):
+    """
+    Iterate over all facts within a timeframe, loading only a chunk at a time.
+
+    Facts are ordered by ``start`` (and ``pk``) and retrieved using keyset
+    pagination. This keeps memory usage constant regardless of the number of
+    matching facts and is robust against writes happening in between chunks.
+
+    Args:
+        session (sqlalchemy.orm.Session): Session of the ``hamster-lib`` store.
+        start (datetime.datetime, optional): Only consider facts starting at or
+            after this point in time. Defaults to ``None``.
+        end (datetime.datetime, optional): Only consider facts ending before or
+            at this point in time. Defaults to ``None``.
+        chunk_size (int, optional): Number of facts to be loaded at once.
+            Defaults to ``500``.
+
+    Yields:
+        hamster_lib.Fact: The matching facts.
+    """
+    query = session.query(AlchemyFact)
+    if start is not None:
+        query = query.filter(AlchemyFact.start >= start)
+    if end is not None:
+        query = query.filter(AlchemyFact.end <= end)
+    query = query.order_by(AlchemyFact.start, AlchemyFact.pk)
+
+    last = None
+    while True:
+        chunk_query = query
+        if last:
+            last_start, last_pk = last
+            chunk_query = query.filter(or_(
+                AlchemyFact.start > last_start,
+                and_(AlchemyFact.start == last_start, AlchemyFact.pk > last_pk)
+            ))
+        chunk = chunk_query.limit(chunk_size).all()
+        if not chunk:
+            return
+        for alchemy_fact in chunk:
+            yield alchemy_fact.as_hamster()
+        last = (chunk[-1].start, chunk[-1].pk)
@@ -0,0 +1,359 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Aggregate fact durations into time buckets.
+
+Buckets follow the *work days* of ``hamster-lib``: a day starts at the
+configured ``day_start`` instead of midnight, and so do weeks (on Mondays) and
+months (on their first day). Hourly buckets are aligned to ``day_start`` as
+well, so they tile those days exactly.
+
+``get_gaps`` and ``get_conflicts`` audit timesheets for untracked and double
+booked periods instead, ``get_top`` ranks activities or tags.
+
+Everything here works on plain ``datetime.datetime`` instances, fetching facts
+is left to ``queries``.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import bisect
+import datetime
+import heapq
+import itertools
+from gettext import gettext as _
+
+BUCKETS = ('hour', 'day', 'week', 'month')
+GROUPS = ('activity', 'category', 'tag')
+METRICS = ('duration', 'count')
+
+_HOUR = datetime.timedelta(hours=1)
+_DAY = datetime.timedelta(days=1)
+
+
+def get_timeframe(start, end, day_start):
+    """
+    Complete the timeframe of a series.
+
+    Args:
+        start (datetime.datetime, datetime.date or datetime.time): Start of the
+            timeframe. Dates refer to the beginning of that day, times to today.
+        end (datetime.datetime, datetime.date or datetime.time): End of the
+            timeframe. Dates refer to the end of that day (that is the beginning
+            of the next one), times to today.
+        day_start (datetime.time): Time work days start at.
+
+    Returns:
+        tuple: ``(start, end)`` tuple of ``datetime.datetime`` instances. ``end`` is exclusive.
+
+    Raises:
+        ValueError: If a value is missing or ``end`` is not after ``start``.
+    """
+    def complete(value, is_end):
+        if isinstance(value, datetime.datetime):
+            return value
+        if isinstance(value, datetime.time):
+            return datetime.datetime.combine(datetime.date.today(), value)
+        if is_end:
+            value += _DAY
+        return datetime.datetime.combine(value, day_start)
+
+    if start is None or end is None:
+        raise ValueError(_("A series needs both a start and an end."))
+    start = complete(start, False)
+    end = complete(end, True)
+    if end <= start:
+        raise ValueError(_("End value can not be earlier than start!"))
+    return start, end
+
+
+def _check_bucket(bucket):
+    if bucket not in BUCKETS:
+        raise ValueError(_("Unknown bucket: '{}'. Use one of: {}.").format(
+            bucket, ', '.join(BUCKETS)))
+
+
+def get_bucket_start(value, bucket, day_start):
+    """
+    Return the start of the bucket ``value`` falls into.
+
+    Args:
+        value (datetime.datetime): Point in time.
+        bucket (text_type): One of ``BUCKETS``.
+        day_start (datetime.time): Time work days start at.
+
+    Returns:
+        datetime.datetime: Start of the bucket.
+
+    Raises:
+        ValueError: If ``bucket`` is unknown.
+    """
+    _check_bucket(bucket)
+    date = value.date()
+    if value.time() < day_start:
+        date -= _DAY
+    day = datetime.datetime.combine(date, day_start)
+    if bucket == 'hour':
+        return day + _HOUR * int((value - day).total_seconds() // 3600)
+    if bucket == 'day':
+        return day
+    if bucket == 'week':
+        return day - _DAY * date.weekday()
+    return datetime.datetime.combine(date.replace(day=1), day_start)
+
+
+def get_next_bucket_start(bucket_start, bucket, day_start):
+    """
+    Return the start of the bucket following the one starting at ``bucket_start``.
+
+    Args:
+        bucket_start (datetime.datetime): Start of a bucket as returned by
+            ``get_bucket_start``.
+        bucket (text_type): One of ``BUCKETS``.
+        day_start (datetime.time): Time work days start at.
+
+    Returns:
+        datetime.datetime: Start of the next bucket.
+
+    Raises:
+        ValueError: If ``bucket`` is unknown.
+    """
+    _check_bucket(bucket)
+    if bucket == 'hour':
+        return bucket_start + _HOUR
+    if bucket == 'day':
+        return bucket_start + _DAY
+    if bucket == 'week':
+        return bucket_start + _DAY * 7
+    date = bucket_start.date()
+    year, month = divmod(date.month, 12)
+    return datetime.datetime.combine(date.replace(year=date.year + year, month=month + 1),
+        day_start)
+
+
+def get_bucket_starts(start, end, bucket, day_start):
+    """
+    Return the starts of all buckets overlapping a timeframe.
+
+    Args:
+        start (datetime.datetime): Start of the timeframe.
+        end (datetime.datetime): Exclusive end of the timeframe.
+        bucket (text_type): One of ``BUCKETS``.
+        day_start (datetime.time): Time work days start at.
+
+    Returns:
+        list: Ascending ``datetime.datetime`` instances. The first one may be
+            before ``start`` if it is not aligned to a bucket.
+
+    Raises:
+        ValueError: If ``bucket`` is unknown.
+    """
+    bucket_starts = [get_bucket_start(start, bucket, day_start)]
+    while True:
+        bucket_start = get_next_bucket_start(bucket_starts[-1], bucket, day_start)
+        if bucket_start >= end:
+            return bucket_starts
+        bucket_starts.append(bucket_start)
+
+
+def get_whole_days(start, end, day_start):
+    """
+    Return the work days lying entirely within a timeframe.
+
+    Args:
+        start (datetime.datetime): Start of the timeframe.
+        end (datetime.datetime): Exclusive end of the timeframe.
+        day_start (datetime.time): Time work days start at.
+
+    Returns:
+        tuple: ``(first, last)`` tuple of ``datetime.datetime`` instances, the
+            start of the first whole day and the end of the last one. ``None``
+            if there is no whole day.
+    """
+    first = get_bucket_start(start, 'day', day_start)
+    if first < start:
+        first += _DAY
+    last = get_bucket_start(end, 'day', day_start)
+    if last <= first:
+        return None
+    return first, last
+
+
+def clip_spans(spans, start, end):
+    """
+    Clip spans to a timeframe, dropping those outside of it.
+
+    Args:
+        spans (iterable): ``(start, end, group)`` tuples.
+        start (datetime.datetime): Start of the timeframe.
+        end (datetime.datetime): Exclusive end of the timeframe.
+
+    Yields:
+        tuple: ``(start, end, group)`` tuples within the timeframe.
+    """
+    for span_start, span_end, group in spans:
+        span_start = max(span_start, start)
+        span_end = min(span_end, end)
+        if span_start < span_end:
+            yield span_start, span_end, group
+
+
+def get_series(spans, start, end, bucket, day_start, daily_totals=()):
+    """
+    Sum up durations per bucket and group.
+
+    Spans crossing bucket boundaries are split among those buckets, spans
+    reaching beyond the timeframe are clipped to it.
+
+    Args:
+        spans (iterable): ``(start, end, group)`` tuples, ``group`` being any
+            hashable value, e.g. as returned by ``queries.iter_fact_spans``.
+        start (datetime.datetime): Start of the timeframe.
+        end (datetime.datetime): Exclusive end of the timeframe.
+        bucket (text_type): One of ``BUCKETS``.
+        day_start (datetime.time): Time work days start at.
+        daily_totals (iterable, optional): ``(day, group, seconds)`` tuples
+            with totals of whole work days (``datetime.date``) within the
+            timeframe, e.g. taken from a ``rollup.DailyRollup``. Those days
+            must not be covered by ``spans`` as well. Can not be used with
+            hourly buckets. Defaults to ``()``.
+
+    Returns:
+        tuple: ``(bucket_starts, durations)`` tuple. ``bucket_starts`` is the
+            list returned by ``get_bucket_starts``, ``durations`` maps
+            ``(bucket index, group)`` tuples to seconds. Empty buckets are omitted.
+
+    Raises:
+        ValueError: If ``bucket`` is unknown.
+    """
+    bucket_starts = get_bucket_starts(start, end, bucket, day_start)
+    # The end of each bucket, clipped to our timeframe.
+    bucket_ends = bucket_starts[1:] + [end]
+    durations = {}
+    for span_start, span_end, group in spans:
+        span_start = max(span_start, start)
+        span_end = min(span_end, end)
+        index = bisect.bisect_right(bucket_starts, span_start) - 1
+        while span_start < span_end:
+            part_end = min(span_end, bucket_ends[index])
+            key = (index, group)
+            durations[key] = durations.get(key, 0) + (part_end - span_start).total_seconds()
+            span_start = part_end
+            index += 1
+    for day, group, seconds in daily_totals:
+        index = bisect.bisect_right(bucket_starts,
+            datetime.datetime.combine(day, day_start)) - 1
+        key = (index, group)
+        durations[key] = durations.get(key, 0) + seconds
+    return bucket_starts, {key: int(seconds) for key, seconds in durations.items()}
+
+
+def get_gaps(spans, start, end, min_gap):
+    """
+    Find the periods within a timeframe not covered by any span.
+
+    Args:
+        spans (iterable): ``(start, end, pk)`` tuples ordered by ``start``, e.g.
+            as returned by ``queries.iter_fact_timeframes``.
+        start (datetime.datetime): Start of the timeframe.
+        end (datetime.datetime): Exclusive end of the timeframe.
+        min_gap (datetime.timedelta): Shorter gaps are ignored.
+
+    Returns:
+        list: ``(start, end)`` tuples of ``datetime.datetime`` instances, ordered by ``start``.
+    """
+    gaps = []
+    # Everything before this point in time is covered (or a gap has been found).
+    covered = start
+    for span_start, span_end, pk in itertools.chain(spans, [(end, end, None)]):
+        span_start = min(span_start, end)
+        if span_start > covered and span_start - covered >= min_gap:
+            gaps.append((covered, span_start))
+        covered = max(covered, span_end)
+    return gaps
+
+
+def get_conflicts(spans, start, end):
+    """
+    Find the periods within a timeframe covered by more than one span.
+
+    Each span is checked against the one reaching furthest among those
+    starting before it, so a single pass over the spans is sufficient.
+
+    Args:
+        spans (iterable): ``(start, end, pk)`` tuples ordered by ``start``, e.g.
+            as returned by ``queries.iter_fact_timeframes``.
+        start (datetime.datetime): Start of the timeframe.
+        end (datetime.datetime): Exclusive end of the timeframe.
+
+    Returns:
+        list: ``(start, end, pk, other pk)`` tuples, ordered by ``start``.
+            ``other pk`` starts while ``pk`` is still running. Conflicts are
+            clipped to the timeframe.
+    """
+    conflicts = []
+    furthest = None
+    for span_start, span_end, pk in spans:
+        if furthest and span_start < furthest[0]:
+            conflict_start = max(span_start, start)
+            conflict_end = min(span_end, furthest[0], end)
+            if conflict_start < conflict_end:
+                conflicts.append((conflict_start, conflict_end, furthest[1], pk))
+        if not furthest or span_end > furthest[0]:
+            furthest = (span_end, pk)
+    return conflicts
+
+
+def get_top(spans, start, end, n, metric):
+    """
+    Rank groups by their total duration or number of spans within a timeframe.
+
+    Spans are consumed one at a time, but a total is kept for every distinct
+    group among them. So memory grows with the number of groups, not with the
+    number of spans. Callers ranking by count may narrow ``spans`` down to the
+    candidates beforehand (see ``queries.count_top_groups``).
+
+    Args:
+        spans (iterable): ``(start, end, group)`` tuples, ``group`` being any
+            hashable value, e.g. as returned by ``queries.iter_fact_spans``.
+        start (datetime.datetime): Start of the timeframe.
+        end (datetime.datetime): Exclusive end of the timeframe.
+        n (int): Maximum number of groups to be returned.
+        metric (text_type): ``'duration'`` or ``'count'``. Ties are broken by
+            the respective other one.
+
+    Returns:
+        list: ``(group, seconds, count)`` tuples, the highest ranked first.
+            Spans are clipped to the timeframe.
+
+    Raises:
+        ValueError: If ``metric`` is unknown.
+    """
+    if metric not in METRICS:
+        raise ValueError(_("Unknown metric: '{}'. Use one of: {}.").format(
+            metric, ', '.join(METRICS)))
+    totals = {}
+    for span_start, span_end, group in clip_spans(spans, start, end):
+        seconds, count = totals.get(group, (0, 0))
+        totals[group] = (seconds + (span_end - span_start).total_seconds(), count + 1)
+    if metric == 'duration':
+        def key(item):
+            return item[1]
+    else:
+        def key(item):
+            return item[1][1], item[1][0]
+    return [(group, int(seconds), count)
+        for group, (seconds, count) in heapq.nlargest(n, totals.items(), key=key)]
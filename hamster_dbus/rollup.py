@@ -0,0 +1,141 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Total durations of facts per work day and activity, maintained incrementally.
+
+Reports covering long timeframes mostly consist of whole work days whose
+totals do not change unless a fact within them is written. ``DailyRollup``
+holds those totals in memory: it is built from all facts once and updated
+by the service whenever it saves or removes a fact.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import bisect
+import datetime
+
+from hamster_dbus import reports
+
+_DAY = datetime.timedelta(days=1)
+
+
+class DailyRollup(object):
+    """
+    Total duration of facts per work day and activity.
+
+    Durations are kept as ``datetime.timedelta`` so removing a fact exactly
+    undoes adding it. Facts crossing the start of a work day (``day_start``)
+    are split among those days.
+
+    Until the rollup has been built, and again after ``invalidate``, all
+    updates are ignored. This allows for simply dropping it whenever its
+    state is in doubt, e.g. after a rollback.
+    """
+
+    def __init__(self):
+        """Initialize a new instance that has not been built yet."""
+        self.day_start = None
+        # Maps work days (``datetime.date``) to ``{activity pk: timedelta}`` dicts.
+        self._days = None
+        # Keys of ``_days`` in ascending order, so ranges of days can be bisected.
+        self._sorted_days = None
+
+    @property
+    def built(self):
+        """Return ``True`` if the rollup has been built and is kept up to date."""
+        return self._days is not None
+
+    def build(self, spans, day_start):
+        """
+        Build the rollup from scratch.
+
+        Args:
+            spans (iterable): ``(start, end, activity pk)`` tuples of all facts.
+            day_start (datetime.time): Time work days start at.
+        """
+        self._days = {}
+        self._sorted_days = []
+        self.day_start = day_start
+        for start, end, activity_pk in spans:
+            self.add(start, end, activity_pk)
+
+    def invalidate(self):
+        """Drop the rollup. It needs to be built again before it can be used."""
+        self._days = None
+        self._sorted_days = None
+
+    def add(self, start, end, activity_pk, sign=1):
+        """
+        Account for a fact.
+
+        Args:
+            start (datetime.datetime): Start of the fact.
+            end (datetime.datetime): End of the fact. Nothing is done for ``None``.
+            activity_pk (int): PK of the activity of the fact.
+            sign (int, optional): ``-1`` removes the fact instead. Defaults to ``1``.
+        """
+        if self._days is None or start is None or end is None:
+            return
+        day = reports.get_bucket_start(start, 'day', self.day_start)
+        while start < end:
+            part_end = min(end, day + _DAY)
+            self._add_duration(day.date(), activity_pk, (part_end - start) * sign)
+            start = part_end
+            day += _DAY
+
+    def remove(self, start, end, activity_pk):
+        """Stop accounting for a fact that has been added before."""
+        self.add(start, end, activity_pk, sign=-1)
+
+    def add_fact(self, fact):
+        """Account for a saved ``hamster_lib.Fact``."""
+        self.add(fact.start, fact.end, fact.activity.pk)
+
+    def remove_fact(self, fact):
+        """Stop accounting for a ``hamster_lib.Fact`` that has been changed or removed."""
+        self.remove(fact.start, fact.end, fact.activity.pk)
+
+    def _add_duration(self, day, activity_pk, duration):
+        totals = self._days.get(day)
+        if totals is None:
+            totals = self._days[day] = {}
+            bisect.insort(self._sorted_days, day)
+        total = totals.get(activity_pk, datetime.timedelta(0)) + duration
+        if total:
+            totals[activity_pk] = total
+        else:
+            del totals[activity_pk]
+            if not totals:
+                del self._days[day]
+                del self._sorted_days[bisect.bisect_left(self._sorted_days, day)]
+
+    def iter_totals(self, first_day, last_day):
+        """
+        Iterate over the totals of a range of work days.
+
+        Args:
+            first_day (datetime.date): First work day to be included.
+            last_day (datetime.date): First work day not to be included anymore.
+
+        Yields:
+            tuple: ``(day, activity pk, seconds)`` tuples, ordered by day.
+                Days and activities without facts are omitted.
+        """
+        first = bisect.bisect_left(self._sorted_days, first_day)
+        last = bisect.bisect_left(self._sorted_days, last_day)
+        for day in self._sorted_days[first:last]:
+            for activity_pk, total in self._days[day].items():
+                yield day, activity_pk, total.total_seconds()
@@ -0,0 +1,301 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Declarative definition of all dbus interfaces of our service.
+
+This is the single source of truth for service and clients alike:
+
+* ``method`` and ``signal`` generate the ``dbus.service`` decorators used by
+  ``objects`` and refuse implementations whose arguments do not match.
+* ``objects.PropertiesObject`` takes the types of its properties from here.
+* ``StaticInterface`` lets clients (see ``storage``) call methods with their
+  signatures known up front, without introspecting the service at runtime.
+* The struct signatures and namedtuples used by ``helpers`` are derived from here.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import functools
+from collections import namedtuple
+from gettext import gettext as _
+
+import dbus
+import dbus.service
+
+BUS_NAME = 'org.projecthamster.HamsterDBus'
+
+MAIN_INTERFACE = 'org.projecthamster.HamsterDBus1'
+CATEGORIES_INTERFACE = 'org.projecthamster.HamsterDBus.CategoryManager1'
+TAGS_INTERFACE = 'org.projecthamster.HamsterDBus.TagManager1'
+ACTIVITIES_INTERFACE = 'org.projecthamster.HamsterDBus.ActivityManager1'
+FACTS_INTERFACE = 'org.projecthamster.HamsterDBus.FactManager1'
+REPORTS_INTERFACE = 'org.projecthamster.HamsterDBus.Reports1'
+
+# Signatures of our structs, see ``helpers.encode_category`` and friends.
+CATEGORY = '(is)'
+ACTIVITY = '(is{})b)'.format(CATEGORY[:-1])
+TAG = '(is)'
+FACT = '(isss{}a{})'.format(ACTIVITY, TAG)
+# Rows of our dictionary encoded representations, see ``helpers._DictionaryEncoder``.
+NORMALIZED_FACT = '(isssiau)'
+ACTIVITY_ROW = '(isib)'
+NAME_ROW = '(is)'
+
+_FACT_QUERY = (('start', 's'), ('end', 's'), ('filter_term', 's'))
+_TOP_QUERY = (('start', 's'), ('end', 's'), ('n', 'u'), ('metric', 's'))
+
+
+class Method(namedtuple('Method', ('in_args', 'out_args'))):
+    """
+    A method, ``in_args`` and ``out_args`` being sequences of ``(name, signature)`` tuples.
+
+    ``in_args`` names need to match the arguments of the implementation.
+    """
+
+    __slots__ = ()
+
+    @property
+    def in_signature(self):
+        """Return the signature of all in arguments."""
+        return ''.join(signature for name, signature in self.in_args)
+
+    @property
+    def out_signature(self):
+        """Return the signature of all out arguments."""
+        return ''.join(signature for name, signature in self.out_args)
+
+
+class Signal(namedtuple('Signal', ('args',))):
+    """A signal, ``args`` being a sequence of ``(name, signature)`` tuples."""
+
+    __slots__ = ()
+
+    @property
+    def signature(self):
+        """Return the signature of all arguments."""
+        return ''.join(signature for name, signature in self.args)
+
+
+# ``path`` is the object path of the (only) object implementing the interface.
+# ``methods`` and ``signals`` map names to ``Method``/``Signal`` instances,
+# ``properties`` maps names of (read-only) properties to their signature.
+Interface = namedtuple('Interface', ('path', 'methods', 'signals', 'properties'))
+
+_MANAGER_PROPERTIES = {'Count': 'u', 'Revision': 't'}
+
+INTERFACES = {
+    MAIN_INTERFACE: Interface(
+        path='/org/projecthamster/HamsterDBus',
+        methods={
+            'Quit': Method((), ()),
+        },
+        signals={
+            'CategoryChanged': Signal(()),
+            'ActivityChanged': Signal(()),
+            'TagChanged': Signal(()),
+            'FactChanged': Signal(()),
+        },
+        properties={'PeerAddress': 's'},
+    ),
+    CATEGORIES_INTERFACE: Interface(
+        path='/org/projecthamster/HamsterDBus/CategoryManager',
+        methods={
+            'Save': Method((('category_tuple', CATEGORY),), (('category', CATEGORY),)),
+            'GetOrCreate': Method((('category_tuple', CATEGORY),), (('category', CATEGORY),)),
+            'Remove': Method((('pk', 'i'),), ()),
+            'Get': Method((('pk', 'i'),), (('category', CATEGORY),)),
+            'GetByName': Method((('name', 's'),), (('category', CATEGORY),)),
+            'GetAll': Method((), (('categories', 'a' + CATEGORY),)),
+        },
+        signals={},
+        properties=_MANAGER_PROPERTIES,
+    ),
+    ACTIVITIES_INTERFACE: Interface(
+        path='/org/projecthamster/HamsterDBus/ActivityManager',
+        methods={
+            'Save': Method((('activity_tuple', ACTIVITY),), (('activity', ACTIVITY),)),
+            'GetOrCreate': Method((('activity_tuple', ACTIVITY),), (('activity', ACTIVITY),)),
+            'Remove': Method((('pk', 'i'),), ()),
+            'Get': Method((('pk', 'i'),), (('activity', ACTIVITY),)),
+            'GetByComposite': Method((('name', 's'), ('category_tuple', CATEGORY)),
+                (('activity', ACTIVITY),)),
+            'GetAll': Method((('category_pk', 'i'), ('search_term', 's')),
+                (('activities', 'a' + ACTIVITY),)),
+        },
+        signals={},
+        properties=_MANAGER_PROPERTIES,
+    ),
+    TAGS_INTERFACE: Interface(
+        path='/org/projecthamster/HamsterDBus/TagManager',
+        methods={
+            'Save': Method((('tag_tuple', TAG),), (('tag', TAG),)),
+            'GetOrCreate': Method((('tag_tuple', TAG),), (('tag', TAG),)),
+            'GetOrCreateMany': Method((('tag_tuples', 'a' + TAG),), (('tags', 'a' + TAG),)),
+            'Remove': Method((('pk', 'i'),), ()),
+            'Get': Method((('pk', 'i'),), (('tag', TAG),)),
+            'GetByName': Method((('name', 's'),), (('tag', TAG),)),
+            'GetAll': Method((), (('tags', 'a' + TAG),)),
+        },
+        signals={},
+        properties=_MANAGER_PROPERTIES,
+    ),
+    FACTS_INTERFACE: Interface(
+        path='/org/projecthamster/HamsterDBus/FactManager',
+        methods={
+            'Save': Method((('fact_tuple', FACT),), (('fact', FACT),)),
+            'SaveRaw': Method((('raw_fact', 's'),), (('fact', FACT),)),
+            'ParseRaw': Method((('raw_facts', 'as'),), (('facts', 'a' + FACT),)),
+            'Remove': Method((('pk', 'i'),), ()),
+            'Get': Method((('fact_pk', 'i'),), (('fact', FACT),)),
+            'GetAll': Method(_FACT_QUERY, (('facts', 'a' + FACT),)),
+            'GetAllColumnar': Method(_FACT_QUERY, (
+                ('pks', 'ai'), ('starts', 'ax'), ('ends', 'ax'), ('descriptions', 'as'),
+                ('activities', 'ai'), ('tag_offsets', 'au'), ('tags', 'au'),
+                ('activity_table', 'a' + ACTIVITY_ROW), ('category_table', 'a' + NAME_ROW),
+                ('tag_table', 'a' + NAME_ROW),
+            )),
+            'GetAllNormalized': Method(_FACT_QUERY, (
+                ('facts', 'a' + NORMALIZED_FACT), ('activity_table', 'a' + ACTIVITY_ROW),
+                ('category_table', 'a' + NAME_ROW), ('tag_table', 'a' + NAME_ROW),
+            )),
+            'GetTodays': Method((), (('facts', 'a' + FACT),)),
+            'GetOverlapping': Method((('start', 's'), ('end', 's')), (('facts', 'a' + FACT),)),
+            'GetAt': Method((('timestamp', 's'),), (('facts', 'a' + FACT),)),
+            'ExportTo': Method((('fd', 'h'), ('format', 's'), ('start', 's'), ('end', 's')),
+                ()),
+            'ImportFrom': Method((('fd', 'h'), ('format', 's'), ('options', 'a{sv}')),
+                (('job_id', 'u'),)),
+            'GetTmpFact': Method((), (('fact', FACT),)),
+            'StopTmpFact': Method((), (('fact', FACT),)),
+            'CancelTmpFact': Method((), ()),
+        },
+        signals={
+            'ImportProgress': Signal((('job_id', 'u'), ('processed', 'u'), ('failed', 'u'))),
+            'ImportFinished': Signal((('job_id', 'u'), ('imported', 'u'), ('failed', 'u'),
+                ('errors', 'a(us)'))),
+        },
+        properties=dict(_MANAGER_PROPERTIES, OngoingFact='a' + FACT, TodayDuration='u'),
+    ),
+    REPORTS_INTERFACE: Interface(
+        path='/org/projecthamster/HamsterDBus/Reports',
+        methods={
+            'GetSeries': Method(
+                (('start', 's'), ('end', 's'), ('bucket', 's'), ('group_by', 's')),
+                (('bucket_starts', 'ax'), ('groups', 'a' + NAME_ROW),
+                    ('durations', 'a(uuu)'))),
+            'GetGaps': Method((('start', 's'), ('end', 's'), ('min_gap', 'u')),
+                (('gaps', 'a(xx)'),)),
+            'GetConflicts': Method((('start', 's'), ('end', 's')),
+                (('conflicts', 'a(xxii)'),)),
+            'GetTopActivities': Method(_TOP_QUERY, (('activities', 'a({}uu)'.format(ACTIVITY)),)),
+            'GetTopTags': Method(_TOP_QUERY, (('tags', 'a({}uu)'.format(TAG)),)),
+        },
+        signals={},
+        properties={},
+    ),
+}
+
+
+def out_arg_names(interface, name):
+    """Return the names of the out arguments of a method, e.g. for a ``namedtuple``."""
+    return tuple(arg_name for arg_name, signature in INTERFACES[interface].methods[name].out_args)
+
+
+def _check_args(function, expected, ignored=()):
+    """Raise ``TypeError`` unless the arguments of ``function`` match ``expected`` names."""
+    code = function.__code__
+    names = [name for name in code.co_varnames[1:code.co_argcount] if name not in ignored]
+    if names != [name for name, signature in expected]:
+        raise TypeError(_("Arguments of '{}' do not match its definition: {} != {}.").format(
+            function.__name__, names, [name for name, signature in expected]))
+
+
+def method(interface, async_callbacks=None):
+    """
+    Return a ``dbus.service.method`` decorator for the method named like the decorated function.
+
+    Args:
+        interface (text_type): Name of one of our ``INTERFACES``.
+        async_callbacks (tuple, optional): Passed on to ``dbus.service.method``.
+            Defaults to ``None``.
+
+    Raises:
+        KeyError: If the method is not part of the interface.
+        TypeError: If the arguments of the decorated function do not match.
+    """
+    def decorator(function):
+        definition = INTERFACES[interface].methods[function.__name__]
+        _check_args(function, definition.in_args, async_callbacks or ())
+        return dbus.service.method(interface, in_signature=definition.in_signature,
+            out_signature=definition.out_signature, async_callbacks=async_callbacks)(function)
+    return decorator
+
+
+def signal(interface):
+    """
+    Return a ``dbus.service.signal`` decorator for the signal named like the decorated function.
+
+    Args:
+        interface (text_type): Name of one of our ``INTERFACES``.
+
+    Raises:
+        KeyError: If the signal is not part of the interface.
+        TypeError: If the arguments of the decorated function do not match.
+    """
+    def decorator(function):
+        definition = INTERFACES[interface].signals[function.__name__]
+        _check_args(function, definition.args)
+        return dbus.service.signal(interface, signature=definition.signature)(function)
+    return decorator
+
+
+class StaticInterface(object):
+    """
+    Client side proxy for one of our ``INTERFACES``.
+
+    Unlike ``dbus.Interface`` no introspection data is requested from the
+    service. Methods are called with the signature of their definition and the
+    number of arguments is checked before anything is sent.
+    """
+
+    def __init__(self, bus, interface):
+        """
+        Initialize a new instance.
+
+        Args:
+            bus (dbus.connection.Connection): Connection the service is reachable on.
+            interface (text_type): Name of one of our ``INTERFACES``.
+        """
+        definition = INTERFACES[interface]
+        self.proxy_object = bus.get_object(BUS_NAME, definition.path, introspect=False)
+        self._methods = {}
+        for name, method_definition in definition.methods.items():
+            proxy_method = self.proxy_object.get_dbus_method(name, interface)
+            self._methods[name] = functools.partial(self._call, proxy_method, name,
+                method_definition)
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['_methods'][name]
+        except KeyError:
+            raise AttributeError(_("No such method: '{}'.").format(name))
+
+    @staticmethod
+    def _call(proxy_method, name, definition, *args, **kwargs):
+        if len(args) != len(definition.in_args):
+            raise TypeError(_("'{}' takes {} arguments ({} given).").format(
+                name, len(definition.in_args), len(args)))
+        return proxy_method(*args, signature=definition.in_signature, **kwargs)
@@ -0,0 +1,250 @@
+# This file is part of 'hamster-dbus'.
+#
+# 'hamster-dbus' is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# 'hamster-dbus' is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with 'hamster-dbus'.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+A memory-mapped snapshot of the services 'hot' state.
+
+The service publishes the 'ongoing fact' and today's totals to a small file of
+fixed size and layout. Clients that poll this state (status bars, shell
+prompts, ...) map the file and read it without any dbus round trip.
+
+Layout (little endian, ``SIZE`` bytes in total):
+
+    ======  =======================================================
+    Offset  Content
+    ======  =======================================================
+    0       Magic ``b'HMSS'`` (4 bytes), ``VERSION`` (u16), unused (u16)
+    8       Sequence number (u64)
+    16      Payload (see ``_PAYLOAD``), zero padded up to ``SIZE``
+    ======  =======================================================
+
+Updates follow a seqlock protocol: the writer makes the sequence number odd,
+replaces the payload and makes the sequence number even again. A reader copies
+the payload and only accepts that copy if the sequence number was even and
+unchanged before and after. Otherwise it tries again.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import mmap
+import os
+import struct
+from collections import namedtuple
+from gettext import gettext as _
+
+from hamster_dbus import helpers
+
+MAGIC = b'HMSS'
+VERSION = 1
+SIZE = 4096
+
+# Maximum number of per category totals. If there are more categories, only
+# those with the largest totals are included.
+MAX_CATEGORIES = 32
+
+_HEADER = struct.Struct('<4sHH')
+_SEQUENCE = struct.Struct('<Q')
+_SEQUENCE_OFFSET = _HEADER.size
+_PAYLOAD_OFFSET = _SEQUENCE_OFFSET + _SEQUENCE.size
+# Revision, ongoing fact (start or ``-1``, activity, category, description),
+# today's total and number of categories, followed by ``MAX_CATEGORIES``
+# (category name, total) pairs.
+_PAYLOAD = struct.Struct('<Qq128s128s256sIH' + '64sI' * MAX_CATEGORIES)
+
+# The 'ongoing fact' as represented within a snapshot. Text fields may have
+# been truncated.
+SnapshotFact = namedtuple('SnapshotFact', ('activity', 'category', 'description', 'start'))
+
+# A single snapshot. ``revision`` is increased by every committed write,
+# ``ongoing_fact`` is a ``SnapshotFact`` or ``None``, ``today_total`` is the
+# duration of today's facts in seconds and ``category_totals`` maps category
+# names (``''`` for facts without category) to their share of it.
+Snapshot = namedtuple('Snapshot', ('revision', 'ongoing_fact', 'today_total',
+    'category_totals'))
+
+
+def default_path():
+    """
+    Return the default location of the snapshot.
+
+    Returns:
+        text_type: Path within ``$XDG_RUNTIME_DIR`` or ``None`` if that is not set.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if not runtime_dir:
+        return None
+    return os.path.join(runtime_dir, 'hamster-dbus.snapshot')
+
+
+def _encode_text(text, size):
+    """Encode text, truncated to at most ``size`` bytes without splitting a character."""
+    data = (text or '').encode('utf-8')
+    if len(data) > size:
+        data = data[:size].decode('utf-8', 'ignore').encode('utf-8')
+    return data
+
+
+def _decode_text(data):
+    return data.rstrip(b'\0').decode('utf-8')
+
+
+class SnapshotWriter(object):
+    """Publish snapshots to a memory-mapped file, see module docstring."""
+
+    def __init__(self, path):
+        """
+        Initialize a new instance, creating or taking over the file at ``path``.
+
+        The file is updated in place, so readers that already mapped it keep on
+        seeing new snapshots if the service is restarted.
+
+        Args:
+            path (text_type): Path of the snapshot file.
+        """
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size != SIZE:
+                os.ftruncate(fd, SIZE)
+            self._map = mmap.mmap(fd, SIZE)
+        finally:
+            os.close(fd)
+
+        self._sequence = _SEQUENCE.unpack_from(self._map, _SEQUENCE_OFFSET)[0]
+        if self._map[:_HEADER.size] != _HEADER.pack(MAGIC, VERSION, 0):
+            self._sequence = 0
+            self._set_sequence(1)
+            self._map[:_HEADER.size] = _HEADER.pack(MAGIC, VERSION, 0)
+            self._map[_PAYLOAD_OFFSET:] = b'\0' * (SIZE - _PAYLOAD_OFFSET)
+        # Even out a sequence number left odd by a crashed writer.
+        self._sequence += self._sequence % 2
+
+    def write(self, revision, ongoing_fact, category_totals):
+        """
+        Publish a new snapshot.
+
+        Args:
+            revision (int): Current revision of the backend.
+            ongoing_fact (hamster_lib.Fact): Current 'ongoing fact' or ``None``.
+            category_totals (dict): Mapping of category names (``''`` for facts
+                without category) to today's duration in seconds.
+        """
+        if ongoing_fact:
+            category = ongoing_fact.activity.category
+            fact_values = [helpers.datetime_to_epoch(ongoing_fact.start),
+                _encode_text(ongoing_fact.activity.name, 128),
+                _encode_text(category.name if category else '', 128),
+                _encode_text(ongoing_fact.description, 256)]
+        else:
+            fact_values = [-1, b'', b'', b'']
+
+        totals = sorted(category_totals.items(), key=lambda item: (-item[1], item[0]))
+        category_values = []
+        for name, total in totals[:MAX_CATEGORIES]:
+            category_values.extend([_encode_text(name, 64), total])
+        category_values.extend([b'', 0] * (MAX_CATEGORIES - len(totals[:MAX_CATEGORIES])))
+
+        payload = _PAYLOAD.pack(revision, *(fact_values + [
+            sum(category_totals.values()), min(len(totals), MAX_CATEGORIES)] + category_values))
+
+        self._set_sequence(self._sequence + 1)
+        self._map[_PAYLOAD_OFFSET:_PAYLOAD_OFFSET + _PAYLOAD.size] = payload
+        self._set_sequence(self._sequence + 1)
+
+    def close(self):
+        """Unmap the file. It is left in place for readers to find the last snapshot."""
+        self._map.close()
+
+    def _set_sequence(self, sequence):
+        _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, sequence)
+        self._sequence = sequence
+
+
+class SnapshotReader(object):
+    """
+    Read snapshots published by the service, without any dbus round trip.
+
+    Example:
+        with SnapshotReader() as reader:
+            snapshot = reader.read()
+    """
+
+    def __init__(self, path=None):
+        """
+        Initialize a new instance by mapping the snapshot file.
+
+        Args:
+            path (text_type, optional): Path of the snapshot file. Defaults to
+                ``default_path()``.
+
+        Raises:
+            IOError: If there is no snapshot file.
+            ValueError: If no path was passed and ``$XDG_RUNTIME_DIR`` is not set.
+        """
+        path = path or default_path()
+        if not path:
+            raise ValueError(_("No snapshot path given and $XDG_RUNTIME_DIR is not set."))
+        with open(path, 'rb') as fobj:
+            self._map = mmap.mmap(fobj.fileno(), SIZE, access=mmap.ACCESS_READ)
+
+    def read(self, retries=1000):
+        """
+        Return the current snapshot.
+
+        Args:
+            retries (int, optional): Number of attempts to find the snapshot not
+                being updated. Defaults to ``1000``.
+
+        Returns:
+            Snapshot: The current snapshot.
+
+        Raises:
+            ValueError: If the file is no snapshot of a supported version.
+            RuntimeError: If no consistent snapshot could be read.
+        """
+        for attempt in range(retries):
+            sequence = _SEQUENCE.unpack_from(self._map, _SEQUENCE_OFFSET)[0]
+            if sequence % 2:
+                continue
+            header = self._map[:_HEADER.size]
+            payload = self._map[_PAYLOAD_OFFSET:_PAYLOAD_OFFSET + _PAYLOAD.size]
+            if _SEQUENCE.unpack_from(self._map, _SEQUENCE_OFFSET)[0] == sequence:
+                break
+        else:
+            raise RuntimeError(_("Could not read a consistent snapshot."))
+
+        if header != _HEADER.pack(MAGIC, VERSION, 0):
+            raise ValueError(_("Not a snapshot of version {}.").format(VERSION))
+        return self._decode(_PAYLOAD.unpack(payload))
+
+    def close(self):
+        """Unmap the file."""
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _decode(self, values):
+        revision, start, activity, category, description, today_total, count = values[:7]
+        ongoing_fact = None
+        if start != -1:
+            ongoing_fact = SnapshotFact(_decode_text(activity), _decode_text(category),
+                _decode_text(description), helpers.epoch_to_datetime(start))
+        pairs = values[7:7 + 2 * count]
+        category_totals = {_decode_text(name): total for name, total in
+            zip(pairs[::2], pairs[1::2])}
+        return Snapshot(revision, ongoing_fact, today_total, category_totals)
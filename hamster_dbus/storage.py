@@ -36,22 +36,233 @@ a corresponding dbus service.
 from __future__ import absolute_import, unicode_literals
 
 import datetime
+import io
+import os
 from gettext import gettext as _
 
 import dbus
+import dbus.connection
 import hamster_lib.objects as lib_objects
 import hamster_lib.storage as lib_storage
 from future.utils import python_2_unicode_compatible
 from six import text_type
+from six.moves import collections_abc
 
 import hamster_dbus.helpers as helpers
+import hamster_dbus.schema as schema
+
+try:
+    import numpy
+except ImportError:
+    # NumPy is only needed for ``fact_columns_to_numpy``.
+    numpy = None
+
+
+def _read_records(fd, format):
+    """
+    Read complete records of a given export format from a file descriptor.
+
+    For ``csv`` and ``tsv`` a quoted value may span several lines. Quotes within
+    values are doubled, so a record is complete once it holds an even number of them.
+
+    Args:
+        fd (int): File descriptor to read from. It is closed once we are done.
+        format (text_type): Format the data is encoded in.
+
+    Yields:
+        text_type: Records including their line endings.
+    """
+    with io.open(fd, 'r', encoding='utf-8', newline='') as fobj:
+        if format == 'jsonl':
+            for line in fobj:
+                yield line
+            return
+
+        record = ''
+        for line in fobj:
+            record += line
+            if record.count('"') % 2 == 0:
+                yield record
+                record = ''
+        if record:
+            yield record
+
+
+def _check_timeframe(start, end):
+    """
+    Make sure ``start`` and ``end`` describe a valid timeframe.
+
+    Raises:
+        TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+            ``datetime.datetime`` objects.
+        ValueError: If ``end`` is before ``start``.
+    """
+    if not (isinstance(start, datetime.datetime) or isinstance(start, datetime.date) or (
+            isinstance(start, datetime.time) or (start is None))):
+        raise TypeError
+    if not (isinstance(end, datetime.datetime) or isinstance(end, datetime.date) or (
+            isinstance(end, datetime.time) or (end is None))):
+        raise TypeError
+
+    if start and end and (end <= start):
+        message = _("End value can not be earlier than start!")
+        raise ValueError(message)
+
+
+def _check_report_timeframe(start, end):
+    """
+    Make sure ``start`` and ``end`` describe a complete timeframe.
+
+    Unlike with ``_check_timeframe`` both are required and may be the same date.
+
+    Raises:
+        TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+            ``datetime.datetime`` objects.
+    """
+    if not all(isinstance(value, (datetime.date, datetime.time)) for value in (start, end)):
+        raise TypeError(_("'start' and 'end' need to be dates, times or datetimes."))
+
+
+def fact_columns_to_numpy(columns):
+    """
+    Convert a column oriented fact representation into NumPy arrays.
+
+    This allows for aggregating large amounts of facts without constructing
+    any per-fact python objects. Requires NumPy to be installed.
+
+    Args:
+        columns (hamster_dbus.helpers.DBusFactColumns): As returned by
+            ``FactManager.get_all_columnar``.
+
+    Returns:
+        dict: Mapping of column names to ``numpy.ndarray`` instances:
+
+            * ``pk`` (``int64``)
+            * ``start``, ``end`` (``datetime64[s]``, ``NaT`` for ``None``)
+            * ``description`` (``object``)
+            * ``activity`` (``int32``): Index into ``activity_name``.
+            * ``category`` (``int32``): Index into ``category_name``, ``-1`` for none.
+            * ``tag_offsets`` (``int64``): The tags of fact ``n`` are
+              ``tag[tag_offsets[n]:tag_offsets[n + 1]]``.
+            * ``tag`` (``int32``): Index into ``tag_name``.
+            * ``activity_name``, ``category_name``, ``tag_name`` (``object``)
+
+    Raises:
+        RuntimeError: If NumPy is not available.
+    """
+    if numpy is None:
+        raise RuntimeError(_("NumPy is required in order to use this function."))
+
+    def epochs(values):
+        result = numpy.array(values, dtype='int64')
+        missing = result == -1
+        result = result.astype('datetime64[s]')
+        result[missing] = numpy.datetime64('NaT')
+        return result
+
+    def names(table):
+        return numpy.array([entry[1] for entry in table], dtype=object)
+
+    activity_categories = numpy.array([entry[2] for entry in columns.activity_table],
+        dtype='int32')
+    activity = numpy.array(columns.activities, dtype='int32')
+    return {
+        'pk': numpy.array(columns.pks, dtype='int64'),
+        'start': epochs(columns.starts),
+        'end': epochs(columns.ends),
+        'description': numpy.array(columns.descriptions, dtype=object),
+        'activity': activity,
+        'category': activity_categories[activity],
+        'tag_offsets': numpy.array(columns.tag_offsets, dtype='int64'),
+        'tag': numpy.array(columns.tags, dtype='int32'),
+        'activity_name': names(columns.activity_table),
+        'category_name': names(columns.category_table),
+        'tag_name': names(columns.tag_table),
+    }
+
+
+class LazyFactList(collections_abc.Sequence):
+    """
+    Read-only sequence of facts converted from their dbus representation on first access.
+
+    Converted facts are cached, so each one is converted at most once. Slicing
+    returns another ``LazyFactList`` sharing the underlying data and cache
+    without converting anything.
+    """
+
+    def __init__(self, dbus_facts, context=None, _cache=None, _start=0, _step=1, _length=None):
+        """
+        Initialize a new instance.
+
+        Args:
+            dbus_facts (list): Facts as returned by the service, see
+                ``helpers.hamster_to_dbus_fact``.
+            context (helpers.DecodeContext, optional): Context used to share
+                identical sub-objects between facts. Defaults to ``None``.
+        """
+        self._dbus_facts = dbus_facts
+        self._context = context
+        self._cache = _cache if _cache is not None else [None] * len(dbus_facts)
+        self._start = _start
+        self._step = _step
+        self._length = len(dbus_facts) if _length is None else _length
+
+    def __len__(self):
+        """Return the number of facts."""
+        return self._length
+
+    def __getitem__(self, key):
+        """Return the fact at a given index or a ``LazyFactList`` for a slice."""
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            return LazyFactList(self._dbus_facts, context=self._context, _cache=self._cache,
+                _start=self._start + start * self._step, _step=self._step * step,
+                _length=len(range(start, stop, step)))
+
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError(_("Fact index out of range."))
+        index = self._start + key * self._step
+        fact = self._cache[index]
+        if fact is None:
+            decode_fact = self._context.decode_fact if self._context else helpers.decode_fact
+            fact = self._cache[index] = decode_fact(self._dbus_facts[index])
+        return fact
+
+    def __repr__(self):
+        """Return an instance representation that does not convert any facts."""
+        return '<LazyFactList of {} facts>'.format(self._length)
+
+
+def _get_peer_connection(bus):
+    """
+    Return a peer-to-peer connection to the service, bypassing the bus daemon.
+
+    Args:
+        bus (dbus.bus.BusConnection): Connection the service can be found on.
+
+    Returns:
+        dbus.connection.Connection: Private connection to the service or ``None``
+            if the service does not offer one or connecting failed.
+    """
+    main_object = bus.get_object(schema.BUS_NAME,
+        schema.INTERFACES[schema.MAIN_INTERFACE].path, introspect=False)
+    try:
+        address = main_object.Get(schema.MAIN_INTERFACE, 'PeerAddress',
+            dbus_interface=dbus.PROPERTIES_IFACE, signature='ss')
+        if not address:
+            return None
+        return dbus.connection.Connection(address)
+    except dbus.exceptions.DBusException:
+        return None
 
 
 @python_2_unicode_compatible
 class DBusStore(lib_storage.BaseStore):
     """Store class for hamster-dbus storage backend."""
 
-    def __init__(self, config, bus=None):
+    def __init__(self, config, bus=None, peer=False):
         """
         Initialize a new instance.
 
@@ -60,18 +271,24 @@ class DBusStore(lib_storage.BaseStore):
             bus (dbus.bus.BusConnection, optional): Connection to be used when
             querying dbus objects. If ``None``, ``dbus.SessionBus()`` will be
             used.
+            peer (bool, optional): If ``True`` talk to the service over a
+                peer-to-peer connection instead of via the bus daemon, if the
+                service offers one. Defaults to ``False``.
 
         Returns:
             DBusStore: DBusStore instance.
         """
         if bus is None:
             bus = dbus.SessionBus()
+        if peer:
+            bus = _get_peer_connection(bus) or bus
         self._bus = bus
         self.config = config
         self.categories = CategoryManager(self._bus)
         self.activities = ActivityManager(self._bus)
         self.tags = TagManager(self._bus)
         self.facts = FactManager(self._bus)
+        self.reports = ReportManager(self._bus)
 
     def cleanup(self):
         """Teardown chores."""
@@ -89,11 +306,7 @@ class CategoryManager(object):
         Args:
             bus (dbus.bus.BusConnection): Connection to query against.
         """
-        bus_name = 'org.projecthamster.HamsterDBus'
-        object_path = '/org/projecthamster/HamsterDBus/CategoryManager'
-        interface_name = 'org.projecthamster.HamsterDBus.CategoryManager1'
-        dbus_object = bus.get_object(bus_name, object_path)
-        self._interface = dbus.Interface(dbus_object, interface_name)
+        self._interface = schema.StaticInterface(bus, schema.CATEGORIES_INTERFACE)
 
     def save(self, category):
         """
@@ -212,11 +425,7 @@ class ActivityManager(object):
         Args:
             bus (dbus.bus.BusConnection): Connection to query against.
         """
-        bus_name = 'org.projecthamster.HamsterDBus'
-        object_path = '/org/projecthamster/HamsterDBus/ActivityManager'
-        interface_name = 'org.projecthamster.HamsterDBus.ActivityManager1'
-        dbus_object = bus.get_object(bus_name, object_path)
-        self._interface = dbus.Interface(dbus_object, interface_name)
+        self._interface = schema.StaticInterface(bus, schema.ACTIVITIES_INTERFACE)
 
     def save(self, activity):
         """
@@ -329,11 +538,7 @@ class TagManager(object):
         Args:
             bus (dbus.bus.BusConnection): Connection to query against.
         """
-        bus_name = 'org.projecthamster.HamsterDBus'
-        object_path = '/org/projecthamster/HamsterDBus/TagManager'
-        interface_name = 'org.projecthamster.HamsterDBus.TagManager1'
-        dbus_object = bus.get_object(bus_name, object_path)
-        self._interface = dbus.Interface(dbus_object, interface_name)
+        self._interface = schema.StaticInterface(bus, schema.TAGS_INTERFACE)
 
     def save(self, tag):
         """
@@ -372,6 +577,32 @@ class TagManager(object):
         result = self._interface.GetOrCreate(dbus_tag)
         return helpers.dbus_to_hamster_tag(result)
 
+    def get_or_create_many(self, tags):
+        """
+        Batch version of ``get_or_create``.
+
+        All tags are retrieved or created with a single call to the service.
+
+        Args:
+            tags (list): List of ``hamster_lib.Tag`` instances.
+
+        Returns:
+            list: List of retrieved or created tags, in the same order as ``tags``.
+
+        Raises:
+            TypeError: If any of ``tags`` is not a ``lib_objects.Tag`` instance.
+        """
+        for tag in tags:
+            if not isinstance(tag, lib_objects.Tag):
+                message = _("You need to pass ``hamster_lib.objects.Tag`` instances")
+                raise TypeError(message)
+
+        # We need to build the Array explicitly in order to avoid python-dbus
+        # trying to guess its signature (which fails for empty lists).
+        dbus_tags = dbus.Array([helpers.hamster_to_dbus_tag(tag) for tag in tags], '(is)')
+        result = self._interface.GetOrCreateMany(dbus_tags)
+        return [helpers.dbus_to_hamster_tag(tag) for tag in result]
+
     def remove(self, tag):
         """
         Remove a tag.
@@ -442,11 +673,7 @@ class FactManager(object):
         Args:
             bus (dbus.bus.BusConnection): Connection to query against.
         """
-        bus_name = 'org.projecthamster.HamsterDBus'
-        object_path = '/org/projecthamster/HamsterDBus/FactManager'
-        interface_name = 'org.projecthamster.HamsterDBus.FactManager1'
-        dbus_object = bus.get_object(bus_name, object_path)
-        self._interface = dbus.Interface(dbus_object, interface_name)
+        self._interface = schema.StaticInterface(bus, schema.FACTS_INTERFACE)
 
     def save(self, fact):
         """
@@ -462,6 +689,24 @@ class FactManager(object):
         result = self._interface.Save(dbus_fact)
         return helpers.dbus_to_hamster_fact(result)
 
+    def parse_raw(self, raw_facts):
+        """
+        Parse a batch of raw facts without saving them.
+
+        Args:
+            raw_facts (list): List of ``raw fact`` strings.
+
+        Returns:
+            list: List of unsaved ``Fact`` instances, one for each raw fact.
+                Their activities refer to existing ones wherever possible.
+
+        Raises:
+            dbus.exceptions.DBusException: If any of the raw facts can not be parsed.
+        """
+        raw_facts = dbus.Array([text_type(raw_fact) for raw_fact in raw_facts], 's')
+        result = self._interface.ParseRaw(raw_facts)
+        return helpers.decode_facts(result)
+
     def remove(self, fact):
         """
         Remove a Fact.
@@ -487,7 +732,8 @@ class FactManager(object):
         result = self._interface.Get(int(pk))
         return helpers.dbus_to_hamster_fact(result)
 
-    def get_all(self, start=None, end=None, filter_term=''):
+    def get_all(self, start=None, end=None, filter_term='', normalized=False, lazy=False,
+            shared=False):
         """
         Return all facts within a given timeframe.
 
@@ -509,6 +755,18 @@ class FactManager(object):
                 Defaults to ``None``.
             filter_term (str, optional): Only consider ``Facts`` with this
                 string as part of their associated ``Activity.name``
+            normalized (bool, optional): If ``True`` each distinct activity,
+                category and tag is only transmitted once and facts referring
+                to the same one share the same instance. This reduces message
+                size and memory usage considerably for large results. Defaults
+                to ``False``.
+            lazy (bool, optional): If ``True`` return a ``LazyFactList`` that
+                only converts facts once they are accessed. Can not be combined
+                with ``normalized``. Defaults to ``False``.
+            shared (bool, optional): If ``True`` facts share identical activity,
+                category and tag instances and their names are interned, see
+                ``helpers.DecodeContext``. This is implied by ``normalized``.
+                Defaults to ``False``.
 
         Returns:
             list: List of ``Fact``s matching given specifications.
@@ -516,30 +774,127 @@ class FactManager(object):
         Raises:
             TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
                 ``datetime.datetime`` objects.
-            ValueError: If ``end`` is before ``start``.
+            ValueError: If ``end`` is before ``start`` or both ``normalized``
+                and ``lazy`` are ``True``.
 
         Note:
             * This public function only provides some sanity checks and normalization. The actual
                 backend query is handled by ``_get_all``.
+            * With ``normalized=True`` or ``shared=True`` changing an activity,
+                category or tag of one fact changes it for all facts sharing it.
             * ``search_term`` should be prefixable with ``not`` in order to invert matching.
             * This does only return proper facts and does not include any existing 'ongoing fact'.
         """
-        if not (isinstance(start, datetime.datetime) or isinstance(start, datetime.date) or (
-                isinstance(start, datetime.time) or (start is None))):
-            raise TypeError
-        if not (isinstance(end, datetime.datetime) or isinstance(end, datetime.date) or (
-                isinstance(end, datetime.time) or (end is None))):
-            raise TypeError
-
-        if start and end and (end <= start):
-            message = _("End value can not be earlier than start!")
-            raise ValueError(message)
+        _check_timeframe(start, end)
+        if normalized and lazy:
+            raise ValueError(_("'normalized' and 'lazy' can not be combined."))
 
         start = helpers.datetime_to_text(start)
         end = helpers.datetime_to_text(end)
         filter_term = text_type(filter_term)
+        if normalized:
+            result = self._interface.GetAllNormalized(start, end, filter_term)
+            return helpers.dbus_to_hamster_fact_table(result)
         result = self._interface.GetAll(start, end, filter_term)
-        return [helpers.dbus_to_hamster_fact(fact) for fact in result]
+        context = helpers.DecodeContext() if shared else None
+        if lazy:
+            return LazyFactList(result, context=context)
+        return helpers.decode_facts(result, context=context)
+
+    def get_all_columnar(self, start=None, end=None, filter_term=''):
+        """
+        Return all facts within a given timeframe in a column oriented representation.
+
+        Args:
+            start (datetime.datetime, datetime.date, datetime.time or None, optional):
+                Consider only Facts starting at or after this date. Defaults to ``None``.
+            end (datetime.datetime, datetime.date, datetime.time or None, optional):
+                Consider only Facts ending before or at this date. Defaults to ``None``.
+            filter_term (str, optional): Only consider ``Facts`` with this
+                string as part of their associated ``Activity.name``
+
+        Returns:
+            hamster_dbus.helpers.DBusFactColumns: For details please see
+                ``helpers.hamster_to_dbus_fact_columns``. Use ``fact_columns_to_numpy``
+                to convert it into NumPy arrays.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+            ValueError: If ``end`` is before ``start``.
+        """
+        _check_timeframe(start, end)
+
+        result = self._interface.GetAllColumnar(helpers.datetime_to_text(start),
+            helpers.datetime_to_text(end), text_type(filter_term))
+        return helpers.DBusFactColumns(*result)
+
+    def export(self, format='csv', start=None, end=None):
+        """
+        Export all facts within a given timeframe.
+
+        The timeframe is validated and the export started right away. The service
+        then streams the data into a pipe which is only read as the returned iterator
+        is consumed, so neither side ever needs to hold the complete export in memory.
+
+        Args:
+            format (text_type, optional): ``csv``, ``tsv`` or ``jsonl``. For details
+                see ``hamster_dbus.formats``. Defaults to ``csv``.
+            start (datetime.datetime, datetime.date, datetime.time or None, optional):
+                Consider only Facts starting at or after this date. Defaults to ``None``.
+            end (datetime.datetime, datetime.date, datetime.time or None, optional):
+                Consider only Facts ending before or at this date. Defaults to ``None``.
+
+        Returns:
+            iterator: Yields ``text_type`` records (the ``csv``/``tsv`` header being the
+                first one), including their line endings. A record is never split, even
+                if a quoted value spans several lines.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+            ValueError: If ``end`` is before ``start``.
+        """
+        _check_timeframe(start, end)
+
+        read_fd, write_fd = os.pipe()
+        try:
+            self._interface.ExportTo(dbus.types.UnixFd(write_fd), text_type(format),
+                helpers.datetime_to_text(start), helpers.datetime_to_text(end))
+        except Exception:
+            os.close(read_fd)
+            raise
+        finally:
+            # The service holds its own duplicate. Closing ours makes sure we
+            # see EOF as soon as it is done.
+            os.close(write_fd)
+
+        return _read_records(read_fd, format)
+
+    def import_from(self, fobj, format='csv', block_size=None):
+        """
+        Import facts from a readable file object (e.g. an open file or a pipe).
+
+        The service reads from its own duplicate of the underlying file
+        descriptor and imports facts in the background. Progress and outcome
+        are announced by its ``ImportProgress`` and ``ImportFinished`` signals.
+
+        Args:
+            fobj (file): Object with a ``fileno`` method returning a readable
+                file descriptor.
+            format (text_type, optional): ``csv``, ``tsv``, ``jsonl`` or ``ical``.
+                For details see ``hamster_dbus.formats``. Defaults to ``csv``.
+            block_size (int, optional): Maximum number of bytes the service
+                reads and saves at once. Defaults to ``None`` (service default).
+
+        Returns:
+            int: ID of the import job, as referred to by the service signals.
+        """
+        options = {}
+        if block_size is not None:
+            options['block_size'] = dbus.Int32(block_size)
+        return int(self._interface.ImportFrom(dbus.types.UnixFd(fobj.fileno()),
+            text_type(format), dbus.Dictionary(options, signature='sv')))
 
     def get_today(self):
         """
@@ -551,8 +906,60 @@ class FactManager(object):
         Note:
             * This does only return proper facts and does not include any existing 'ongoing fact'.
         """
-        result = self._interface.GetToday()
-        return [helpers.dbus_to_hamster_fact(fact) for fact in result]
+        result = self._interface.GetTodays()
+        return helpers.decode_facts(result)
+
+    def get_overlapping(self, start, end):
+        """
+        Return all facts sharing time with a timeframe.
+
+        Unlike ``get_all`` this includes facts reaching into the timeframe
+        from before or beyond it.
+
+        Args:
+            start (datetime.datetime, datetime.date or datetime.time): Start of
+                the timeframe. Dates refer to the beginning of that day, times to today.
+            end (datetime.datetime, datetime.date or datetime.time): End of the
+                timeframe. Dates refer to the end of that day, times to today.
+
+        Returns:
+            list: List of ``Fact`` instances, ordered by start.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+
+        Note:
+            ``start`` and ``end`` may be the same date, that is a single day.
+        """
+        _check_report_timeframe(start, end)
+        result = self._interface.GetOverlapping(helpers.datetime_to_text(start),
+            helpers.datetime_to_text(end))
+        return helpers.decode_facts(result)
+
+    def get_at(self, timestamp):
+        """
+        Return the fact covering a point in time.
+
+        Args:
+            timestamp (datetime.datetime or datetime.time): Point in time. Times
+                refer to today.
+
+        Returns:
+            hamster_lib.Fact: The fact covering ``timestamp`` or ``None`` if
+                nothing has been tracked at that time.
+
+        Raises:
+            TypeError: If ``timestamp`` is not a ``datetime.datetime`` or
+                ``datetime.time`` object.
+
+        Note:
+            * This does only return proper facts and does not include any existing 'ongoing fact'.
+        """
+        if not isinstance(timestamp, (datetime.datetime, datetime.time)):
+            raise TypeError(_("'timestamp' needs to be a datetime.datetime or datetime.time."))
+        result = helpers.decode_facts(self._interface.GetAt(helpers.datetime_to_text(timestamp)))
+        return result[0] if result else None
 
     def stop_tmp_fact(self):
         """
@@ -592,3 +999,146 @@ class FactManager(object):
         """
         result = self._interface.GetTmpFact()
         return helpers.dbus_to_hamster_fact(result)
+
+
+@python_2_unicode_compatible
+class ReportManager(object):
+    """Class to request reports aggregated by the service."""
+
+    def __init__(self, bus):
+        """
+        Instantiate class.
+
+        Args:
+            bus (dbus.bus.BusConnection): Connection to query against.
+        """
+        self._interface = schema.StaticInterface(bus, schema.REPORTS_INTERFACE)
+
+    def get_series(self, start, end, bucket='day', group_by='activity'):
+        """
+        Return the durations of facts per time bucket and activity, category or tag.
+
+        Args:
+            start (datetime.datetime, datetime.date or datetime.time): Start of
+                the timeframe. Dates refer to the beginning of that day.
+            end (datetime.datetime, datetime.date or datetime.time): End of the
+                timeframe. Dates refer to the end of that day.
+            bucket (text_type, optional): ``'hour'``, ``'day'``, ``'week'`` or
+                ``'month'``. Defaults to ``'day'``.
+            group_by (text_type, optional): ``'activity'``, ``'category'`` or
+                ``'tag'``. Defaults to ``'activity'``.
+
+        Returns:
+            hamster_dbus.helpers.DBusSeries: For details please see
+                ``helpers.dbus_to_series``.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+
+        Note:
+            ``start`` and ``end`` may be the same date, that is a single day.
+        """
+        _check_report_timeframe(start, end)
+        result = self._interface.GetSeries(helpers.datetime_to_text(start),
+            helpers.datetime_to_text(end), text_type(bucket), text_type(group_by))
+        return helpers.dbus_to_series(result)
+
+    def get_gaps(self, start, end, min_gap=datetime.timedelta(0)):
+        """
+        Return the periods within a timeframe not covered by any fact.
+
+        Args:
+            start (datetime.datetime, datetime.date or datetime.time): Start of
+                the timeframe. Dates refer to the beginning of that day.
+            end (datetime.datetime, datetime.date or datetime.time): End of the
+                timeframe. Dates refer to the end of that day.
+            min_gap (datetime.timedelta, optional): Shorter gaps are ignored.
+                Defaults to no minimum.
+
+        Returns:
+            list: ``(start, end)`` tuples of ``datetime.datetime`` instances.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+        """
+        _check_report_timeframe(start, end)
+        result = self._interface.GetGaps(helpers.datetime_to_text(start),
+            helpers.datetime_to_text(end), int(min_gap.total_seconds()))
+        return helpers.dbus_to_gaps(result)
+
+    def get_conflicts(self, start, end):
+        """
+        Return the periods within a timeframe covered by more than one fact.
+
+        Args:
+            start (datetime.datetime, datetime.date or datetime.time): Start of
+                the timeframe. Dates refer to the beginning of that day.
+            end (datetime.datetime, datetime.date or datetime.time): End of the
+                timeframe. Dates refer to the end of that day.
+
+        Returns:
+            list: ``(start, end, pk, other_pk)`` tuples, ``other_pk`` being the
+                fact starting while the one with ``pk`` is still running.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+        """
+        _check_report_timeframe(start, end)
+        result = self._interface.GetConflicts(helpers.datetime_to_text(start),
+            helpers.datetime_to_text(end))
+        return helpers.dbus_to_conflicts(result)
+
+    def get_top_activities(self, start, end, n=10, metric='duration'):
+        """
+        Return the activities with the highest total duration or number of facts.
+
+        Args:
+            start (datetime.datetime, datetime.date or datetime.time): Start of
+                the timeframe. Dates refer to the beginning of that day.
+            end (datetime.datetime, datetime.date or datetime.time): End of the
+                timeframe. Dates refer to the end of that day.
+            n (int, optional): Maximum number of activities. Defaults to ``10``.
+            metric (text_type, optional): ``'duration'`` or ``'count'``.
+                Defaults to ``'duration'``.
+
+        Returns:
+            list: ``(hamster_lib.Activity, seconds, count)`` tuples, the highest
+                ranked first.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+        """
+        _check_report_timeframe(start, end)
+        result = self._interface.GetTopActivities(helpers.datetime_to_text(start),
+            helpers.datetime_to_text(end), int(n), text_type(metric))
+        return helpers.dbus_to_top_activities(result)
+
+    def get_top_tags(self, start, end, n=10, metric='duration'):
+        """
+        Return the tags with the highest total duration or number of facts.
+
+        Args:
+            start (datetime.datetime, datetime.date or datetime.time): Start of
+                the timeframe. Dates refer to the beginning of that day.
+            end (datetime.datetime, datetime.date or datetime.time): End of the
+                timeframe. Dates refer to the end of that day.
+            n (int, optional): Maximum number of tags. Defaults to ``10``.
+            metric (text_type, optional): ``'duration'`` or ``'count'``.
+                Defaults to ``'duration'``.
+
+        Returns:
+            list: ``(hamster_lib.Tag, seconds, count)`` tuples, the highest
+                ranked first.
+
+        Raises:
+            TypeError: If ``start`` or ``end`` are not ``datetime.date``, ``datetime.time`` or
+                ``datetime.datetime`` objects.
+        """
+        _check_report_timeframe(start, end)
+        result = self._interface.GetTopTags(helpers.datetime_to_text(start),
+            helpers.datetime_to_text(end), int(n), text_type(metric))
+        return helpers.dbus_to_top_tags(result)
@@ -63,7 +63,17 @@ def private_session_bus(request):
 
 
 @pytest.fixture
-def live_service(request, private_session_bus):
+def engine():
+    """
+    Provide the engine the service exports its objects with.
+
+    Tests may override this using ``pytest.mark.parametrize('engine', ['gdbus'])``.
+    """
+    return 'dbus-python'
+
+
+@pytest.fixture
+def live_service(request, private_session_bus, tmpdir, engine):
     """
     Provide a running hamster service hooked into a private session bus.
 
@@ -72,14 +82,17 @@ def live_service(request, private_session_bus):
 
     Note: The way a launched service determines the bus to connect to is by
     inspecting ``DBUS_SESSION_BUS_ADDRESS`` ENVVAR. If this would be empty,
-    the default session bus is used.
+    the default session bus is used. ``XDG_DATA_HOME`` points to a temporary
+    directory so no 'ongoing fact' is carried over from other tests.
+    ``HAMSTER_DBUS_ENGINE`` is set to ``engine``.
     """
     def fin():
         os.kill(daemon.pid, signal.SIGTERM)
 
     request.addfinalizer(fin)
 
-    daemon = subprocess.Popen(['hamster_dbus/hamster_dbus_service.py', 'server'])
+    env = dict(os.environ, XDG_DATA_HOME=str(tmpdir), HAMSTER_DBUS_ENGINE=engine)
+    daemon = subprocess.Popen(['hamster_dbus/hamster_dbus_service.py', 'server'], env=env)
     dbusmock.testcase.DBusTestCase.wait_for_bus_object(
         'org.projecthamster.HamsterDBus',
         '/org/projecthamster/HamsterDBus/ActivityManager',
@@ -143,6 +156,17 @@ def fact_manager(request, live_service):
     return interface
 
 
+@pytest.fixture
+def reports(request, live_service):
+    """Provide a convenient object hook to our hamster-dbus service."""
+    daemon, bus = live_service
+    object_ = bus.get_object('org.projecthamster.HamsterDBus',
+        '/org/projecthamster/HamsterDBus/Reports')
+    interface = dbus.Interface(object_,
+        dbus_interface='org.projecthamster.HamsterDBus.Reports1')
+    return interface
+
+
 # Data
 @pytest.fixture(params=[
     fauxfactory.gen_alpha(),
@@ -2,9 +2,32 @@
 
 """Integration tests for hamster_dbus.objects."""
 
+import datetime
+import io
+import os
+import time
+
+import dbus
 import pytest
+from gi.repository import Gio, GLib
 
 import hamster_dbus.helpers as helpers
+from hamster_dbus import storage
+
+
+@pytest.mark.needs_dbus_service
+class TestHamsterDBus(object):
+
+    def test_peer_connection(self, live_service, category):
+        """Make sure a store connected peer-to-peer talks to the service."""
+        daemon, bus = live_service
+        properties = dbus.Interface(bus.get_object('org.projecthamster.HamsterDBus',
+            '/org/projecthamster/HamsterDBus'), dbus.PROPERTIES_IFACE)
+        address = properties.Get('org.projecthamster.HamsterDBus1', 'PeerAddress')
+        store = storage.DBusStore({}, bus=bus, peer=True)
+        assert (store._bus is not bus) == bool(address)
+        category = store.categories.save(category)
+        assert category in store.categories.get_all()
 
 
 @pytest.mark.needs_dbus_service
@@ -69,6 +92,17 @@ class TestCategoryManager(object):
         for category in categories:
             assert category in result
 
+    def test_count_and_revision_properties(self, category_manager, category):
+        """Make sure count and revision are updated by a save."""
+        properties = dbus.Interface(category_manager.proxy_object, dbus.PROPERTIES_IFACE)
+        interface = 'org.projecthamster.HamsterDBus.CategoryManager1'
+        revision = properties.Get(interface, 'Revision')
+        assert properties.Get(interface, 'Count') == 0
+        category_manager.Save(helpers.hamster_to_dbus_category(category))
+        result = properties.GetAll(interface)
+        assert result['Count'] == 1
+        assert result['Revision'] > revision
+
 
 @pytest.mark.needs_dbus_service
 class TestActivityManager(object):
@@ -84,6 +118,29 @@ class TestActivityManager(object):
         # original does not.
         assert activity.as_tuple(include_pk=False) == result.as_tuple(include_pk=False)
 
+    def test_get_or_create_created(self, activity_manager, activity):
+        """Make sure an instance is created and returned."""
+        dbus_activity = helpers.hamster_to_dbus_activity(activity)
+        result = activity_manager.GetOrCreate(dbus_activity)
+        result = helpers.dbus_to_hamster_activity(result)
+        assert result.pk
+        assert activity.as_tuple(include_pk=False) == result.as_tuple(include_pk=False)
+
+    def test_get_or_create_get(self, activity_manager, stored_activity):
+        """If composite key exists make sure it is fetched and no new one created."""
+        dbus_activity = helpers.hamster_to_dbus_activity(stored_activity)
+        result = activity_manager.GetOrCreate(dbus_activity)
+        result = helpers.dbus_to_hamster_activity(result)
+        assert len(activity_manager.GetAll(-2, '')) == 1
+        assert result == stored_activity
+
+    def test_get_by_composite(self, activity_manager, stored_activity):
+        """Make sure the matching instance is returned."""
+        dbus_category = helpers.hamster_to_dbus_category(stored_activity.category)
+        result = activity_manager.GetByComposite(stored_activity.name, dbus_category)
+        result = helpers.dbus_to_hamster_activity(result)
+        assert result == stored_activity
+
     def test_remove(self, activity_manager, stored_activity):
         """Make sure instance is removed."""
         result = activity_manager.Remove(stored_activity.pk)
@@ -101,12 +158,19 @@ class TestActivityManager(object):
     def test_get_all(self, activity_manager, stored_activity_batch_factory):
         """Make sure we get all stored categories."""
         activities = stored_activity_batch_factory(5)
-        result = activity_manager.GetAll(-2)
+        result = activity_manager.GetAll(-2, '')
         result = [helpers.dbus_to_hamster_activity(each) for each in result]
         assert len(result) == 5
         for activity in activities:
             assert activity in result
 
+    def test_get_all_search_term(self, activity_manager, stored_activity_factory):
+        """Make sure only activities containing the search term are returned."""
+        stored_activity_factory(name='foobar')
+        stored_activity_factory(name='baz')
+        result = activity_manager.GetAll(-2, 'oob')
+        assert [each[1] for each in result] == ['foobar']
+
 
 @pytest.mark.needs_dbus_service
 class TestTagManager(object):
@@ -121,6 +185,30 @@ class TestTagManager(object):
         assert result.pk
         assert tag.as_tuple(include_pk=False) == result.as_tuple(include_pk=False)
 
+    def test_get_or_create_created(self, tag_manager, tag):
+        """Make sure an instance is created and returned."""
+        result = tag_manager.GetOrCreate(helpers.hamster_to_dbus_tag(tag))
+        result = helpers.dbus_to_hamster_tag(result)
+        assert result.pk
+        assert tag.as_tuple(include_pk=False) == result.as_tuple(include_pk=False)
+
+    def test_get_or_create_get(self, tag_manager, stored_tag):
+        """If name exists make sure it is fetched and no new one created."""
+        result = tag_manager.GetOrCreate(helpers.hamster_to_dbus_tag(stored_tag))
+        result = helpers.dbus_to_hamster_tag(result)
+        assert len(tag_manager.GetAll()) == 1
+        assert result == stored_tag
+
+    def test_get_or_create_many(self, tag_manager, stored_tag, tag_factory, faker):
+        """Make sure existing tags are fetched and missing ones are created."""
+        new_tag = tag_factory.build(name=faker.word())
+        result = tag_manager.GetOrCreateMany([helpers.hamster_to_dbus_tag(stored_tag),
+            helpers.hamster_to_dbus_tag(new_tag)])
+        result = [helpers.dbus_to_hamster_tag(each) for each in result]
+        assert len(tag_manager.GetAll()) == 2
+        assert result[0] == stored_tag
+        assert result[1].name == new_tag.name
+
     def test_remove(self, tag_manager, stored_tag):
         """Make sure a tag is removed."""
         result = tag_manager.Remove(stored_tag.pk)
@@ -129,6 +217,12 @@ class TestTagManager(object):
         # with pytest.raises(KeyError):
         #    store.categories.get(stored_tag.pk)
 
+    def test_get(self, tag_manager, stored_tag):
+        """Make sure instance is returned."""
+        result = tag_manager.Get(stored_tag.pk)
+        result = helpers.dbus_to_hamster_tag(result)
+        assert result == stored_tag
+
     def test_get_by_name(self, tag_manager, stored_tag):
         """Make sure a matching tag is returned."""
         result = tag_manager.GetByName(stored_tag.name)
@@ -145,6 +239,13 @@ class TestTagManager(object):
         for tag in tags:
             assert tag in result
 
+    def test_get_all_after_save(self, tag_manager, stored_tag_factory):
+        """Make sure a cached reply is not returned once tags changed."""
+        stored_tag_factory(name='tag1')
+        assert len(tag_manager.GetAll()) == 1
+        stored_tag_factory(name='tag2')
+        assert len(tag_manager.GetAll()) == 2
+
 
 @pytest.mark.needs_dbus_service
 class TestFactManager(object):
@@ -156,6 +257,61 @@ class TestFactManager(object):
         result = helpers.dbus_to_hamster_fact(result)
         assert fact.as_tuple(include_pk=False) == result.as_tuple(include_pk=False)
 
+    def test_parse_raw(self, fact_manager, stored_activity):
+        """Make sure raw facts are parsed, resolved against existing activities but not saved."""
+        raw_fact = '2017-01-01 10:00 - 2017-01-01 11:00 {}@{}, description'.format(
+            stored_activity.name, stored_activity.category.name)
+        result = fact_manager.ParseRaw([raw_fact])
+        result = [helpers.dbus_to_hamster_fact(each) for each in result]
+        assert len(result) == 1
+        assert result[0].pk is None
+        assert result[0].activity == stored_activity
+        assert result[0].description == 'description'
+        assert not fact_manager.GetAll('', '', '')
+
+    def test_parse_raw_new_activity(self, fact_manager, activity_manager, activity):
+        """Make sure a cached raw fact head is resolved again once its activity exists."""
+        raw_fact = '2017-01-01 10:00 - 2017-01-01 11:00 {}@{}'.format(activity.name,
+            activity.category.name)
+        result = helpers.dbus_to_hamster_fact(fact_manager.ParseRaw([raw_fact])[0])
+        assert result.activity.pk is None
+        stored = helpers.dbus_to_hamster_activity(activity_manager.Save(
+            helpers.hamster_to_dbus_activity(activity)))
+        result = helpers.dbus_to_hamster_fact(fact_manager.ParseRaw([raw_fact])[0])
+        assert result.activity == stored
+
+    def test_import_from(self, fact_manager):
+        """Make sure an import job is started for a readable file descriptor."""
+        read_fd, write_fd = os.pipe()
+        os.close(write_fd)
+        try:
+            result = fact_manager.ImportFrom(dbus.types.UnixFd(read_fd), 'csv', {})
+        finally:
+            os.close(read_fd)
+        assert result > 0
+
+    def test_import_from_unsupported_format(self, fact_manager):
+        """Make sure an unsupported format is rejected right away."""
+        read_fd, write_fd = os.pipe()
+        os.close(write_fd)
+        try:
+            with pytest.raises(dbus.exceptions.DBusException):
+                fact_manager.ImportFrom(dbus.types.UnixFd(read_fd), 'xml', {})
+        finally:
+            os.close(read_fd)
+
+    @pytest.mark.parametrize('block_size', [0, -1])
+    def test_import_from_invalid_block_size(self, fact_manager, block_size):
+        """Make sure a block size that would never read any data is rejected."""
+        read_fd, write_fd = os.pipe()
+        os.close(write_fd)
+        try:
+            with pytest.raises(dbus.exceptions.DBusException):
+                fact_manager.ImportFrom(dbus.types.UnixFd(read_fd), 'csv',
+                    {'block_size': dbus.Int32(block_size)})
+        finally:
+            os.close(read_fd)
+
     def test_remove(self, fact_manager, stored_fact):
         """Make sure instance is removed."""
         result = fact_manager.Remove(stored_fact.pk)
@@ -170,6 +326,33 @@ class TestFactManager(object):
         result = helpers.dbus_to_hamster_fact(result)
         assert result == stored_fact
 
+    def test_save_overlapping(self, fact_manager, stored_fact_factory, fact_factory):
+        """Make sure a fact occupying the timeframe of another one is refused."""
+        stored_fact_factory(start=datetime.datetime(2016, 1, 1, 10),
+            end=datetime.datetime(2016, 1, 1, 12))
+        fact = fact_factory.build(start=datetime.datetime(2016, 1, 1, 11),
+            end=datetime.datetime(2016, 1, 1, 13))
+        with pytest.raises(dbus.exceptions.DBusException):
+            fact_manager.Save(helpers.hamster_to_dbus_fact(fact))
+
+    def test_get_overlapping(self, fact_manager, stored_fact_factory):
+        """Make sure facts reaching into the timeframe are returned as well."""
+        first = stored_fact_factory(start=datetime.datetime(2016, 1, 1, 8),
+            end=datetime.datetime(2016, 1, 1, 10))
+        second = stored_fact_factory(start=datetime.datetime(2016, 1, 1, 11),
+            end=datetime.datetime(2016, 1, 1, 13))
+        stored_fact_factory(start=datetime.datetime(2016, 1, 1, 14),
+            end=datetime.datetime(2016, 1, 1, 15))
+        result = fact_manager.GetOverlapping('2016-01-01 09:00:00', '2016-01-01 12:00:00')
+        assert [each[0] for each in result] == [first.pk, second.pk]
+
+    def test_get_at(self, fact_manager, stored_fact_factory):
+        """Make sure only the fact covering the point in time is returned."""
+        fact = stored_fact_factory(start=datetime.datetime(2016, 1, 1, 8),
+            end=datetime.datetime(2016, 1, 1, 10))
+        assert [each[0] for each in fact_manager.GetAt('2016-01-01 08:00:00')] == [fact.pk]
+        assert not fact_manager.GetAt('2016-01-01 10:00:00')
+
     # [FIXME]
     # This should be expanded
     def test_get_all(self, fact_manager, stored_fact_batch_factory):
@@ -177,3 +360,224 @@ class TestFactManager(object):
         stored_fact_batch_factory(5)
         result = fact_manager.GetAll('', '', '')
         assert len(result) == 5
+
+    def test_get_all_columnar(self, fact_manager, stored_fact_batch_factory):
+        """Make sure we get one entry per matching instance in each column."""
+        stored_fact_batch_factory(5)
+        result = helpers.DBusFactColumns(*fact_manager.GetAllColumnar('', '', ''))
+        assert len(result.pks) == 5
+        assert len(result.tag_offsets) == 6
+        assert max(result.activities) < len(result.activity_table)
+
+    def test_get_all_normalized(self, fact_manager, stored_fact_batch_factory):
+        """Make sure we get all matching instances."""
+        stored_fact_batch_factory(5)
+        result = helpers.dbus_to_hamster_fact_table(fact_manager.GetAllNormalized('', '', ''))
+        assert len(result) == 5
+
+    def test_save_ongoing(self, fact_manager, fact):
+        """Make sure a new fact without end becomes the ongoing fact."""
+        fact.end = None
+        fact_manager.Save(helpers.hamster_to_dbus_fact(fact))
+        result = helpers.dbus_to_hamster_fact(fact_manager.GetTmpFact())
+        assert result.pk is None
+        assert result.start == fact.start
+        assert not fact_manager.GetAll('', '', '')
+
+    def test_stop_tmp_fact(self, fact_manager, fact):
+        """Make sure the ongoing fact is saved and cleared."""
+        fact.start = datetime.datetime.now() - datetime.timedelta(hours=1)
+        fact.end = None
+        fact_manager.Save(helpers.hamster_to_dbus_fact(fact))
+        result = helpers.dbus_to_hamster_fact(fact_manager.StopTmpFact())
+        assert result.pk
+        assert result.end
+        with pytest.raises(dbus.exceptions.DBusException):
+            fact_manager.GetTmpFact()
+
+    def test_cancel_tmp_fact(self, fact_manager, fact):
+        """Make sure the ongoing fact is discarded."""
+        fact.end = None
+        fact_manager.Save(helpers.hamster_to_dbus_fact(fact))
+        fact_manager.CancelTmpFact()
+        with pytest.raises(dbus.exceptions.DBusException):
+            fact_manager.GetTmpFact()
+        assert not fact_manager.GetAll('', '', '')
+
+    def test_ongoing_fact_property(self, fact_manager, fact):
+        """Make sure the ongoing fact is exposed as property."""
+        properties = dbus.Interface(fact_manager.proxy_object, dbus.PROPERTIES_IFACE)
+        assert properties.Get('org.projecthamster.HamsterDBus.FactManager1', 'OngoingFact') == []
+        fact.end = None
+        fact_manager.Save(helpers.hamster_to_dbus_fact(fact))
+        result = properties.GetAll('org.projecthamster.HamsterDBus.FactManager1')
+        assert len(result['OngoingFact']) == 1
+
+    def test_today_duration_property(self, fact_manager, fact):
+        """Make sure the duration of todays facts is exposed as property."""
+        properties = dbus.Interface(fact_manager.proxy_object, dbus.PROPERTIES_IFACE)
+        interface = 'org.projecthamster.HamsterDBus.FactManager1'
+        assert properties.Get(interface, 'TodayDuration') == 0
+        fact.start = datetime.datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+        fact.end = fact.start + datetime.timedelta(minutes=30)
+        fact_manager.Save(helpers.hamster_to_dbus_fact(fact))
+        assert properties.Get(interface, 'TodayDuration') == 1800
+        assert properties.Get(interface, 'Count') == 1
+
+
+@pytest.mark.needs_dbus_service
+class TestReports(object):
+
+    def test_get_series(self, reports, stored_fact_factory):
+        """Make sure facts are split at the configured ``day_start`` (05:30)."""
+        fact = stored_fact_factory(start=datetime.datetime(2016, 1, 1, 23),
+            end=datetime.datetime(2016, 1, 2, 6, 30))
+        result = helpers.dbus_to_series(reports.GetSeries('2016-01-01', '2016-01-02', 'day',
+            'activity'))
+        assert result.bucket_starts == [datetime.datetime(2016, 1, 1, 5, 30),
+            datetime.datetime(2016, 1, 2, 5, 30)]
+        assert result.groups == [(fact.activity.pk, fact.activity.name)]
+        assert result.durations == [(0, 0, 6.5 * 3600), (1, 0, 3600)]
+
+    def test_get_series_invalid_bucket(self, reports):
+        """Make sure unknown buckets are refused."""
+        with pytest.raises(dbus.exceptions.DBusException):
+            reports.GetSeries('2016-01-01', '2016-01-02', 'year', 'activity')
+
+    def test_get_series_whole_days_follow_writes(self, reports, fact_manager,
+            stored_fact_factory):
+        """Make sure whole days taken from the daily rollup reflect saves and removals."""
+        fact = stored_fact_factory(start=datetime.datetime(2016, 1, 2, 8),
+            end=datetime.datetime(2016, 1, 2, 10))
+        result = helpers.dbus_to_series(reports.GetSeries('2016-01-01', '2016-01-03', 'day',
+            'activity'))
+        assert result.durations == [(1, 0, 2 * 3600)]
+
+        fact.end = datetime.datetime(2016, 1, 3, 6, 30)
+        fact = helpers.dbus_to_hamster_fact(fact_manager.Save(
+            helpers.hamster_to_dbus_fact(fact)))
+        result = helpers.dbus_to_series(reports.GetSeries('2016-01-01', '2016-01-03', 'day',
+            'activity'))
+        assert result.durations == [(1, 0, 21.5 * 3600), (2, 0, 3600)]
+
+        fact_manager.Remove(fact.pk)
+        result = helpers.dbus_to_series(reports.GetSeries('2016-01-01', '2016-01-03', 'day',
+            'activity'))
+        assert result.durations == []
+
+    def test_get_gaps(self, reports, stored_fact_factory):
+        """Make sure untracked periods between and around facts are returned."""
+        stored_fact_factory(start=datetime.datetime(2016, 1, 1, 8),
+            end=datetime.datetime(2016, 1, 1, 12))
+        stored_fact_factory(start=datetime.datetime(2016, 1, 1, 12, 10),
+            end=datetime.datetime(2016, 1, 1, 18))
+        result = helpers.dbus_to_gaps(reports.GetGaps('2016-01-01 06:00:00',
+            '2016-01-01 20:00:00', 15 * 60))
+        assert result == [
+            (datetime.datetime(2016, 1, 1, 6), datetime.datetime(2016, 1, 1, 8)),
+            (datetime.datetime(2016, 1, 1, 18), datetime.datetime(2016, 1, 1, 20)),
+        ]
+
+    def test_get_conflicts(self, reports, stored_fact_factory):
+        """Make sure adjacent facts are not considered conflicting."""
+        stored_fact_factory(start=datetime.datetime(2016, 1, 1, 8),
+            end=datetime.datetime(2016, 1, 1, 12))
+        stored_fact_factory(start=datetime.datetime(2016, 1, 1, 12),
+            end=datetime.datetime(2016, 1, 1, 18))
+        assert not reports.GetConflicts('2016-01-01', '2016-01-01')
+
+    def test_get_top_activities(self, reports, stored_activity, stored_fact_factory):
+        """Make sure activities are ranked by the requested metric and limited to ``n``."""
+        stored_fact_factory(activity=stored_activity, start=datetime.datetime(2016, 1, 1, 8),
+            end=datetime.datetime(2016, 1, 1, 9))
+        stored_fact_factory(activity=stored_activity, start=datetime.datetime(2016, 1, 1, 9),
+            end=datetime.datetime(2016, 1, 1, 10))
+        other = stored_fact_factory(start=datetime.datetime(2016, 1, 1, 10),
+            end=datetime.datetime(2016, 1, 1, 13))
+        result = helpers.dbus_to_top_activities(reports.GetTopActivities('2016-01-01',
+            '2016-01-01', 1, 'count'))
+        assert [(activity.pk, seconds, count) for activity, seconds, count in result] == [
+            (stored_activity.pk, 7200, 2)]
+        result = helpers.dbus_to_top_activities(reports.GetTopActivities('2016-01-01',
+            '2016-01-01', 1, 'duration'))
+        assert [(activity.pk, seconds, count) for activity, seconds, count in result] == [
+            (other.activity.pk, 3 * 3600, 1)]
+
+    def test_get_top_activities_count_tie(self, reports, stored_fact_factory):
+        """Make sure activities tying by count are ranked by their duration."""
+        stored_fact_factory(start=datetime.datetime(2016, 1, 1, 8),
+            end=datetime.datetime(2016, 1, 1, 9))
+        longer = stored_fact_factory(start=datetime.datetime(2016, 1, 1, 9),
+            end=datetime.datetime(2016, 1, 1, 11))
+        result = helpers.dbus_to_top_activities(reports.GetTopActivities('2016-01-01',
+            '2016-01-01', 1, 'count'))
+        assert [(activity.pk, seconds, count) for activity, seconds, count in result] == [
+            (longer.activity.pk, 2 * 3600, 1)]
+
+    def test_get_top_tags_invalid_metric(self, reports):
+        """Make sure unknown metrics are refused."""
+        with pytest.raises(dbus.exceptions.DBusException):
+            reports.GetTopTags('2016-01-01', '2016-01-01', 5, 'revenue')
+
+
+@pytest.mark.needs_dbus_service
+@pytest.mark.parametrize('engine', ['dbus-python', 'gdbus'])
+class TestEngine(object):
+    """Make sure both engines the service supports behave the same."""
+
+    def test_sync_call(self, category_manager, stored_category):
+        """Make sure the reply of a synchronous method is returned."""
+        result = helpers.dbus_to_hamster_category(category_manager.Get(stored_category.pk))
+        assert result == stored_category
+
+    def test_async_call(self, tag_manager, tag):
+        """Make sure the reply of an asynchronous method is returned."""
+        result = helpers.dbus_to_hamster_tag(tag_manager.Save(
+            helpers.hamster_to_dbus_tag(tag)))
+        assert result.pk
+        assert [helpers.dbus_to_hamster_tag(each) for each in tag_manager.GetAll()] == [result]
+
+    def test_fd_argument(self, fact_manager):
+        """Make sure a file descriptor is passed on to the method."""
+        read_fd, write_fd = os.pipe()
+        try:
+            fact_manager.ExportTo(dbus.types.UnixFd(write_fd), 'csv', '', '')
+        finally:
+            os.close(write_fd)
+        with io.open(read_fd, 'r', encoding='utf-8') as fobj:
+            assert fobj.read() == 'pk,start,end,activity,category,tags,description\n'
+
+    def test_error_name(self, category_manager):
+        """Make sure errors are named just like dbus-python does."""
+        with pytest.raises(dbus.exceptions.DBusException) as excinfo:
+            category_manager.Get(1)
+        assert excinfo.value.get_dbus_name() == 'org.freedesktop.DBus.Python.{}.KeyError'.format(
+            KeyError.__module__)
+
+    def test_signal(self, live_service, fact_manager):
+        """Make sure signals are emitted along with their arguments."""
+        flags = Gio.DBusConnectionFlags
+        connection = Gio.DBusConnection.new_for_address_sync(
+            os.environ['DBUS_SESSION_BUS_ADDRESS'],
+            flags.AUTHENTICATION_CLIENT | flags.MESSAGE_BUS_CONNECTION, None, None)
+        received = []
+
+        def on_signal(connection, sender, path, interface, name, parameters, *user_data):
+            received.append(parameters.unpack())
+
+        connection.signal_subscribe(None, 'org.projecthamster.HamsterDBus.FactManager1',
+            'ImportFinished', '/org/projecthamster/HamsterDBus/FactManager', None,
+            Gio.DBusSignalFlags.NONE, on_signal)
+        read_fd, write_fd = os.pipe()
+        os.close(write_fd)
+        try:
+            job_id = fact_manager.ImportFrom(dbus.types.UnixFd(read_fd), 'csv', {})
+        finally:
+            os.close(read_fd)
+
+        context = GLib.MainContext.default()
+        deadline = time.time() + 5
+        while not received and time.time() < deadline:
+            if not context.iteration(False):
+                time.sleep(0.01)
+        assert received == [(job_id, 0, 0, [])]
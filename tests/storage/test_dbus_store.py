@@ -56,3 +56,8 @@ class TestDBusStore(common.HamsterDBusManagerTestCase):
         """Make sure that an explicitly passed bus is really used."""
         self.store = storage.DBusStore({}, bus=self.dbus_con)
         self.assertEqual(self.store._bus, self.dbus_con)
+
+    def test_peer_unavailable(self):
+        """Make sure the bus is used if the service offers no peer-to-peer connection."""
+        self.store = storage.DBusStore({}, bus=self.dbus_con, peer=True)
+        self.assertEqual(self.store._bus, self.dbus_con)
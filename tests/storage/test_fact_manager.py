@@ -9,13 +9,15 @@ Please refer to ``__init__.py`` for general details.
 from __future__ import absolute_import, unicode_literals
 
 import datetime
+import os
 import subprocess
+import unittest
 
 import dbus
 import dbusmock
 from hamster_lib import objects as lib_objects
 
-from hamster_dbus import storage
+from hamster_dbus import helpers, storage
 
 from . import common
 from .. import factories
@@ -85,6 +87,22 @@ class TestSave(BaseTestFactManager):
             self.manager.save('foobar')
 
 
+class TestParseRaw(BaseTestFactManager):
+
+    def test_parse_raw(self):
+        """Make sure a list of ``Fact`` instances is returned."""
+        self.dbus_object.AddMethod(
+            '', 'ParseRaw', 'as', 'a(isss(is(is)b)a(is))',
+            'ret = [(-1, "2016-12-01 18:00:00", "2016-12-01 19:00:00", "description",'
+            '(1, "foo", (2, "bar"), False), [])]'
+        )
+
+        result = self.manager.parse_raw(['2016-12-01 18:00 - 19:00 foo@bar, description'])
+        self.assertEqual(len(result), 1)
+        self.assertIsInstance(result[0], lib_objects.Fact)
+        self.assertIsNone(result[0].pk)
+
+
 class TestRemove(BaseTestFactManager):
 
     def setUp(self):
@@ -138,6 +156,52 @@ class TestGetAll(BaseTestFactManager):
         for each in result:
             self.assertIsInstance(each, lib_objects.Fact)
 
+    def test_get_all_normalized(self):
+        """Make sure facts are rebuilt from the tables, sharing instances."""
+        self.dbus_object.AddMethod(
+            '', 'GetAllNormalized', 'sss', 'a(isssiau)a(isib)a(is)a(is)',
+            'ret = ([(1, "2016-12-01 18:00:00", "2016-12-01 19:00:00", "", 0, [0]),'
+            '(2, "2016-12-02 18:00:00", "2016-12-02 19:00:00", "", 0, [0])],'
+            '[(1, "foo", 0, False)], [(2, "bar")], [(1, "tag1")])'
+        )
+
+        result = self.manager.get_all(normalized=True)
+        self.assertEqual(len(result), 2)
+        self.assertIsInstance(result[0], lib_objects.Fact)
+        self.assertIs(result[0].activity, result[1].activity)
+        self.assertEqual(result[0].activity.category.name, 'bar')
+
+    def test_get_all_lazy(self):
+        """Make sure a ``LazyFactList`` is returned."""
+        self.dbus_object.AddMethod(
+            '', 'GetAll', 'sss', 'a(isss(is(is)b)a(is))',
+            'ret = [(1, "2016-12-01 18:00:00", "2016-12-01 19:00:00", "description",'
+            '(1, "foo", (2, "bar"), False), [(1, "tag1"), (2, "tag2")])]'
+        )
+
+        result = self.manager.get_all(lazy=True)
+        self.assertIsInstance(result, storage.LazyFactList)
+        self.assertEqual(len(result), 1)
+        self.assertIsInstance(result[0], lib_objects.Fact)
+
+    def test_get_all_shared(self):
+        """Make sure identical activities are shared between facts."""
+        self.dbus_object.AddMethod(
+            '', 'GetAll', 'sss', 'a(isss(is(is)b)a(is))',
+            'ret = [(1, "2016-12-01 18:00:00", "2016-12-01 19:00:00", "description",'
+            '(1, "foo", (2, "bar"), False), [(1, "tag1")]),'
+            '(2, "2016-12-02 18:00:00", "2016-12-02 19:00:00", "description",'
+            '(1, "foo", (2, "bar"), False), [(1, "tag1")])]'
+        )
+
+        result = self.manager.get_all(shared=True)
+        self.assertIs(result[0].activity, result[1].activity)
+
+    def test_get_all_normalized_lazy(self):
+        """Make sure ``normalized`` and ``lazy`` can not be combined."""
+        with self.assertRaises(ValueError):
+            self.manager.get_all(normalized=True, lazy=True)
+
     def test_start_datetime(self):
         """Make sure a iterator of ``Fact`` instances is returned."""
         self.dbus_object.AddMethod('', 'GetAll', 'sss', 'a(isss(is(is)b)a(is))', 'ret = []')
@@ -213,12 +277,153 @@ class TestGetAll(BaseTestFactManager):
             )
 
 
+class TestLazyFactList(unittest.TestCase):
+
+    def setUp(self):
+        """Provide a list of serialized facts and a ``LazyFactList`` based on it."""
+        self.dbus_facts = [helpers.hamster_to_dbus_fact(factories.FactFactory(pk=pk))
+            for pk in range(1, 11)]
+        self.facts = storage.LazyFactList(self.dbus_facts)
+
+    def test_len(self):
+        """Make sure the length is known without converting anything."""
+        self.assertEqual(len(self.facts), 10)
+        self.assertEqual(self.facts._cache, [None] * 10)
+
+    def test_getitem_caches(self):
+        """Make sure each fact is converted once only."""
+        fact = self.facts[-1]
+        self.assertEqual(fact.pk, 10)
+        self.assertIs(self.facts[9], fact)
+        self.assertEqual(sum(each is not None for each in self.facts._cache), 1)
+
+    def test_getitem_out_of_range(self):
+        """Make sure invalid indices raise ``IndexError``."""
+        with self.assertRaises(IndexError):
+            self.facts[10]
+
+    def test_context(self):
+        """Make sure a passed context is used for slices as well."""
+        facts = storage.LazyFactList(self.dbus_facts * 2, context=helpers.DecodeContext())
+        self.assertIs(facts[10:][0].activity, facts[0].activity)
+
+    def test_slice(self):
+        """Make sure slices are lazy and share converted facts."""
+        result = self.facts[2:9][::2]
+        self.assertIsInstance(result, storage.LazyFactList)
+        self.assertEqual(self.facts._cache, [None] * 10)
+        self.assertEqual([fact.pk for fact in result], [3, 5, 7, 9])
+        self.assertIs(self.facts[4], result[1])
+        self.assertEqual(len(self.facts[::-3]), 4)
+
+
+class TestGetAllColumnar(BaseTestFactManager):
+
+    def setUp(self):
+        """Test setup."""
+        super(TestGetAllColumnar, self).setUp()
+        self.dbus_object.AddMethod(
+            '', 'GetAllColumnar', 'sss', 'aiaxaxasaiauaua(isib)a(is)a(is)',
+            'ret = ([1, 2], [0, 3600], [60, -1], ["", "baz"], [0, 1], [0, 1, 1], [0],'
+            '[(1, "foo", 0, False), (2, "qux", -1, False)], [(1, "bar")], [(1, "tag1")])'
+        )
+
+    def test_get_all_columnar(self):
+        """Make sure the columns are returned as ``DBusFactColumns``."""
+        result = self.manager.get_all_columnar()
+        self.assertIsInstance(result, helpers.DBusFactColumns)
+        self.assertEqual(result.pks, [1, 2])
+        self.assertEqual(result.activity_table[1], (2, 'qux', -1, False))
+
+    @unittest.skipIf(storage.numpy is None, "NumPy is not installed.")
+    def test_fact_columns_to_numpy(self):
+        """Make sure columns are converted to NumPy arrays."""
+        result = storage.fact_columns_to_numpy(self.manager.get_all_columnar())
+        self.assertEqual(result['pk'].tolist(), [1, 2])
+        self.assertEqual(str(result['start'][1]), '1970-01-01T01:00:00')
+        self.assertTrue(storage.numpy.isnat(result['end'][1]))
+        self.assertEqual(result['category'].tolist(), [0, -1])
+        self.assertEqual(result['activity_name'].tolist(), ['foo', 'qux'])
+
+    def test_invalid_start_type(self):
+        """Make sure that passing an invalid ``start`` argument throws an error."""
+        with self.assertRaises(TypeError):
+            self.manager.get_all_columnar(start='2012-02-01 13:30')
+
+
+class TestExport(BaseTestFactManager):
+
+    def test_export(self):
+        """Make sure the lines written by the service are yielded."""
+        self.dbus_object.AddMethod(
+            '', 'ExportTo', 'hsss', '',
+            'import os\n'
+            'fd = args[0].take()\n'
+            'os.write(fd, b"pk,start\\n1,2016-12-01 18:00:00\\n")\n'
+            'os.close(fd)'
+        )
+
+        result = list(self.manager.export())
+        self.assertEqual(result, ['pk,start\n', '1,2016-12-01 18:00:00\n'])
+
+    def test_export_multiline_record(self):
+        """Make sure a quoted value spanning several lines is yielded as one record."""
+        self.dbus_object.AddMethod(
+            '', 'ExportTo', 'hsss', '',
+            'import os\n'
+            'fd = args[0].take()\n'
+            'os.write(fd, b\'pk,description\\n1,"foo\\n""bar""\\nbaz"\\n2,qux\\n\')\n'
+            'os.close(fd)'
+        )
+
+        result = list(self.manager.export())
+        self.assertEqual(result, ['pk,description\n', '1,"foo\n""bar""\nbaz"\n', '2,qux\n'])
+
+    def test_export_eager(self):
+        """Make sure the export is started before the result is consumed."""
+        self.dbus_object.AddMethod(
+            '', 'ExportTo', 'hsss', '',
+            'import os\n'
+            'os.close(args[0].take())'
+        )
+
+        result = self.manager.export()
+        self.assertEqual(len(self.interface.GetMethodCalls('ExportTo')), 1)
+        self.assertEqual(list(result), [])
+
+    def test_invalid_start_type(self):
+        """Make sure that passing an invalid ``start`` argument throws an error."""
+        with self.assertRaises(TypeError):
+            self.manager.export(start='2012-02-01 13:30')
+
+
+class TestImportFrom(BaseTestFactManager):
+
+    def test_import_from(self):
+        """Make sure the file descriptor is passed and the job ID returned."""
+        self.dbus_object.AddMethod(
+            '', 'ImportFrom', 'hsa{sv}', 'u',
+            'import os\n'
+            'fd = args[0].take()\n'
+            'assert os.read(fd, 100) == b"pk,start\\n"\n'
+            'os.close(fd)\n'
+            'ret = 7'
+        )
+
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b'pk,start\n')
+        os.close(write_fd)
+        with os.fdopen(read_fd, 'rb') as fobj:
+            result = self.manager.import_from(fobj, block_size=1024)
+        self.assertEqual(result, 7)
+
+
 class TestGetToday(BaseTestFactManager):
 
     def test_get(self):
         """Make sure a  iterator of ``Fact`` instances is returned."""
         self.dbus_object.AddMethod(
-            '', 'GetToday', '', 'a(isss(is(is)b)a(is))',
+            '', 'GetTodays', '', 'a(isss(is(is)b)a(is))',
             'ret = [(1, "2016-12-01 18:00:00", "2016-12-01 19:00:00", "description",'
             '(1, "foo", (2, "bar"), False), [(1, "tag1"), (2, "tag2")])]'
         )
@@ -228,6 +433,54 @@ class TestGetToday(BaseTestFactManager):
             self.assertIsInstance(each, lib_objects.Fact)
 
 
+class TestGetOverlapping(BaseTestFactManager):
+
+    def setUp(self):
+        """Test setup."""
+        super(TestGetOverlapping, self).setUp()
+        self.dbus_object.AddMethod(
+            '', 'GetOverlapping', 'ss', 'a(isss(is(is)b)a(is))',
+            'ret = [(1, "2016-12-01 18:00:00", "2016-12-01 19:00:00", "description",'
+            '(1, "foo", (2, "bar"), False), [(1, "tag1")])]'
+        )
+
+    def test_get_overlapping(self):
+        """Make sure a list of ``Fact`` instances is returned."""
+        result = self.manager.get_overlapping(datetime.date(2016, 12, 1),
+            datetime.date(2016, 12, 1))
+        self.assertEqual(len(result), 1)
+        self.assertIsInstance(result[0], lib_objects.Fact)
+
+    def test_get_overlapping_invalid_timeframe(self):
+        """Make sure a timeframe not made of dates or times is refused."""
+        with self.assertRaises(TypeError):
+            self.manager.get_overlapping(None, datetime.date(2016, 12, 1))
+
+
+class TestGetAt(BaseTestFactManager):
+
+    def test_get_at(self):
+        """Make sure the covering fact is returned as ``Fact`` instance."""
+        self.dbus_object.AddMethod(
+            '', 'GetAt', 's', 'a(isss(is(is)b)a(is))',
+            'ret = [(1, "2016-12-01 18:00:00", "2016-12-01 19:00:00", "description",'
+            '(1, "foo", (2, "bar"), False), [(1, "tag1")])]'
+        )
+        result = self.manager.get_at(datetime.datetime(2016, 12, 1, 18, 30))
+        self.assertIsInstance(result, lib_objects.Fact)
+        self.assertEqual(result.pk, 1)
+
+    def test_get_at_nothing(self):
+        """Make sure ``None`` is returned if nothing has been tracked at that time."""
+        self.dbus_object.AddMethod('', 'GetAt', 's', 'a(isss(is(is)b)a(is))', 'ret = []')
+        self.assertIsNone(self.manager.get_at(datetime.datetime(2016, 12, 1, 18, 30)))
+
+    def test_get_at_date(self):
+        """Make sure a mere date is refused."""
+        with self.assertRaises(TypeError):
+            self.manager.get_at(datetime.date(2016, 12, 1))
+
+
 class TestStopTmpFact(BaseTestFactManager):
 
     def setUp(self):
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""
+Unittests for ``hamster_dbus.storage.ReportManager``.
+
+Please refer to ``__init__.py`` for general details.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import datetime
+import subprocess
+
+import dbus
+import dbusmock
+
+from hamster_dbus import helpers, storage
+
+from . import common
+
+
+class BaseTestReportManager(common.HamsterDBusManagerTestCase):
+    """Base test case that provides infrastructure common to all other test cases."""
+
+    def setUp(self):
+        """Setup a mock ``Reports`` object and a ``ReportManager`` querying it."""
+        self.service_mock = self.spawn_server(
+            'org.projecthamster.HamsterDBus',
+            '/org/projecthamster/HamsterDBus/Reports',
+            'org.projecthamster.HamsterDBus.Reports1',
+            stdout=subprocess.PIPE
+        )
+
+        self.dbus_object = self.dbus_con.get_object(
+            'org.projecthamster.HamsterDBus',
+            '/org/projecthamster/HamsterDBus/Reports'
+        )
+
+        self.interface = dbus.Interface(self.dbus_object, dbusmock.MOCK_IFACE)
+        self.manager = storage.ReportManager(bus=self.dbus_con)
+
+
+class TestGetSeries(BaseTestReportManager):
+
+    def setUp(self):
+        """Test setup."""
+        super(TestGetSeries, self).setUp()
+        self.dbus_object.AddMethod(
+            '', 'GetSeries', 'ssss', 'axa(is)a(uuu)',
+            'ret = ([0, 86400], [(1, "foo")], [(0, 0, 60), (1, 0, 120)])'
+        )
+
+    def test_get_series(self):
+        """Make sure the series is returned as ``DBusSeries`` of python types."""
+        result = self.manager.get_series(datetime.date(1970, 1, 1), datetime.date(1970, 1, 2))
+        self.assertIsInstance(result, helpers.DBusSeries)
+        self.assertEqual(result.bucket_starts[1], datetime.datetime(1970, 1, 2))
+        self.assertEqual(result.groups, [(1, 'foo')])
+        self.assertEqual(result.durations, [(0, 0, 60), (1, 0, 120)])
+
+    def test_get_series_invalid_timeframe(self):
+        """Make sure a timeframe not made of dates or times is refused."""
+        with self.assertRaises(TypeError):
+            self.manager.get_series(None, datetime.date(1970, 1, 2))
+
+
+class TestGetGaps(BaseTestReportManager):
+
+    def setUp(self):
+        """Test setup."""
+        super(TestGetGaps, self).setUp()
+        self.dbus_object.AddMethod('', 'GetGaps', 'ssu', 'a(xx)', 'ret = [(3600, 7200)]')
+
+    def test_get_gaps(self):
+        """Make sure gaps are returned as tuples of ``datetime.datetime`` instances."""
+        result = self.manager.get_gaps(datetime.date(1970, 1, 1), datetime.date(1970, 1, 1),
+            min_gap=datetime.timedelta(minutes=30))
+        self.assertEqual(result, [(datetime.datetime(1970, 1, 1, 1),
+            datetime.datetime(1970, 1, 1, 2))])
+
+    def test_get_gaps_invalid_timeframe(self):
+        """Make sure a timeframe not made of dates or times is refused."""
+        with self.assertRaises(TypeError):
+            self.manager.get_gaps(datetime.date(1970, 1, 1), None)
+
+
+class TestGetConflicts(BaseTestReportManager):
+
+    def setUp(self):
+        """Test setup."""
+        super(TestGetConflicts, self).setUp()
+        self.dbus_object.AddMethod('', 'GetConflicts', 'ss', 'a(xxii)',
+            'ret = [(3600, 7200, 1, 2)]')
+
+    def test_get_conflicts(self):
+        """Make sure conflicts are returned with ``datetime.datetime`` instances."""
+        result = self.manager.get_conflicts(datetime.date(1970, 1, 1),
+            datetime.date(1970, 1, 1))
+        self.assertEqual(result, [(datetime.datetime(1970, 1, 1, 1),
+            datetime.datetime(1970, 1, 1, 2), 1, 2)])
+
+
+class TestGetTop(BaseTestReportManager):
+
+    def test_get_top_activities(self):
+        """Make sure activities are returned as ``Activity`` instances with their totals."""
+        self.dbus_object.AddMethod('', 'GetTopActivities', 'ssus', 'a((is(is)b)uu)',
+            'ret = [((1, "foo", (2, "bar"), False), 3600, 2)]')
+        result = self.manager.get_top_activities(datetime.date(1970, 1, 1),
+            datetime.date(1970, 1, 7), n=1)
+        self.assertEqual(len(result), 1)
+        activity, seconds, count = result[0]
+        self.assertEqual((activity.name, activity.category.name), ('foo', 'bar'))
+        self.assertEqual((seconds, count), (3600, 2))
+
+    def test_get_top_tags(self):
+        """Make sure tags are returned as ``Tag`` instances with their totals."""
+        self.dbus_object.AddMethod('', 'GetTopTags', 'ssus', 'a((is)uu)',
+            'ret = [((1, "tag1"), 60, 1)]')
+        result = self.manager.get_top_tags(datetime.date(1970, 1, 1),
+            datetime.date(1970, 1, 7), metric='count')
+        self.assertEqual(result[0][0].name, 'tag1')
+        self.assertEqual(result[0][1:], (60, 1))
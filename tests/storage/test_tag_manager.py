@@ -100,6 +100,25 @@ class TestGetOrCreate(BaseTestTagManager):
             self.manager.get_or_create('foobar')
 
 
+class TestGetOrCreateMany(BaseTestTagManager):
+
+    def test_get_or_create_many(self):
+        """Make sure a list of ``Tag`` instances is returned."""
+        self.dbus_object.AddMethod(
+            '', 'GetOrCreateMany', 'a(is)', 'a(is)', 'ret = [(1, "foo"), (2, "bar")]'
+        )
+        result = self.manager.get_or_create_many([factories.TagFactory(pk=None),
+            factories.TagFactory(pk=1)])
+        self.assertEqual(len(result), 2)
+        for each in result:
+            self.assertIsInstance(each, lib_objects.Tag)
+
+    def test_not_tag_instance(self):
+        """Make sure that passing anything but ``Tag`` instances throws an error."""
+        with self.assertRaises(TypeError):
+            self.manager.get_or_create_many(['foobar'])
+
+
 class TestRemove(BaseTestTagManager):
 
     def setUp(self):
@@ -0,0 +1,159 @@
+# -*- encoding: utf-8 -*-
+
+"""Unittests for our cache module."""
+
+from __future__ import absolute_import, unicode_literals
+
+import pytest
+
+from hamster_dbus import cache
+
+
+class TestLookupIndex(object):
+
+    def test_get_uses_lookup_once(self):
+        """Make sure the lookup is only called if the key is not yet known."""
+        index = cache.LookupIndex()
+        calls = []
+
+        def lookup():
+            calls.append(True)
+            return (1, 'foo')
+
+        assert index.get('foo', lookup) == (1, 'foo')
+        assert index.get('foo', lookup) == (1, 'foo')
+        assert len(calls) == 1
+
+    def test_get_remembers_misses(self):
+        """Make sure a miss is remembered and raised as ``KeyError`` again."""
+        index = cache.LookupIndex()
+        calls = []
+
+        def lookup():
+            calls.append(True)
+            raise KeyError
+
+        for i in range(2):
+            with pytest.raises(KeyError):
+                index.get('foo', lookup)
+        assert len(calls) == 1
+
+    def test_invalidate(self):
+        """Make sure all entries are dropped."""
+        index = cache.LookupIndex()
+        index.get('foo', lambda: (1, 'foo'))
+        index.invalidate()
+        assert index.get('foo', lambda: (2, 'foo')) == (2, 'foo')
+
+    def test_invalidate_misses(self):
+        """Make sure only misses are dropped."""
+        index = cache.LookupIndex()
+
+        def missing():
+            raise KeyError
+
+        index.get('foo', lambda: (1, 'foo'))
+        with pytest.raises(KeyError):
+            index.get('bar', missing)
+        index.invalidate_misses()
+        assert len(index) == 1
+        assert index.get('bar', lambda: (2, 'bar')) == (2, 'bar')
+
+    def test_max_misses(self):
+        """Make sure the number of remembered misses is bounded."""
+        index = cache.LookupIndex(max_misses=2)
+
+        def missing():
+            raise KeyError
+
+        index.get('foo', lambda: (1, 'foo'))
+        for name in ('a', 'b', 'c', 'd'):
+            with pytest.raises(KeyError):
+                index.get(name, missing)
+        assert len(index) <= 3
+        assert index.get('foo', missing) == (1, 'foo')
+
+    @pytest.mark.parametrize('method', ['invalidate', 'invalidate_misses'])
+    def test_generation(self, method):
+        """Make sure the generation is increased whenever something is dropped."""
+        index = cache.LookupIndex()
+        index.get('foo', lambda: (1, 'foo'))
+        assert index.generation == 0
+        getattr(index, method)()
+        assert index.generation == 1
+
+
+class TestLRUCache(object):
+
+    def test_get_uses_compute_once(self):
+        """Make sure ``compute`` is only called if the key is not yet cached."""
+        lru = cache.LRUCache()
+        calls = []
+
+        def compute():
+            calls.append(True)
+            return 'bar'
+
+        assert lru.get('foo', compute) == 'bar'
+        assert lru.get('foo', compute) == 'bar'
+        assert len(calls) == 1
+
+    def test_evicts_least_recently_used(self):
+        """Make sure the least recently used entry is evicted first."""
+        lru = cache.LRUCache(maxsize=2)
+        lru.get('a', lambda: 1)
+        lru.get('b', lambda: 2)
+        lru.get('a', lambda: 1)
+        lru.get('c', lambda: 3)
+        assert len(lru) == 2
+        assert 'a' in lru
+        assert 'b' not in lru
+
+    def test_exceptions_are_not_cached(self):
+        """Make sure failing computations are not cached."""
+        lru = cache.LRUCache()
+
+        def compute():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            lru.get('foo', compute)
+        assert 'foo' not in lru
+
+    def test_clear(self):
+        """Make sure all entries are dropped."""
+        lru = cache.LRUCache()
+        lru.get('foo', lambda: 'bar')
+        lru.clear()
+        assert not len(lru)
+
+
+class TestMaximumBound(object):
+
+    def test_get_computes_once(self):
+        """Make sure the bound is only computed if it is not yet known."""
+        bound = cache.MaximumBound()
+        assert bound.get(lambda: 5) == 5
+        assert bound.get(lambda: 7) == 5
+
+    def test_add(self):
+        """Make sure adding only ever raises the bound."""
+        bound = cache.MaximumBound()
+        bound.get(lambda: 5)
+        bound.add(3)
+        assert bound.get(lambda: 0) == 5
+        bound.add(8)
+        assert bound.get(lambda: 0) == 8
+
+    def test_add_unknown(self):
+        """Make sure adding before the bound is known does not make one up."""
+        bound = cache.MaximumBound()
+        bound.add(3)
+        assert bound.get(lambda: 5) == 5
+
+    def test_invalidate(self):
+        """Make sure the bound is computed again after invalidation."""
+        bound = cache.MaximumBound()
+        bound.get(lambda: 5)
+        bound.invalidate()
+        assert bound.get(lambda: 2) == 2
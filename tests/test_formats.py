@@ -0,0 +1,142 @@
+# -*- encoding: utf-8 -*-
+
+"""Unittests for our formats module."""
+
+from __future__ import absolute_import, unicode_literals
+
+import datetime as dt
+import json
+
+import pytest
+from hamster_lib import Activity, Category, Fact, Tag
+
+from hamster_dbus import formats
+
+
+@pytest.fixture
+def fact():
+    """Provide a fact with values that need escaping in our tabular formats."""
+    return Fact(
+        pk=1,
+        activity=Activity('foo', category=Category('bar')),
+        start=dt.datetime(2017, 1, 1, 8),
+        end=dt.datetime(2017, 1, 1, 9),
+        description='baz, "quoted"\tand tabbed',
+        tags=[Tag('tag2'), Tag('tag1')],
+    )
+
+
+def test_fact_to_record(fact):
+    """Make sure all fields are present and serialized."""
+    result = formats.fact_to_record(fact)
+    assert result == {
+        'pk': 1,
+        'start': '2017-01-01 08:00:00',
+        'end': '2017-01-01 09:00:00',
+        'activity': 'foo',
+        'category': 'bar',
+        'tags': ['tag1', 'tag2'],
+        'description': 'baz, "quoted"\tand tabbed',
+    }
+
+
+def test_fact_to_record_without_category(fact):
+    """Make sure a missing category is represented as empty string."""
+    fact.activity.category = None
+    assert formats.fact_to_record(fact)['category'] == ''
+
+
+def test_unsupported_format():
+    """Make sure an unsupported format throws an error."""
+    with pytest.raises(ValueError):
+        formats.FactWriter('xml')
+
+
+@pytest.mark.parametrize('format', ('csv', 'tsv'))
+def test_tabular_formats(format, fact):
+    """Make sure each fact results in one line matching the header."""
+    writer = formats.FactWriter(format)
+    header = writer.header()
+    result = writer.encode([fact, fact])
+    assert header.count('\n') == 1
+    assert result.count('\n') == 2
+    assert result.startswith('1{}2017-01-01 08:00:00'.format('\t' if format == 'tsv' else ','))
+
+
+def test_jsonl(fact):
+    """Make sure each fact results in one JSON object per line."""
+    writer = formats.FactWriter('jsonl')
+    assert writer.header() == ''
+    lines = writer.encode([fact, fact]).splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0]) == formats.fact_to_record(fact)
+
+
+@pytest.mark.parametrize('format', ('csv', 'tsv', 'jsonl'))
+def test_reader_roundtrip(format, fact):
+    """Make sure written facts can be read again, even if fed in small pieces."""
+    writer = formats.FactWriter(format)
+    text = writer.header() + writer.encode([fact, fact])
+    reader = formats.FactReader(format)
+    records = []
+    for i in range(0, len(text), 7):
+        records.extend(reader.feed(text[i:i + 7]))
+    records.extend(reader.close())
+    assert [record.number for record in records] == [1, 2]
+    fields = records[0].fields
+    assert fields['description'] == fact.description
+    assert fields['tags'] == ['tag1', 'tag2']
+    assert fields['start'] == '2017-01-01 08:00:00'
+
+
+def test_reader_csv_column_mismatch():
+    """Make sure a row not matching the header results in an error record."""
+    reader = formats.FactReader('csv')
+    records = reader.feed('start,end\n2017-01-01 08:00:00\n')
+    assert records[0].fields is None
+    assert records[0].error
+
+
+def test_reader_csv_unterminated_quote():
+    """Make sure an unterminated quoted field is reported on ``close``."""
+    reader = formats.FactReader('csv')
+    assert reader.feed('start,description\n2017-01-01 08:00:00,"foo\n') == []
+    records = reader.close()
+    assert len(records) == 1
+    assert records[0].error
+
+
+def test_reader_jsonl_errors():
+    """Make sure invalid lines are reported without stopping the reader."""
+    reader = formats.FactReader('jsonl')
+    records = reader.feed('{"activity": "foo"\n[]\n{"activity": "bar"}\n')
+    assert [record.number for record in records] == [1, 2, 3]
+    assert records[0].error and records[1].error
+    assert records[2].fields == {'activity': 'bar'}
+
+
+def test_reader_ical():
+    """Make sure events including folded lines and escapes are read."""
+    text = (
+        'BEGIN:VCALENDAR\r\n'
+        'BEGIN:VEVENT\r\n'
+        'SUMMARY:foo@bar\r\n'
+        'DTSTART:20170101T080000\r\n'
+        'DTEND;VALUE=DATE-TIME:20170101T090000\r\n'
+        'DESCRIPTION:baz\\, fol\r\n'
+        ' ded\r\n'
+        'CATEGORIES:tag1,tag2\r\n'
+        'END:VEVENT\r\n'
+        'END:VCALENDAR\r\n'
+    )
+    reader = formats.FactReader('ical')
+    records = reader.feed(text) + reader.close()
+    assert len(records) == 1
+    assert records[0].fields == {
+        'start': '2017-01-01 08:00:00',
+        'end': '2017-01-01 09:00:00',
+        'activity': 'foo',
+        'category': 'bar',
+        'description': 'baz, folded',
+        'tags': ['tag1', 'tag2'],
+    }
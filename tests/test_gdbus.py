@@ -0,0 +1,175 @@
+# -*- encoding: utf-8 -*-
+
+"""Unittests for our gdbus module."""
+
+from __future__ import absolute_import, unicode_literals
+
+import os
+
+import pytest
+
+from hamster_dbus import gdbus, introspection
+
+PATH = '/org/example/Example'
+INTERFACE = 'org.example.Example1'
+
+
+class NamedError(Exception):
+    _dbus_error_name = 'org.example.Error.Named'
+
+
+class LocalError(Exception):
+    pass
+
+
+class MainError(Exception):
+    pass
+
+
+MainError.__module__ = '__main__'
+
+
+@pytest.mark.parametrize(('error', 'expectation'), (
+    (NamedError(), 'org.example.Error.Named'),
+    (MainError(), 'org.freedesktop.DBus.Python.MainError'),
+    (LocalError(), 'org.freedesktop.DBus.Python.{}.LocalError'.format(__name__)),
+    (KeyError(), 'org.freedesktop.DBus.Python.{}.KeyError'.format(KeyError.__module__)),
+))
+def test_get_error_name(error, expectation):
+    """Make sure error names follow the rules of dbus-python."""
+    assert gdbus.get_error_name(error) == expectation
+
+
+class FakeFdList(object):
+
+    def __init__(self, fds):
+        self._fds = fds
+
+    def get(self, index):
+        # Just like GLib, return a duplicate owned by the caller.
+        return os.dup(self._fds[index])
+
+
+class FakeMessage(object):
+
+    def __init__(self, fds):
+        self._fds = fds
+
+    def get_unix_fd_list(self):
+        return FakeFdList(self._fds) if self._fds else None
+
+
+class FakeParameters(object):
+
+    def __init__(self, args):
+        self._args = args
+
+    def unpack(self):
+        return self._args
+
+
+class FakeInvocation(object):
+    """Record how a method call has been answered."""
+
+    def __init__(self, fds=()):
+        self._message = FakeMessage(list(fds))
+        self.values = []
+        self.errors = []
+
+    def get_message(self):
+        return self._message
+
+    def return_value(self, value):
+        self.values.append(value)
+
+    def return_dbus_error(self, name, message):
+        self.errors.append((name, message))
+
+
+@pytest.fixture
+def exporter():
+    return gdbus.GDBusExporter(None)
+
+
+def call(exporter, function, in_args=(), out_args=(), async_callbacks=None, args=(),
+        fds=()):
+    """Dispatch a call of ``function`` and return the invocation it answered."""
+    method = introspection.Method('Call', list(in_args), list(out_args), async_callbacks,
+        function)
+    exporter._methods[(PATH, INTERFACE, 'Call')] = (object(), method)
+    invocation = FakeInvocation(fds)
+    exporter._on_method_call(None, ':1.1', PATH, INTERFACE, 'Call', FakeParameters(args),
+        invocation)
+    return invocation
+
+
+class TestOnMethodCall(object):
+
+    def test_sync(self, exporter):
+        """Make sure the return value of a synchronous method is sent as reply."""
+        invocation = call(exporter, lambda self, value: value * 2, in_args=[('value', 'i')],
+            out_args=[('result', 'i')], args=(21,))
+        assert [value.unpack() for value in invocation.values] == [(42,)]
+        assert invocation.errors == []
+
+    def test_sync_without_result(self, exporter):
+        """Make sure methods without out arguments are replied to without a value."""
+        invocation = call(exporter, lambda self: None)
+        assert invocation.values == [None]
+
+    def test_async(self, exporter):
+        """Make sure the reply of an asynchronous method is sent once it is passed on."""
+        handlers = []
+
+        def function(self, reply_handler, error_handler):
+            handlers.append(reply_handler)
+
+        invocation = call(exporter, function, out_args=[('first', 's'), ('second', 'u')],
+            async_callbacks=('reply_handler', 'error_handler'))
+        assert invocation.values == []
+        handlers[0]('foo', 1)
+        assert [value.unpack() for value in invocation.values] == [('foo', 1)]
+
+    def test_async_error(self, exporter):
+        """Make sure errors passed to the error callback are sent with their name."""
+        def function(self, reply_handler, error_handler):
+            error_handler(NamedError('foo'))
+
+        invocation = call(exporter, function,
+            async_callbacks=('reply_handler', 'error_handler'))
+        assert invocation.errors == [('org.example.Error.Named', 'foo')]
+
+    def test_error(self, exporter):
+        """Make sure exceptions raised by a method are sent as error."""
+        def function(self):
+            raise LocalError('foo')
+
+        invocation = call(exporter, function)
+        assert invocation.values == []
+        assert invocation.errors == [(gdbus.get_error_name(LocalError()), 'foo')]
+
+    def test_invalid_reply(self, exporter):
+        """Make sure a reply not matching the out signature is answered with an error."""
+        invocation = call(exporter, lambda self: 'foo', out_args=[('result', 'u')])
+        assert invocation.values == []
+        assert len(invocation.errors) == 1
+
+    def test_fd(self, exporter):
+        """Make sure file descriptor arguments are passed as ``_UnixFd`` owned by the method."""
+        read_fd, write_fd = os.pipe()
+
+        def function(self, fd):
+            fd = fd.take()
+            os.write(fd, b'foo')
+            os.close(fd)
+
+        try:
+            invocation = call(exporter, function, in_args=[('fd', 'h')], args=(0,),
+                fds=[write_fd])
+        finally:
+            os.close(write_fd)
+        try:
+            assert os.read(read_fd, 10) == b'foo'
+        finally:
+            os.close(read_fd)
+        assert invocation.values == [None]
@@ -0,0 +1,315 @@
+# -*- encoding: utf-8 -*-
+
+"""Unittests for grouping writes into shared transactions."""
+
+from __future__ import absolute_import, unicode_literals
+
+import pytest
+from six import text_type
+
+from hamster_dbus import objects
+
+
+class FakeSession(object):
+    """Session that records what has been written and committed."""
+
+    def __init__(self):
+        self.staged = []
+        self.committed = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail_commit = False
+
+    def flush(self):
+        pass
+
+    def commit(self):
+        if self.fail_commit:
+            raise RuntimeError('disk full')
+        self.committed.extend(self.staged)
+        self.staged = []
+        self.commits += 1
+
+    def rollback(self):
+        self.staged = []
+        self.rollbacks += 1
+
+
+class FakeStore(object):
+
+    def __init__(self):
+        self.session = FakeSession()
+
+
+class Caller(object):
+    """Collect the reply or error a single write receives."""
+
+    def __init__(self):
+        self.replies = []
+        self.errors = []
+
+    def reply_handler(self, *args):
+        self.replies.append(args)
+
+    def error_handler(self, error):
+        self.errors.append(error)
+
+
+@pytest.fixture
+def timeouts(monkeypatch):
+    """Record timeout sources instead of adding them to a main loop."""
+    sources = []
+
+    def timeout_add(interval, callback):
+        sources.append((interval, callback))
+        return len(sources)
+
+    monkeypatch.setattr(objects.GLib, 'timeout_add', timeout_add)
+    return sources
+
+
+@pytest.fixture
+def store():
+    return FakeStore()
+
+
+def make_write(store, value, result=None):
+    """Return a write that stages ``value`` and commits, as ``hamster-lib`` does."""
+    def write():
+        store.session.staged.append(value)
+        store.session.commit()
+        return result
+    return write
+
+
+def failing_write():
+    raise ValueError('invalid')
+
+
+class TestWhenIdle(object):
+
+    def test_nothing_pending(self, timeouts):
+        """Make sure the callback is called right away if nothing is pending."""
+        group_commit = objects.GroupCommit(0.1)
+        calls = []
+        group_commit.when_idle(lambda: calls.append(True))
+        assert calls == [True]
+
+    def test_after_commit(self, store, timeouts):
+        """Make sure the callback is called once the pending group has been committed."""
+        group_commit = objects.GroupCommit(0.1)
+        caller = Caller()
+        calls = []
+        group_commit.submit(store, make_write(store, 'foo'), [], caller.reply_handler,
+            caller.error_handler)
+        group_commit.when_idle(lambda: calls.append(store.session.committed[:]))
+        assert calls == []
+        interval, callback = timeouts[0]
+        callback()
+        assert calls == [['foo']]
+        assert not group_commit.pending
+
+    def test_after_failed_commit(self, store, timeouts):
+        """Make sure the callback is called even if the pending group was rolled back."""
+        group_commit = objects.GroupCommit(0.1)
+        caller = Caller()
+        calls = []
+        group_commit.submit(store, make_write(store, 'foo'), [], caller.reply_handler,
+            caller.error_handler)
+        group_commit.when_idle(lambda: calls.append(True))
+        store.session.fail_commit = True
+        interval, callback = timeouts[0]
+        callback()
+        assert calls == [True]
+
+
+class TestSubmit(object):
+
+    def test_without_window(self, store, timeouts):
+        """Make sure each write is committed and replied to right away."""
+        group_commit = objects.GroupCommit(None)
+        caller = Caller()
+        signals = []
+        group_commit.submit(store, make_write(store, 'foo', result=1), [lambda: signals.append(1)],
+            caller.reply_handler, caller.error_handler)
+        assert store.session.committed == ['foo']
+        assert store.session.commits == 1
+        assert signals == [1]
+        assert caller.replies == [(1,)]
+        assert timeouts == []
+        assert not group_commit.pending
+
+    def test_without_window_error(self, store, timeouts):
+        """Make sure a failing write is reported to its caller right away."""
+        group_commit = objects.GroupCommit(None)
+        caller = Caller()
+        signals = []
+        group_commit.submit(store, failing_write, [lambda: signals.append(1)],
+            caller.reply_handler, caller.error_handler)
+        assert caller.replies == []
+        assert [text_type(error) for error in caller.errors] == ['invalid']
+        assert signals == []
+
+    def test_shared_commit(self, store, timeouts):
+        """Make sure writes within the window share a single commit."""
+        group_commit = objects.GroupCommit(0.1)
+        callers = [Caller() for i in range(3)]
+        signals = []
+
+        def signal():
+            signals.append(store.session.committed[:])
+
+        for index, caller in enumerate(callers):
+            group_commit.submit(store, make_write(store, index, result=index), [signal],
+                caller.reply_handler, caller.error_handler)
+        assert store.session.commits == 0
+        assert all(caller.replies == [] for caller in callers)
+        assert group_commit.pending
+        assert len(timeouts) == 1
+
+        interval, callback = timeouts[0]
+        assert interval == 100
+        assert callback() is False
+        assert store.session.committed == [0, 1, 2]
+        assert store.session.commits == 1
+        # Signals of the whole group are only emitted once.
+        assert signals == [[0, 1, 2]]
+        assert [caller.replies for caller in callers] == [[(0,)], [(1,)], [(2,)]]
+        assert not group_commit.pending
+
+    def test_reply_without_result(self, store, timeouts):
+        """Make sure writes without a return value are replied to without arguments."""
+        group_commit = objects.GroupCommit(0.1)
+        caller = Caller()
+        group_commit.submit(store, make_write(store, 'foo'), [], caller.reply_handler,
+            caller.error_handler)
+        timeouts[0][1]()
+        assert caller.replies == [()]
+
+    def test_failing_write(self, store, timeouts):
+        """Make sure only the failing write errors and the others are replayed."""
+        rollbacks = []
+        group_commit = objects.GroupCommit(0.1, on_rollback=lambda: rollbacks.append(True))
+        first, failing, last = Caller(), Caller(), Caller()
+        group_commit.submit(store, make_write(store, 'foo', result=1), [],
+            first.reply_handler, first.error_handler)
+        group_commit.submit(store, failing_write, [], failing.reply_handler,
+            failing.error_handler)
+        # The rollback discarded the first write, replaying it staged it again.
+        assert store.session.staged == ['foo']
+        assert store.session.rollbacks == 1
+        assert rollbacks == [True]
+        group_commit.submit(store, make_write(store, 'bar', result=3), [],
+            last.reply_handler, last.error_handler)
+        assert len(timeouts) == 1
+
+        timeouts[0][1]()
+        assert store.session.committed == ['foo', 'bar']
+        assert first.replies == [(1,)]
+        assert first.errors == []
+        assert failing.replies == []
+        assert [text_type(error) for error in failing.errors] == ['invalid']
+        assert last.replies == [(3,)]
+        assert last.errors == []
+
+    def test_replay_failure(self, store, timeouts):
+        """Make sure a write that no longer applies after a rollback is failed on its own."""
+        group_commit = objects.GroupCommit(0.1)
+        first, second, failing = Caller(), Caller(), Caller()
+        executions = []
+
+        def fails_on_replay():
+            executions.append(True)
+            if len(executions) > 1:
+                raise ValueError('gone')
+            return make_write(store, 'bar')()
+
+        group_commit.submit(store, make_write(store, 'foo'), [], first.reply_handler,
+            first.error_handler)
+        group_commit.submit(store, fails_on_replay, [], second.reply_handler,
+            second.error_handler)
+        group_commit.submit(store, failing_write, [], failing.reply_handler,
+            failing.error_handler)
+        assert store.session.staged == ['foo']
+
+        timeouts[0][1]()
+        assert store.session.committed == ['foo']
+        assert first.replies == [()]
+        assert [text_type(error) for error in second.errors] == ['gone']
+        assert [text_type(error) for error in failing.errors] == ['invalid']
+        assert second.replies == failing.replies == []
+
+    def test_failing_commit(self, store, timeouts):
+        """Make sure every caller of a group receives an error if its commit fails."""
+        rollbacks = []
+        group_commit = objects.GroupCommit(0.1, on_rollback=lambda: rollbacks.append(True))
+        callers = [Caller() for i in range(2)]
+        signals = []
+        for index, caller in enumerate(callers):
+            group_commit.submit(store, make_write(store, index), [lambda: signals.append(1)],
+                caller.reply_handler, caller.error_handler)
+        store.session.fail_commit = True
+
+        timeouts[0][1]()
+        assert store.session.committed == []
+        assert store.session.rollbacks == 1
+        assert rollbacks == [True]
+        assert signals == []
+        for caller in callers:
+            assert caller.replies == []
+            assert [text_type(error) for error in caller.errors] == ['disk full']
+        assert not group_commit.pending
+
+    def test_next_group(self, store, timeouts):
+        """Make sure a write after a commit starts a new group."""
+        group_commit = objects.GroupCommit(0.1)
+        caller = Caller()
+        group_commit.submit(store, make_write(store, 'foo'), [], caller.reply_handler,
+            caller.error_handler)
+        timeouts[0][1]()
+        group_commit.submit(store, make_write(store, 'bar'), [], caller.reply_handler,
+            caller.error_handler)
+        assert len(timeouts) == 2
+        timeouts[1][1]()
+        assert store.session.commits == 2
+        assert caller.replies == [(), ()]
+
+
+class TestOnCommit(object):
+
+    def test_without_window(self, store, timeouts):
+        """Make sure ``on_commit`` is called after the signals of each write."""
+        calls = []
+        group_commit = objects.GroupCommit(None, on_commit=lambda: calls.append('commit'))
+        caller = Caller()
+        group_commit.submit(store, make_write(store, 'foo'), [lambda: calls.append('signal')],
+            caller.reply_handler, caller.error_handler)
+        group_commit.submit(store, failing_write, [], caller.reply_handler,
+            caller.error_handler)
+        assert calls == ['signal', 'commit']
+
+    def test_once_per_group(self, store, timeouts):
+        """Make sure ``on_commit`` is called once for a whole group."""
+        calls = []
+        group_commit = objects.GroupCommit(0.1, on_commit=lambda: calls.append('commit'))
+        caller = Caller()
+
+        def signal():
+            calls.append('signal')
+
+        for value in ('foo', 'bar'):
+            group_commit.submit(store, make_write(store, value), [signal], caller.reply_handler,
+                caller.error_handler)
+        timeouts[0][1]()
+        assert calls == ['signal', 'commit']
+
+    def test_failing_commit(self, store, timeouts):
+        """Make sure ``on_commit`` is not called if the commit fails."""
+        calls = []
+        group_commit = objects.GroupCommit(0.1, on_commit=lambda: calls.append('commit'))
+        caller = Caller()
+        group_commit.submit(store, make_write(store, 'foo'), [], caller.reply_handler,
+            caller.error_handler)
+        store.session.fail_commit = True
+        timeouts[0][1]()
+        assert calls == []
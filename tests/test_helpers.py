@@ -60,6 +60,35 @@ def test_text_to_datetime(value, expectation):
     assert result == expectation
 
 
+@pytest.mark.parametrize(('value', 'expectation'), (
+    ('2017-1-1 8:0:3', dt.datetime(2017, 1, 1, 8, 0, 3)),
+    ('2017-2-1', dt.date(2017, 2, 1)),
+    ('8:2:1', dt.time(8, 2, 1)),
+))
+def test_text_to_datetime_non_canonical(value, expectation):
+    """Make sure text not in fixed width format is still accepted."""
+    assert helpers.text_to_datetime(value) == expectation
+
+
+@pytest.mark.parametrize('value', (
+    '2017-02-30 10:00:00', '24:00:00', 'foo', '2017-01-01T10:00:00',
+))
+def test_text_to_datetime_invalid(value):
+    """Make sure invalid text raises ``ValueError``, also on repeated calls."""
+    for i in range(2):
+        with pytest.raises(ValueError):
+            helpers.text_to_datetime(value)
+
+
+def test_text_to_datetime_memo_bounded(monkeypatch):
+    """Make sure the memo does not grow beyond its size."""
+    monkeypatch.setattr(helpers, '_MEMO_SIZE', 2)
+    helpers._text_to_datetime_memo.clear()
+    for value in ('10:00:00', '11:00:00', '12:00:00'):
+        helpers.text_to_datetime(value)
+    assert len(helpers._text_to_datetime_memo) <= 2
+
+
 def test_datetime_to_text_non_datetime():
     """Make sure an error is thrown if we pass invalid instances."""
     with pytest.raises(TypeError):
@@ -184,3 +213,146 @@ def test_dbus_to_hamster_fact(fact_tuple, expectation):
     result = helpers.dbus_to_hamster_fact(fact_tuple)
     assert result == expectation
     assert isinstance(result, Fact)
+
+
+@pytest.mark.parametrize(('value', 'expectation'), (
+    (dt.datetime(1970, 1, 1, 0, 0, 1), 1),
+    (dt.datetime(2017, 2, 1, 18), 1485972000),
+    (None, -1),
+))
+def test_datetime_to_epoch(value, expectation):
+    """Make sure naive datetimes are serialized without any timezone conversion."""
+    assert helpers.datetime_to_epoch(value) == expectation
+    assert helpers.epoch_to_datetime(expectation) == value
+
+
+def test_hamster_to_dbus_fact_columns():
+    """Make sure facts are split into columns with each activity and tag listed once."""
+    category = Category('bar', pk=1)
+    facts = [
+        Fact(Activity('foo', pk=1, category=category), dt.datetime(2017, 2, 1, 18),
+            end=dt.datetime(2017, 2, 1, 19), pk=1, tags=[Tag('tag1', pk=1)]),
+        Fact(Activity('foo', pk=1, category=category), dt.datetime(2017, 2, 2, 18),
+            pk=2, description='baz', tags=[Tag('tag1', pk=1)]),
+        Fact(Activity('qux', pk=2), dt.datetime(2017, 2, 3, 18), pk=3),
+    ]
+    result = helpers.hamster_to_dbus_fact_columns(facts)
+    assert isinstance(result, helpers.DBusFactColumns)
+    assert result.pks == [1, 2, 3]
+    assert result.starts[0] == helpers.datetime_to_epoch(facts[0].start)
+    assert result.ends == [helpers.datetime_to_epoch(facts[0].end), -1, -1]
+    assert result.descriptions == ['', 'baz', '']
+    assert result.activities == [0, 0, 1]
+    assert result.tag_offsets == [0, 1, 2, 2]
+    assert result.tags == [0, 0]
+    assert result.activity_table == [(1, 'foo', 0, False), (2, 'qux', -1, False)]
+    assert result.category_table == [(1, 'bar')]
+    assert result.tag_table == [(1, 'tag1')]
+
+
+def test_fact_table_roundtrip():
+    """Make sure facts survive dictionary encoding, sharing rebuilt instances."""
+    category = Category('bar', pk=1)
+    facts = [
+        Fact(Activity('foo', pk=1, category=category), dt.datetime(2017, 2, 1, 18),
+            end=dt.datetime(2017, 2, 1, 19), pk=1, tags=[Tag('tag1', pk=1)]),
+        Fact(Activity('foo', pk=1, category=category), dt.datetime(2017, 2, 2, 18),
+            end=dt.datetime(2017, 2, 2, 19), pk=2, description='baz', tags=[Tag('tag1', pk=1)]),
+        Fact(Activity('qux', pk=2), dt.datetime(2017, 2, 3, 18), pk=3),
+    ]
+    table = helpers.hamster_to_dbus_fact_table(facts)
+    assert len(table.activity_table) == 2
+    assert len(table.tag_table) == 1
+    result = helpers.dbus_to_hamster_fact_table(table)
+    assert [fact.pk for fact in result] == [1, 2, 3]
+    assert result[1].description == 'baz'
+    assert result[2].activity.category is None
+    assert result[0].activity is result[1].activity
+    assert result[0].tags == result[1].tags
+    assert result[0].activity.as_tuple() == facts[0].activity.as_tuple()
+
+
+def test_series_roundtrip():
+    """Make sure groups are listed once and referred to by index."""
+    bucket_starts = [dt.datetime(2017, 2, 1, 5, 30), dt.datetime(2017, 2, 2, 5, 30)]
+    durations = {(1, (2, 'foo')): 60, (0, (-1, '')): 120, (0, (2, 'foo')): 30}
+    series = helpers.series_to_dbus(bucket_starts, durations)
+    assert isinstance(series, helpers.DBusSeries)
+    result = helpers.dbus_to_series(series)
+    assert result.bucket_starts == bucket_starts
+    assert result.groups == [(-1, ''), (2, 'foo')]
+    assert result.durations == [(0, 0, 120), (0, 1, 30), (1, 1, 60)]
+
+
+def test_gaps_and_conflicts_roundtrip():
+    """Make sure gaps and conflicts survive their dbus representation."""
+    gaps = [(dt.datetime(2017, 2, 1, 8), dt.datetime(2017, 2, 1, 9))]
+    conflicts = [(dt.datetime(2017, 2, 1, 10), dt.datetime(2017, 2, 1, 11), 1, 2)]
+    assert helpers.dbus_to_gaps(helpers.gaps_to_dbus(gaps)) == gaps
+    assert helpers.dbus_to_conflicts(helpers.conflicts_to_dbus(conflicts)) == conflicts
+
+
+def test_top_roundtrip():
+    """Make sure rankings survive their dbus representation."""
+    activities = [(Activity('foo', pk=1, category=Category('bar', pk=2)), 3600, 2)]
+    tags = [(Tag('tag1', pk=1), 60, 1)]
+    assert helpers.dbus_to_top_activities(helpers.top_activities_to_dbus(activities)) == activities
+    assert helpers.dbus_to_top_tags(helpers.top_tags_to_dbus(tags)) == tags
+
+
+@pytest.mark.parametrize('activity', (
+    Activity('foo', pk=1, category=Category('bar', pk=2)),
+    Activity('foo'),
+    None,
+))
+def test_encode_activity(activity):
+    """Make sure the codec produces the same representation as ``hamster_to_dbus_activity``."""
+    result = helpers.encode_activity(activity)
+    assert result == helpers.hamster_to_dbus_activity(activity)
+    assert isinstance(result, dbus.Struct)
+
+
+@pytest.mark.parametrize('fact', (
+    Fact(Activity('foo', pk=1), dt.datetime(2017, 2, 1, 18), pk=1),
+    Fact(Activity('foo', pk=1, category=Category('bar')), dt.datetime(2017, 2, 1, 18),
+        end=dt.datetime(2017, 2, 1, 19), description='baz', tags=[Tag('tag1', pk=1)]),
+    Fact(Activity('foo'), start=None, pk=None),
+    Fact(Activity('foo'), dt.datetime(2017, 2, 1, 18, 0, 5, 250), pk=None),
+))
+def test_encode_fact(fact):
+    """Make sure the codec produces the same representation as ``hamster_to_dbus_fact``."""
+    result = helpers.encode_fact(fact)
+    assert result == helpers.hamster_to_dbus_fact(fact)
+    assert isinstance(result, dbus.Struct)
+
+
+@pytest.mark.parametrize('fact', (
+    Fact(Activity('foo', pk=1), dt.datetime(2017, 2, 1, 18), pk=1),
+    Fact(Activity('foo', pk=1, category=Category('bar')), dt.datetime(2017, 2, 1, 18),
+        end=dt.datetime(2017, 2, 1, 19), description='baz', tags=[Tag('tag1', pk=1)]),
+))
+def test_decode_facts(fact):
+    """Make sure the codec restores facts just like ``dbus_to_hamster_fact``."""
+    fact_tuples = helpers.encode_facts([fact, fact])
+    result = helpers.decode_facts(fact_tuples)
+    expectation = helpers.dbus_to_hamster_fact(fact_tuples[0])
+    assert result == [expectation, expectation]
+
+
+def test_decode_context():
+    """Make sure identical sub-objects are shared and facts are decoded as usual."""
+    category = Category('bar', pk=1)
+    facts = [
+        Fact(Activity('foo', pk=1, category=category), dt.datetime(2017, 2, 1, 18),
+            pk=1, tags=[Tag('tag1', pk=1)]),
+        Fact(Activity('foo', pk=1, category=category), dt.datetime(2017, 2, 2, 18),
+            pk=2, tags=[Tag('tag1', pk=1)]),
+        Fact(Activity('foo', pk=2), dt.datetime(2017, 2, 3, 18), pk=3),
+    ]
+    fact_tuples = helpers.encode_facts(facts)
+    result = helpers.decode_facts(fact_tuples, context=helpers.DecodeContext())
+    assert result == helpers.decode_facts(fact_tuples)
+    assert result[0].activity is result[1].activity
+    assert result[0].activity is not result[2].activity
+    assert list(result[0].tags)[0] is list(result[1].tags)[0]
+    assert result[0].activity.name is result[2].activity.name
@@ -0,0 +1,100 @@
+# -*- encoding: utf-8 -*-
+
+"""Unittests for our introspection module."""
+
+from __future__ import absolute_import, unicode_literals
+
+import xml.etree.ElementTree as ET
+
+import dbus
+import dbus.service
+import pytest
+
+from hamster_dbus import introspection, objects, schema
+
+
+class ExampleObject(objects.PropertiesObject):
+    """Object declaring one member of each kind."""
+
+    properties_interface = 'org.example.Example1'
+
+    def _get_properties(self):
+        return {'Count': lambda: dbus.UInt32(1)}
+
+    @dbus.service.method('org.example.Example1', in_signature='ia(is)', out_signature='s',
+        async_callbacks=('reply_handler', 'error_handler'))
+    def Lookup(self, pk, pairs, reply_handler, error_handler):  # NOQA
+        pass
+
+    @dbus.service.signal('org.example.Example1', signature='us')
+    def Changed(self, revision, name):  # NOQA
+        pass
+
+
+@pytest.fixture
+def example_interface(monkeypatch):
+    """Declare the properties of ``ExampleObject`` in our schema."""
+    interface = schema.Interface('/org/example/Example', {}, {}, {'Count': 'u'})
+    monkeypatch.setitem(schema.INTERFACES, 'org.example.Example1', interface)
+    return interface
+
+
+@pytest.fixture
+def example_object(example_interface):
+    """Provide an ``ExampleObject`` that is not exported on any bus."""
+    return ExampleObject(export=False)
+
+
+@pytest.mark.parametrize(('signature', 'expectation'), (
+    ('', []),
+    ('isb', ['i', 's', 'b']),
+    ('ia(is)a{sv}', ['i', 'a(is)', 'a{sv}']),
+    ('(isss(is(is)b)a(is))aai', ['(isss(is(is)b)a(is))', 'aai']),
+))
+def test_split_signature(signature, expectation):
+    """Make sure signatures are split into single complete types."""
+    assert introspection.split_signature(signature) == expectation
+
+
+@pytest.mark.parametrize('signature', ('a', '(is', 'is)', 'a{sv'))
+def test_split_signature_invalid(signature):
+    """Make sure incomplete or unbalanced signatures are refused."""
+    with pytest.raises(ValueError):
+        introspection.split_signature(signature)
+
+
+def test_get_interfaces(example_object):
+    """Make sure members are collected with their arguments."""
+    interfaces = {interface.name: interface for interface in
+        introspection.get_interfaces(example_object)}
+    example = interfaces['org.example.Example1']
+    method, = example.methods
+    assert method.in_args == [('pk', 'i'), ('pairs', 'a(is)')]
+    assert method.out_args == [(None, 's')]
+    assert method.async_callbacks == ('reply_handler', 'error_handler')
+    assert example.signals == [introspection.Signal('Changed', [('revision', 'u'),
+        ('name', 's')])]
+    assert example.properties == [introspection.Property('Count', 'u')]
+    assert 'org.freedesktop.DBus.Properties' in interfaces
+
+
+def test_get_interfaces_out_arg_names(example_interface, example_object):
+    """Make sure out arguments are named as declared in our schema."""
+    example_interface.methods['Lookup'] = schema.Method((('pk', 'i'), ('pairs', 'a(is)')),
+        (('name', 's'),))
+    interface, = [interface for interface in introspection.get_interfaces(example_object)
+        if interface.name == 'org.example.Example1']
+    assert interface.methods[0].out_args == [('name', 's')]
+
+
+def test_introspection_xml(example_object):
+    """Make sure the generated XML describes all members."""
+    interfaces = [interface for interface in introspection.get_interfaces(example_object)
+        if interface.name not in introspection.STANDARD_INTERFACES]
+    root = ET.fromstring(introspection.introspection_xml(interfaces))
+    interface, = root.findall('interface')
+    assert interface.get('name') == 'org.example.Example1'
+    args = interface.find('method').findall('arg')
+    assert [(arg.get('type'), arg.get('direction')) for arg in args] == [
+        ('i', 'in'), ('a(is)', 'in'), ('s', 'out')]
+    assert interface.find('property').attrib == {'name': 'Count', 'type': 'u', 'access': 'read'}
@@ -0,0 +1,90 @@
+# -*- encoding: utf-8 -*-
+
+"""Unittests for our ongoing module."""
+
+from __future__ import absolute_import, unicode_literals
+
+import datetime as dt
+
+import pytest
+from hamster_lib import Activity, Category, Fact, Tag
+
+from hamster_dbus import ongoing
+
+
+@pytest.fixture
+def fact():
+    """Provide a fact without end."""
+    return Fact(Activity('foo', pk=1, category=Category('bar', pk=1)),
+        dt.datetime(2017, 1, 1, 8), description='baz', tags=[Tag('tag1', pk=1)])
+
+
+@pytest.fixture
+def path(tmpdir):
+    """Provide the path of a not yet existing journal."""
+    return str(tmpdir.join('ongoing.json'))
+
+
+def test_default_path(monkeypatch):
+    """Make sure the journal is placed in ``$XDG_DATA_HOME``."""
+    monkeypatch.setenv('XDG_DATA_HOME', '/home/foo/.data')
+    assert ongoing.default_path() == '/home/foo/.data/hamster-dbus/ongoing-fact.json'
+    monkeypatch.delenv('XDG_DATA_HOME')
+    monkeypatch.setenv('HOME', '/home/foo')
+    assert ongoing.default_path() == '/home/foo/.local/share/hamster-dbus/ongoing-fact.json'
+
+
+class TestOngoingFact(object):
+
+    def test_get_without_fact(self):
+        """Make sure ``KeyError`` is raised if there is no ongoing fact."""
+        with pytest.raises(KeyError):
+            ongoing.OngoingFact().get()
+
+    def test_start(self, fact):
+        """Make sure the started fact is returned."""
+        ongoing_fact = ongoing.OngoingFact()
+        ongoing_fact.start(fact)
+        assert ongoing_fact.get() is fact
+
+    def test_start_with_end(self, fact):
+        """Make sure a fact with an end is rejected."""
+        fact.end = dt.datetime(2017, 1, 1, 9)
+        with pytest.raises(ValueError):
+            ongoing.OngoingFact().start(fact)
+
+    def test_start_twice(self, fact):
+        """Make sure there can only be one ongoing fact."""
+        ongoing_fact = ongoing.OngoingFact()
+        ongoing_fact.start(fact)
+        with pytest.raises(ValueError):
+            ongoing_fact.start(fact)
+
+    def test_journal(self, fact, path):
+        """Make sure the ongoing fact is restored from the journal."""
+        ongoing.OngoingFact(path).start(fact)
+        result = ongoing.OngoingFact(path).get()
+        assert result == fact
+        assert result.tags == fact.tags
+
+    def test_clear(self, fact, path, tmpdir):
+        """Make sure the journal is removed along with the fact."""
+        ongoing_fact = ongoing.OngoingFact(path)
+        ongoing_fact.start(fact)
+        ongoing_fact.clear()
+        assert ongoing_fact.fact is None
+        assert ongoing.OngoingFact(path).fact is None
+        assert not tmpdir.listdir()
+
+    @pytest.mark.parametrize('content', ('{"pk": ', '[1, 2]', 'null'))
+    def test_invalid_journal(self, path, content):
+        """Make sure a corrupt or truncated journal is ignored like a missing one."""
+        with open(path, 'w') as fobj:
+            fobj.write(content)
+        assert ongoing.OngoingFact(path).fact is None
+
+    def test_journal_directory(self, fact, tmpdir):
+        """Make sure missing parent directories of the journal are created."""
+        path = str(tmpdir.join('foo', 'ongoing.json'))
+        ongoing.OngoingFact(path).start(fact)
+        assert ongoing.OngoingFact(path).get() == fact
@@ -0,0 +1,53 @@
+# -*- encoding: utf-8 -*-
+
+"""Unittests for the properties our objects expose."""
+
+from __future__ import absolute_import, unicode_literals
+
+import dbus
+
+from hamster_dbus import objects
+
+
+class CountingObject(objects.PropertiesObject):
+    """Object with a property whose value is set by the test."""
+
+    properties_interface = 'org.example.Example1'
+
+    def __init__(self):
+        super(CountingObject, self).__init__(object_path='/org/example/Example', export=False)
+        self.count = 1
+        self.emitted = []
+
+    def _get_properties(self):
+        return {
+            'Count': lambda: dbus.UInt32(self.count),
+            'Name': lambda: dbus.String('foo'),
+        }
+
+    def PropertiesChanged(self, interface, changed, invalidated):  # NOQA
+        self.emitted.append(dict(changed))
+
+
+class TestEmitPropertiesChanged(object):
+
+    def test_first_emission(self):
+        """Make sure all properties are emitted if they have not been emitted before."""
+        dbus_object = CountingObject()
+        dbus_object._emit_properties_changed('Count', 'Name')
+        assert dbus_object.emitted == [{'Count': 1, 'Name': 'foo'}]
+
+    def test_only_changed(self):
+        """Make sure only properties whose value changed are emitted."""
+        dbus_object = CountingObject()
+        dbus_object._emit_properties_changed('Count', 'Name')
+        dbus_object.count = 2
+        dbus_object._emit_properties_changed('Count', 'Name')
+        assert dbus_object.emitted[1:] == [{'Count': 2}]
+
+    def test_nothing_changed(self):
+        """Make sure nothing is emitted if no value changed."""
+        dbus_object = CountingObject()
+        dbus_object._emit_properties_changed('Count', 'Name')
+        dbus_object._emit_properties_changed('Count', 'Name')
+        assert len(dbus_object.emitted) == 1
@@ -0,0 +1,199 @@
+# -*- encoding: utf-8 -*-
+
+"""Unittests for our reports module."""
+
+from __future__ import absolute_import, unicode_literals
+
+import datetime
+
+import pytest
+
+from hamster_dbus import reports
+
+DAY_START = datetime.time(5, 30)
+
+
+@pytest.mark.parametrize(('start', 'end', 'expectation'), (
+    (datetime.date(2016, 1, 1), datetime.date(2016, 1, 1),
+        (datetime.datetime(2016, 1, 1, 5, 30), datetime.datetime(2016, 1, 2, 5, 30))),
+    (datetime.datetime(2016, 1, 1, 12), datetime.date(2016, 1, 31),
+        (datetime.datetime(2016, 1, 1, 12), datetime.datetime(2016, 2, 1, 5, 30))),
+))
+def test_get_timeframe(start, end, expectation):
+    """Make sure dates are completed using ``day_start`` with ``end`` being exclusive."""
+    assert reports.get_timeframe(start, end, DAY_START) == expectation
+
+
+@pytest.mark.parametrize(('start', 'end'), (
+    (None, datetime.date(2016, 1, 1)),
+    (datetime.date(2016, 1, 2), datetime.date(2016, 1, 1)),
+))
+def test_get_timeframe_invalid(start, end):
+    """Make sure incomplete or reversed timeframes are refused."""
+    with pytest.raises(ValueError):
+        reports.get_timeframe(start, end, DAY_START)
+
+
+@pytest.mark.parametrize(('value', 'bucket', 'expectation'), (
+    (datetime.datetime(2016, 1, 6, 7, 45), 'hour', datetime.datetime(2016, 1, 6, 7, 30)),
+    (datetime.datetime(2016, 1, 6, 7, 15), 'hour', datetime.datetime(2016, 1, 6, 6, 30)),
+    (datetime.datetime(2016, 1, 6, 7), 'day', datetime.datetime(2016, 1, 6, 5, 30)),
+    (datetime.datetime(2016, 1, 6, 3), 'day', datetime.datetime(2016, 1, 5, 5, 30)),
+    (datetime.datetime(2016, 1, 6, 7), 'week', datetime.datetime(2016, 1, 4, 5, 30)),
+    (datetime.datetime(2016, 1, 4, 3), 'week', datetime.datetime(2015, 12, 28, 5, 30)),
+    (datetime.datetime(2016, 1, 6, 7), 'month', datetime.datetime(2016, 1, 1, 5, 30)),
+    (datetime.datetime(2016, 1, 1, 3), 'month', datetime.datetime(2015, 12, 1, 5, 30)),
+))
+def test_get_bucket_start(value, bucket, expectation):
+    """Make sure buckets start at ``day_start``, even hourly ones."""
+    assert reports.get_bucket_start(value, bucket, DAY_START) == expectation
+
+
+@pytest.mark.parametrize(('bucket_start', 'bucket', 'expectation'), (
+    (datetime.datetime(2016, 1, 6, 23, 30), 'hour', datetime.datetime(2016, 1, 7, 0, 30)),
+    (datetime.datetime(2016, 2, 28, 5, 30), 'day', datetime.datetime(2016, 2, 29, 5, 30)),
+    (datetime.datetime(2015, 12, 28, 5, 30), 'week', datetime.datetime(2016, 1, 4, 5, 30)),
+    (datetime.datetime(2015, 12, 1, 5, 30), 'month', datetime.datetime(2016, 1, 1, 5, 30)),
+))
+def test_get_next_bucket_start(bucket_start, bucket, expectation):
+    """Make sure the following bucket is returned, across month and year ends."""
+    assert reports.get_next_bucket_start(bucket_start, bucket, DAY_START) == expectation
+
+
+def test_get_bucket_start_invalid():
+    """Make sure unknown buckets are refused."""
+    with pytest.raises(ValueError):
+        reports.get_bucket_start(datetime.datetime(2016, 1, 6), 'year', DAY_START)
+
+
+def test_get_bucket_starts():
+    """Make sure all buckets overlapping the timeframe are returned."""
+    result = reports.get_bucket_starts(datetime.datetime(2016, 1, 6, 12),
+        datetime.datetime(2016, 1, 8, 5, 30), 'day', DAY_START)
+    assert result == [datetime.datetime(2016, 1, 6, 5, 30), datetime.datetime(2016, 1, 7, 5, 30)]
+
+
+def test_get_series_splits_spans():
+    """Make sure spans crossing ``day_start`` are split among the days."""
+    spans = [(datetime.datetime(2016, 1, 6, 22), datetime.datetime(2016, 1, 7, 7), 'foo')]
+    bucket_starts, durations = reports.get_series(spans, datetime.datetime(2016, 1, 6, 5, 30),
+        datetime.datetime(2016, 1, 8, 5, 30), 'day', DAY_START)
+    assert len(bucket_starts) == 2
+    assert durations == {(0, 'foo'): 7.5 * 3600, (1, 'foo'): 1.5 * 3600}
+
+
+def test_get_series_clips_spans():
+    """Make sure only the part of a span within the timeframe is accounted for."""
+    spans = [
+        (datetime.datetime(2016, 1, 6, 4), datetime.datetime(2016, 1, 6, 8), 'foo'),
+        (datetime.datetime(2016, 1, 6, 7), datetime.datetime(2016, 1, 6, 9), 'bar'),
+        (datetime.datetime(2016, 1, 7, 1), datetime.datetime(2016, 1, 7, 4), 'foo'),
+    ]
+    bucket_starts, durations = reports.get_series(spans, datetime.datetime(2016, 1, 6, 6),
+        datetime.datetime(2016, 1, 7, 2), 'week', DAY_START)
+    assert bucket_starts == [datetime.datetime(2016, 1, 4, 5, 30)]
+    assert durations == {(0, 'foo'): 3 * 3600, (0, 'bar'): 2 * 3600}
+
+
+def test_get_series_hours():
+    """Make sure hourly buckets are filled partially."""
+    spans = [(datetime.datetime(2016, 1, 6, 6), datetime.datetime(2016, 1, 6, 7), 'foo')]
+    bucket_starts, durations = reports.get_series(spans, datetime.datetime(2016, 1, 6, 5, 30),
+        datetime.datetime(2016, 1, 6, 8, 30), 'hour', DAY_START)
+    assert len(bucket_starts) == 3
+    assert durations == {(0, 'foo'): 1800, (1, 'foo'): 1800}
+
+
+@pytest.mark.parametrize(('start', 'end', 'expectation'), (
+    (datetime.datetime(2016, 1, 6, 5, 30), datetime.datetime(2016, 1, 8, 5, 30),
+        (datetime.datetime(2016, 1, 6, 5, 30), datetime.datetime(2016, 1, 8, 5, 30))),
+    (datetime.datetime(2016, 1, 6, 12), datetime.datetime(2016, 1, 8, 2), None),
+    (datetime.datetime(2016, 1, 6, 12), datetime.datetime(2016, 1, 8, 12),
+        (datetime.datetime(2016, 1, 7, 5, 30), datetime.datetime(2016, 1, 8, 5, 30))),
+))
+def test_get_whole_days(start, end, expectation):
+    """Make sure only days lying entirely within the timeframe are returned."""
+    assert reports.get_whole_days(start, end, DAY_START) == expectation
+
+
+def test_clip_spans():
+    """Make sure spans are clipped to the timeframe and dropped if outside of it."""
+    spans = [
+        (datetime.datetime(2016, 1, 6, 4), datetime.datetime(2016, 1, 6, 8), 'foo'),
+        (datetime.datetime(2016, 1, 6, 9), datetime.datetime(2016, 1, 6, 10), 'bar'),
+    ]
+    assert list(reports.clip_spans(spans, datetime.datetime(2016, 1, 6, 6),
+        datetime.datetime(2016, 1, 6, 9))) == [
+        (datetime.datetime(2016, 1, 6, 6), datetime.datetime(2016, 1, 6, 8), 'foo')]
+
+
+def test_get_series_daily_totals():
+    """Make sure daily totals are added to the buckets containing their days."""
+    spans = [(datetime.datetime(2016, 1, 6, 12), datetime.datetime(2016, 1, 6, 13), 'foo')]
+    daily_totals = [(datetime.date(2016, 1, 7), 'foo', 600),
+        (datetime.date(2016, 1, 7), 'bar', 60)]
+    bucket_starts, durations = reports.get_series(spans, datetime.datetime(2016, 1, 6, 12),
+        datetime.datetime(2016, 1, 8, 5, 30), 'day', DAY_START, daily_totals)
+    assert durations == {(0, 'foo'): 3600, (1, 'foo'): 600, (1, 'bar'): 60}
+
+
+def _at(hour, minute=0):
+    return datetime.datetime(2016, 1, 6, hour, minute)
+
+
+@pytest.mark.parametrize(('min_gap', 'expectation'), (
+    (datetime.timedelta(0), [(_at(6, 30), _at(7)), (_at(9), _at(9, 10)), (_at(11), _at(12))]),
+    (datetime.timedelta(minutes=30), [(_at(6, 30), _at(7)), (_at(11), _at(12))]),
+))
+def test_get_gaps(min_gap, expectation):
+    """Make sure uncovered periods are found, including those at the edges of the timeframe."""
+    spans = [
+        (_at(5), _at(6, 30), 1),
+        (_at(7), _at(9), 2),
+        (_at(8), _at(8, 30), 3),
+        (_at(9, 10), _at(11), 4),
+    ]
+    assert reports.get_gaps(spans, _at(6), _at(12), min_gap) == expectation
+
+
+def test_get_gaps_covered():
+    """Make sure a timeframe covered by a single span has no gaps."""
+    spans = [(_at(5), _at(13), 1)]
+    assert reports.get_gaps(spans, _at(6), _at(12), datetime.timedelta(0)) == []
+
+
+def test_get_conflicts():
+    """Make sure overlaps are found and clipped to the timeframe."""
+    spans = [
+        (_at(5), _at(8), 1),
+        (_at(7), _at(9), 2),
+        (_at(7, 30), _at(7, 45), 3),
+        (_at(9), _at(10), 4),
+        (_at(9, 30), _at(13), 5),
+    ]
+    assert reports.get_conflicts(spans, _at(6), _at(12)) == [
+        (_at(7), _at(8), 1, 2),
+        (_at(7, 30), _at(7, 45), 2, 3),
+        (_at(9, 30), _at(10), 4, 5),
+    ]
+
+
+@pytest.mark.parametrize(('metric', 'expectation'), (
+    ('duration', [('bar', 3 * 3600, 1), ('foo', 2 * 3600, 2)]),
+    ('count', [('foo', 2 * 3600, 2), ('bar', 3 * 3600, 1)]),
+))
+def test_get_top(metric, expectation):
+    """Make sure groups are ranked by the metric with durations clipped to the timeframe."""
+    spans = [
+        (_at(5), _at(7), 'foo'),
+        (_at(7), _at(10), 'bar'),
+        (_at(10), _at(11), 'foo'),
+        (_at(11), _at(11, 30), 'baz'),
+    ]
+    assert reports.get_top(spans, _at(6), _at(12), 2, metric) == expectation
+
+
+def test_get_top_invalid_metric():
+    """Make sure unknown metrics are refused."""
+    with pytest.raises(ValueError):
+        reports.get_top([], _at(6), _at(12), 2, 'revenue')
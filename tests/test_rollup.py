@@ -0,0 +1,83 @@
+# -*- encoding: utf-8 -*-
+
+"""Unittests for our rollup module."""
+
+from __future__ import absolute_import, unicode_literals
+
+import datetime
+
+import pytest
+
+from hamster_dbus import rollup
+
+DAY_START = datetime.time(5, 30)
+
+
+@pytest.fixture
+def daily_rollup():
+    """Provide a rollup built from a fact spanning midnight and ``day_start``."""
+    result = rollup.DailyRollup()
+    result.build([(datetime.datetime(2016, 1, 6, 22), datetime.datetime(2016, 1, 7, 7), 1)],
+        DAY_START)
+    return result
+
+
+def test_build_splits_at_day_start(daily_rollup):
+    """Make sure facts are split at ``day_start`` rather than midnight."""
+    assert sorted(daily_rollup.iter_totals(datetime.date(2016, 1, 1),
+            datetime.date(2016, 2, 1))) == [
+        (datetime.date(2016, 1, 6), 1, 7.5 * 3600),
+        (datetime.date(2016, 1, 7), 1, 1.5 * 3600),
+    ]
+
+
+def test_iter_totals_range(daily_rollup):
+    """Make sure only days within the range are returned, the last one being exclusive."""
+    assert list(daily_rollup.iter_totals(datetime.date(2016, 1, 6),
+        datetime.date(2016, 1, 7))) == [(datetime.date(2016, 1, 6), 1, 7.5 * 3600)]
+
+
+def test_add(daily_rollup):
+    """Make sure added facts are summed up per day and activity."""
+    daily_rollup.add(datetime.datetime(2016, 1, 6, 8), datetime.datetime(2016, 1, 6, 9), 1)
+    daily_rollup.add(datetime.datetime(2016, 1, 6, 8), datetime.datetime(2016, 1, 6, 9), 2)
+    assert sorted(daily_rollup.iter_totals(datetime.date(2016, 1, 6),
+            datetime.date(2016, 1, 7))) == [
+        (datetime.date(2016, 1, 6), 1, 8.5 * 3600),
+        (datetime.date(2016, 1, 6), 2, 3600),
+    ]
+
+
+def test_remove(daily_rollup):
+    """Make sure removing a fact undoes adding it, dropping empty totals."""
+    daily_rollup.remove(datetime.datetime(2016, 1, 6, 22), datetime.datetime(2016, 1, 7, 7), 1)
+    assert daily_rollup.built
+    assert not list(daily_rollup.iter_totals(datetime.date(2016, 1, 1),
+        datetime.date(2016, 2, 1)))
+
+
+def test_add_ongoing(daily_rollup):
+    """Make sure facts without an end are ignored."""
+    daily_rollup.add(datetime.datetime(2016, 1, 6, 8), None, 2)
+    assert len(list(daily_rollup.iter_totals(datetime.date(2016, 1, 1),
+        datetime.date(2016, 2, 1)))) == 2
+
+
+def test_invalidate(daily_rollup):
+    """Make sure an invalidated rollup ignores updates until it is built again."""
+    daily_rollup.invalidate()
+    daily_rollup.add(datetime.datetime(2016, 1, 6, 8), datetime.datetime(2016, 1, 6, 9), 1)
+    assert not daily_rollup.built
+    daily_rollup.build([], DAY_START)
+    assert not list(daily_rollup.iter_totals(datetime.date(2016, 1, 1),
+        datetime.date(2016, 2, 1)))
+
+
+def test_iter_totals_ordered(daily_rollup):
+    """Make sure totals are returned by day, also for days added out of order."""
+    daily_rollup.add(datetime.datetime(2016, 1, 2, 8), datetime.datetime(2016, 1, 2, 9), 2)
+    daily_rollup.add(datetime.datetime(2016, 1, 9, 8), datetime.datetime(2016, 1, 9, 9), 2)
+    daily_rollup.remove(datetime.datetime(2016, 1, 9, 8), datetime.datetime(2016, 1, 9, 9), 2)
+    result = daily_rollup.iter_totals(datetime.date(2016, 1, 1), datetime.date(2016, 2, 1))
+    assert [day for day, activity_pk, seconds in result] == [
+        datetime.date(2016, 1, 2), datetime.date(2016, 1, 6), datetime.date(2016, 1, 7)]
@@ -0,0 +1,152 @@
+# -*- encoding: utf-8 -*-
+
+"""Unittests for our schema module."""
+
+from __future__ import absolute_import, unicode_literals
+
+import pytest
+
+from hamster_dbus import helpers, introspection, objects, schema
+
+
+class FakeProxyObject(object):
+    """Stand-in for ``dbus.proxies.ProxyObject`` recording all calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_dbus_method(self, name, interface):
+        def call(*args, **kwargs):
+            self.calls.append((interface, name, args, kwargs))
+        return call
+
+
+class FakeBus(object):
+    """Stand-in for ``dbus.bus.BusConnection`` handing out a ``FakeProxyObject``."""
+
+    def __init__(self):
+        self.proxy_object = FakeProxyObject()
+        self.requests = []
+
+    def get_object(self, bus_name, object_path, introspect=True):
+        self.requests.append((bus_name, object_path, introspect))
+        return self.proxy_object
+
+
+@pytest.fixture
+def static_interface():
+    """Provide a ``StaticInterface`` for the fact manager on a fake bus."""
+    return schema.StaticInterface(FakeBus(), schema.FACTS_INTERFACE)
+
+
+@pytest.mark.parametrize('interface', sorted(schema.INTERFACES))
+def test_signatures_are_complete(interface):
+    """Make sure each argument and property is a single complete type."""
+    definition = schema.INTERFACES[interface]
+    args = [arg for method in definition.methods.values()
+        for arg in method.in_args + method.out_args]
+    args += [arg for signal in definition.signals.values() for arg in signal.args]
+    args += list(definition.properties.items())
+    for name, signature in args:
+        assert introspection.split_signature(signature) == [signature]
+
+
+@pytest.mark.parametrize(('manager', 'interface'), (
+    (objects.HamsterDBus, schema.MAIN_INTERFACE),
+    (objects.CategoryManager, schema.CATEGORIES_INTERFACE),
+    (objects.ActivityManager, schema.ACTIVITIES_INTERFACE),
+    (objects.TagManager, schema.TAGS_INTERFACE),
+    (objects.FactManager, schema.FACTS_INTERFACE),
+    (objects.Reports, schema.REPORTS_INTERFACE),
+))
+def test_objects_implement_interfaces(manager, interface):
+    """Make sure every declared method and signal is implemented and vice versa."""
+    definition = schema.INTERFACES[interface]
+    methods = set()
+    signals = set()
+    for name in dir(manager):
+        member = getattr(manager, name)
+        if getattr(member, '_dbus_interface', None) != interface:
+            continue
+        if getattr(member, '_dbus_is_method', False):
+            methods.add(name)
+        elif getattr(member, '_dbus_is_signal', False):
+            signals.add(name)
+    assert methods == set(definition.methods)
+    assert signals == set(definition.signals)
+    assert manager.properties_interface == interface
+
+
+def test_method_decorator():
+    """Make sure the generated decorator uses the declared signatures."""
+    class Example(object):
+        @schema.method(schema.ACTIVITIES_INTERFACE, async_callbacks=('reply', 'error'))
+        def GetAll(self, category_pk, search_term, reply, error):  # NOQA
+            pass
+
+    assert Example.GetAll._dbus_in_signature == 'is'
+    assert Example.GetAll._dbus_out_signature == 'a(is(is)b)'
+
+
+def test_method_decorator_arguments_mismatch():
+    """Make sure implementations not matching their declaration are refused."""
+    with pytest.raises(TypeError):
+        class Example(object):
+            @schema.method(schema.ACTIVITIES_INTERFACE)
+            def Get(self, activity_pk):  # NOQA
+                pass
+
+
+def test_method_decorator_unknown():
+    """Make sure undeclared methods are refused."""
+    with pytest.raises(KeyError):
+        class Example(object):
+            @schema.method(schema.ACTIVITIES_INTERFACE)
+            def GetByName(self, name):  # NOQA
+                pass
+
+
+def test_signal_decorator_arguments_mismatch():
+    """Make sure signals not matching their declaration are refused."""
+    with pytest.raises(TypeError):
+        class Example(object):
+            @schema.signal(schema.FACTS_INTERFACE)
+            def ImportProgress(self, job_id, processed):  # NOQA
+                pass
+
+
+def test_static_interface_no_introspection():
+    """Make sure the proxy object is requested without introspection."""
+    bus = FakeBus()
+    schema.StaticInterface(bus, schema.FACTS_INTERFACE)
+    assert bus.requests == [(schema.BUS_NAME, '/org/projecthamster/HamsterDBus/FactManager',
+        False)]
+
+
+def test_static_interface_call(static_interface):
+    """Make sure methods are called with their declared signature."""
+    static_interface.GetAll('', '', 'foo', timeout=5)
+    assert static_interface.proxy_object.calls == [(schema.FACTS_INTERFACE, 'GetAll',
+        ('', '', 'foo'), {'signature': 'sss', 'timeout': 5})]
+
+
+def test_static_interface_call_arguments_mismatch(static_interface):
+    """Make sure calls with the wrong number of arguments are not sent."""
+    with pytest.raises(TypeError):
+        static_interface.GetAll('', '')
+    assert not static_interface.proxy_object.calls
+
+
+def test_static_interface_unknown_method(static_interface):
+    """Make sure undeclared methods can not be called."""
+    with pytest.raises(AttributeError):
+        static_interface.GetToday()
+
+
+def test_codec_namedtuples():
+    """Make sure multiple out arguments are decoded into namedtuples named after them."""
+    assert helpers.DBusFactColumns._fields == schema.out_arg_names(schema.FACTS_INTERFACE,
+        'GetAllColumnar')
+    assert helpers.DBusFactTable._fields == schema.out_arg_names(schema.FACTS_INTERFACE,
+        'GetAllNormalized')
+    assert '({})'.format(helpers.FACT_SIGNATURE) == schema.FACT
@@ -0,0 +1,120 @@
+# -*- encoding: utf-8 -*-
+
+"""Unittests for sharing the execution of identical concurrent reads."""
+
+from __future__ import absolute_import, unicode_literals
+
+import pytest
+from six import text_type
+
+from hamster_dbus import objects
+
+
+class Caller(object):
+    """Collect the replies or errors a single read receives."""
+
+    def __init__(self):
+        self.replies = []
+        self.errors = []
+
+    def reply_handler(self, result):
+        self.replies.append(result)
+
+    def error_handler(self, error):
+        self.errors.append(error)
+
+
+@pytest.fixture
+def idle(monkeypatch):
+    """Record idle sources instead of adding them to a main loop."""
+    sources = []
+
+    def idle_add(callback, *args, **kwargs):
+        assert kwargs == {'priority': objects.GLib.PRIORITY_DEFAULT}
+        sources.append((callback, args))
+        return len(sources)
+
+    monkeypatch.setattr(objects.GLib, 'idle_add', idle_add)
+    return sources
+
+
+def run_idle(sources):
+    """Dispatch all recorded idle sources, just like the main loop would."""
+    while sources:
+        callback, args = sources.pop(0)
+        assert callback(*args) is False
+
+
+def test_shared_computation(idle):
+    """Make sure identical reads waiting at the same time are computed only once."""
+    single_flight = objects.SingleFlight()
+    callers = [Caller() for i in range(3)]
+    calls = []
+
+    def compute():
+        calls.append(True)
+        return 'foo'
+
+    for caller in callers:
+        single_flight.submit(('Get', (1,)), compute, caller.reply_handler, caller.error_handler)
+    assert len(idle) == 1
+    assert calls == []
+
+    run_idle(idle)
+    assert len(calls) == 1
+    assert [caller.replies for caller in callers] == [['foo']] * 3
+
+
+def test_different_keys(idle):
+    """Make sure reads with different keys are computed separately."""
+    single_flight = objects.SingleFlight()
+    foo, bar = Caller(), Caller()
+    single_flight.submit(('Get', (1,)), lambda: 'foo', foo.reply_handler, foo.error_handler)
+    single_flight.submit(('Get', (2,)), lambda: 'bar', bar.reply_handler, bar.error_handler)
+    assert len(idle) == 2
+
+    run_idle(idle)
+    assert foo.replies == ['foo']
+    assert bar.replies == ['bar']
+
+
+def test_error(idle):
+    """Make sure an error computing a read reaches every caller waiting for it."""
+    single_flight = objects.SingleFlight()
+    callers = [Caller() for i in range(2)]
+
+    def compute():
+        raise KeyError('foo')
+
+    for caller in callers:
+        single_flight.submit(('Get', (1,)), compute, caller.reply_handler, caller.error_handler)
+
+    run_idle(idle)
+    for caller in callers:
+        assert caller.replies == []
+        assert [text_type(error) for error in caller.errors] == ["'foo'"]
+
+
+def test_write_in_between(idle):
+    """Make sure no caller receives a reply computed before a write preceding its call."""
+    single_flight = objects.SingleFlight()
+    state = {'value': 'old'}
+    before, after, later = Caller(), Caller(), Caller()
+
+    def compute():
+        return state['value']
+
+    single_flight.submit(('Get', ()), compute, before.reply_handler, before.error_handler)
+    # A write dispatched before the idle callback runs.
+    state['value'] = 'new'
+    single_flight.submit(('Get', ()), compute, after.reply_handler, after.error_handler)
+    run_idle(idle)
+    assert before.replies == ['new']
+    assert after.replies == ['new']
+
+    # Once computed, a read does not join the finished one but is computed anew.
+    state['value'] = 'newer'
+    single_flight.submit(('Get', ()), compute, later.reply_handler, later.error_handler)
+    assert len(idle) == 1
+    run_idle(idle)
+    assert later.replies == ['newer']
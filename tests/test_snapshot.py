@@ -0,0 +1,102 @@
+# -*- encoding: utf-8 -*-
+
+"""Unittests for our snapshot module."""
+
+from __future__ import absolute_import, unicode_literals
+
+import datetime as dt
+
+import pytest
+from hamster_lib import Activity, Category, Fact
+
+from hamster_dbus import snapshot
+
+
+@pytest.fixture
+def fact():
+    """Provide a fact without end."""
+    return Fact(Activity('foo', pk=1, category=Category('bar', pk=1)),
+        dt.datetime(2017, 1, 1, 8), description='baz')
+
+
+@pytest.fixture
+def path(tmpdir):
+    """Provide the path of a not yet existing snapshot file."""
+    return str(tmpdir.join('snapshot'))
+
+
+def test_default_path(monkeypatch):
+    """Make sure the snapshot is placed in ``$XDG_RUNTIME_DIR``."""
+    monkeypatch.setenv('XDG_RUNTIME_DIR', '/run/user/1000')
+    assert snapshot.default_path() == '/run/user/1000/hamster-dbus.snapshot'
+    monkeypatch.delenv('XDG_RUNTIME_DIR')
+    assert snapshot.default_path() is None
+
+
+class TestSnapshot(object):
+
+    def test_roundtrip(self, path, fact):
+        """Make sure a written snapshot is read as is."""
+        writer = snapshot.SnapshotWriter(path)
+        writer.write(3, fact, {'bar': 600, '': 60})
+        with snapshot.SnapshotReader(path) as reader:
+            result = reader.read()
+        assert result.revision == 3
+        assert result.ongoing_fact == ('foo', 'bar', 'baz', fact.start)
+        assert result.today_total == 660
+        assert result.category_totals == {'bar': 600, '': 60}
+
+    def test_without_ongoing_fact(self, path):
+        """Make sure a missing ongoing fact is read as ``None``."""
+        snapshot.SnapshotWriter(path).write(0, None, {})
+        with snapshot.SnapshotReader(path) as reader:
+            assert reader.read() == (0, None, 0, {})
+
+    def test_reader_sees_updates(self, path, fact):
+        """Make sure an open reader sees later snapshots."""
+        writer = snapshot.SnapshotWriter(path)
+        writer.write(1, fact, {})
+        with snapshot.SnapshotReader(path) as reader:
+            writer.write(2, None, {})
+            assert reader.read().revision == 2
+
+    def test_writer_reopened(self, path, fact):
+        """Make sure a new writer takes over an existing file."""
+        snapshot.SnapshotWriter(path).write(1, fact, {})
+        with snapshot.SnapshotReader(path) as reader:
+            snapshot.SnapshotWriter(path).write(2, None, {})
+            assert reader.read().revision == 2
+
+    def test_truncated_text(self, path, fact):
+        """Make sure long text is truncated without splitting characters."""
+        fact.activity.name = 'ä' * 100
+        snapshot.SnapshotWriter(path).write(0, fact, {})
+        with snapshot.SnapshotReader(path) as reader:
+            assert reader.read().ongoing_fact.activity == 'ä' * 64
+
+    def test_category_limit(self, path):
+        """Make sure only the largest category totals are included."""
+        totals = {'category {}'.format(i): i for i in range(snapshot.MAX_CATEGORIES + 5)}
+        snapshot.SnapshotWriter(path).write(0, None, totals)
+        with snapshot.SnapshotReader(path) as reader:
+            result = reader.read()
+        assert len(result.category_totals) == snapshot.MAX_CATEGORIES
+        assert 'category 0' not in result.category_totals
+        assert result.today_total == sum(totals.values())
+
+    def test_update_in_progress(self, path):
+        """Make sure a snapshot is not read while it is being updated."""
+        writer = snapshot.SnapshotWriter(path)
+        writer.write(0, None, {})
+        writer._set_sequence(writer._sequence + 1)
+        with snapshot.SnapshotReader(path) as reader:
+            with pytest.raises(RuntimeError):
+                reader.read(retries=10)
+
+    def test_invalid_file(self, path):
+        """Make sure a file that is no snapshot is refused."""
+        with open(path, 'wb') as fobj:
+            fobj.write(b'\0' * snapshot.SIZE)
+        with snapshot.SnapshotReader(path) as reader:
+            with pytest.raises(ValueError):
+                reader.read()